@@ -16,20 +16,34 @@ Usage:
     from image_generation_agent.master_agent.sub_agents import research_agent, writer_agent, reviewer_agent
 """
 
-# Import agent module to make root_agent available (ADK convention)
-from . import agent
-
-# Also export agents for convenience
-from .master_agent.agent import master_agent, root_agent
-from .master_agent.sub_agents.research_agent import research_agent
-from .master_agent.sub_agents.writer_agent import writer_agent
-from .master_agent.sub_agents.reviewer_agent import reviewer_agent
-
-__all__ = [
-    'agent',  # Make agent module available for ADK web discovery
-    'master_agent',
-    'root_agent',
-    'research_agent',
-    'writer_agent',
-    'reviewer_agent'
-]
+import importlib
+from typing import Any
+
+# Agents are built on first access rather than at import time, so importing the
+# package (or a tool module inside it) doesn't pay for google.adk/google.genai
+# and the agent graph. ADK resolves `agent` / `root_agent` through __getattr__.
+_LAZY_ATTRIBUTES = {
+    'agent': ('.agent', None),  # Make agent module available for ADK web discovery
+    'master_agent': ('.master_agent.agent', 'master_agent'),
+    'root_agent': ('.master_agent.agent', 'root_agent'),
+    'pipeline_agent': ('.master_agent.pipeline_agent', 'pipeline_agent'),
+    'research_agent': ('.master_agent.sub_agents.research_agent', 'research_agent'),
+    'writer_agent': ('.master_agent.sub_agents.writer_agent', 'writer_agent'),
+    'reviewer_agent': ('.master_agent.sub_agents.reviewer_agent', 'reviewer_agent'),
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
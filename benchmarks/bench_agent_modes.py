@@ -0,0 +1,127 @@
+"""Compare model calls and latency per post: conversational vs pipeline root agent.
+
+Both agent graphs run offline. ADK LLM turns are answered by a scripted fake
+LLM that issues the same function calls a real model would (master agent →
+sub-agent → tool → summary), and tool-level generation uses the fake GenAI
+client. Every model call costs a fixed simulated latency, so the difference in
+end-to-end time comes from routing and summarization turns alone.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_agent_modes
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+import warnings
+from typing import AsyncGenerator
+
+from google.adk.agents.llm_agent import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+from master_agent import agent as agent_module
+from master_agent.pipeline_agent import build_pipeline_agent
+from master_agent.tools import creative_tools
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.fake_genai import FakeClient
+
+LATENCY = 0.25  # seconds per simulated model call
+POSTS = 3
+BRIEF = {"topic": "Cybersecurity for small businesses", "keywords": ["phishing", "backups"],
+         "image_count": 0}
+RESEARCH = "Keywords: phishing, backups\nTarget Audience: small business owners\n"
+DRAFT = "# Cybersecurity for Small Businesses\n\n## Phishing\n\nBody.\n\n**Status**: Draft - Ready for Review"
+
+# Next call the scripted model makes, keyed by the tool it has available
+TOOL_CALLS = {
+    "research_agent": [("research_agent", {"request": "Research " + BRIEF["topic"]}),
+                       ("writer_agent", {"request": "Write the post"}),
+                       ("reviewer_agent", {"request": "Review the draft"})],
+    "conduct_research": [("conduct_research", {"topic": BRIEF["topic"], "keywords": BRIEF["keywords"]})],
+    "write_content": [("write_content", {"topic": BRIEF["topic"], "research_data": RESEARCH})],
+    "review_and_polish": [("review_and_polish", {"content": DRAFT})],
+}
+
+
+class ScriptedLlm(BaseLlm):
+    """Fake LLM that walks through a fixed function-call script."""
+
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest,
+                                     stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        await asyncio.sleep(LATENCY)
+        tools = set(llm_request.tools_dict)
+        if not tools:  # Brief extraction in pipeline mode
+            yield _text(json.dumps(BRIEF))
+            return
+        script = next(steps for name, steps in TOOL_CALLS.items() if name in tools)
+        answered = sum(
+            1 for content in llm_request.contents for part in content.parts or []
+            if part.function_response
+        )
+        if answered < len(script):
+            name, args = script[answered]
+            yield LlmResponse(content=types.Content(
+                role="model", parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))]
+            ))
+        else:
+            yield _text("Done. Here is a summary of the results.")
+
+
+def _text(text: str) -> LlmResponse:
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def _with_model(agent, llm: BaseLlm):
+    """Point every LlmAgent in an agent tree (including AgentTool targets) at ``llm``."""
+    if isinstance(agent, Agent):
+        agent.model = llm
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                _with_model(tool.agent, llm)
+    for sub_agent in agent.sub_agents:
+        _with_model(sub_agent, llm)
+    return agent
+
+
+async def run_mode(name: str, root_agent, llm: ScriptedLlm) -> None:
+    runner = InMemoryRunner(agent=root_agent, app_name="bench")
+    fake_client = FakeClient(latency=LATENCY)
+    durations = []
+    with override_client(fake_client), override_rate_limits({}):
+        for _ in range(POSTS):
+            session = await runner.session_service.create_session(app_name="bench", user_id="u")
+            message = types.Content(role="user", parts=[types.Part(text=f"Write a blog post about {BRIEF['topic']}")])
+            start = time.perf_counter()
+            async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+                pass
+            durations.append(time.perf_counter() - start)
+    routing = llm.calls / POSTS
+    generation = fake_client.models.calls / POSTS
+    print(f"{name:<15} {routing:>13.1f} {generation:>11.1f} {routing + generation:>11.1f} "
+          f"{sum(durations) / POSTS:>10.2f}")
+
+
+async def main() -> None:
+    warnings.filterwarnings("ignore")
+    creative_tools.GENERATED_CREATIVES_DIR = tempfile.mkdtemp()
+    print(f"simulated latency per model call: {LATENCY}s, posts per mode: {POSTS}\n")
+    print(f"{'mode':<15} {'agent calls':>13} {'tool calls':>11} {'total':>11} {'s / post':>10}")
+
+    llm = ScriptedLlm(model="scripted")
+    await run_mode("conversational", _with_model(agent_module.master_agent, llm), llm)
+    llm = ScriptedLlm(model="scripted")
+    await run_mode("pipeline", build_pipeline_agent(brief_model=llm), llm)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""Microbenchmark: per-call GenAI client construction vs the pooled shared client.
+
+Measures only client acquisition (credential resolution, HTTP session setup);
+no requests are sent. A dummy API key is used when none is configured.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_client_pool
+"""
+
+import os
+import time
+
+from master_agent.utils.genai_client import get_client, close_client
+
+ITERATIONS = 200
+
+
+def per_call() -> float:
+    from google.genai import Client
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        client = Client()
+        client.close()
+    return time.perf_counter() - start
+
+
+def pooled() -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        get_client()
+    elapsed = time.perf_counter() - start
+    close_client()
+    return elapsed
+
+
+def main() -> None:
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark-dummy-key")
+    per_call_s = per_call()
+    pooled_s = pooled()
+    print(f"{'mode':<10} {'total s':>9} {'per call ms':>12}")
+    print(f"{'per-call':<10} {per_call_s:>9.3f} {per_call_s / ITERATIONS * 1000:>12.3f}")
+    print(f"{'pooled':<10} {pooled_s:>9.3f} {pooled_s / ITERATIONS * 1000:>12.3f}")
+    print(f"speedup: {per_call_s / max(pooled_s, 1e-9):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark: knowledge-base index build, incremental update and query latency.
+
+Generates a synthetic corpus (markdown files drawn from a Zipf-distributed
+vocabulary, so a few terms are very common and most are rare), builds the
+BM25 index from scratch, then measures:
+
+- a no-op update (stat walk only),
+- an update after touching 1% of files (mtime changes, content identical),
+- an update after editing 1% of files (re-indexed into a new segment),
+- opening the index in a fresh process state,
+- top-k queries of 2-5 terms (p50/p95/p99).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_corpus_index
+    python -m benchmarks.bench_corpus_index --docs 100000 --words 400
+"""
+
+import argparse
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from master_agent.utils.corpus_index import CorpusIndex
+
+
+def vocabulary(size: int, rng: random.Random) -> list:
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def write_corpus(directory: str, docs: int, words: int, vocab: list, rng: random.Random) -> None:
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocab) + 1)))
+    for i in range(docs):
+        subdir = os.path.join(directory, f"{i // 1000:03d}")
+        os.makedirs(subdir, exist_ok=True)
+        body = rng.choices(vocab, cum_weights=weights, k=words)
+        paragraphs = [" ".join(body[j:j + 60]) + "." for j in range(0, words, 60)]
+        with open(os.path.join(subdir, f"doc{i}.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Document {i} {body[0]}\n\n" + "\n\n".join(paragraphs) + "\n")
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Corpus index build and query benchmark.")
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--words", type=int, default=300, help="Words per document")
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    vocab = vocabulary(args.vocabulary, rng)
+    tmp = tempfile.mkdtemp()
+    try:
+        corpus, index_dir = os.path.join(tmp, "corpus"), os.path.join(tmp, "index")
+        start = time.perf_counter()
+        write_corpus(corpus, args.docs, args.words, vocab, rng)
+        print(f"corpus: {args.docs} docs x {args.words} words, vocabulary {args.vocabulary} "
+              f"(generated in {time.perf_counter() - start:.1f} s)\n")
+        
+        index = CorpusIndex(corpus, index_dir)
+        build = index.update()
+        stats = index.stats()
+        print(f"{'full build':<28}{build['seconds']:>9.2f} s  {args.docs / build['seconds']:>8.0f} docs/s  "
+              f"{stats['passages']} passages, {stats['terms']} terms, {stats['index_bytes'] / 1e6:.1f} MB")
+        
+        noop = index.update()
+        print(f"{'no-op update':<28}{noop['seconds']:>9.2f} s")
+        
+        sample = rng.sample(range(args.docs), max(1, args.docs // 100))
+        paths = [os.path.join(corpus, f"{i // 1000:03d}", f"doc{i}.md") for i in sample]
+        later = time.time() + 5
+        for path in paths:
+            os.utime(path, (later, later))
+        touched = index.update()
+        print(f"{'1% touched (same content)':<28}{touched['seconds']:>9.2f} s  {touched['touched']} rehashed, "
+              f"0 re-indexed")
+        
+        for path in paths:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\nRevised: " + " ".join(rng.choices(vocab, k=40)) + "\n")
+        edited = index.update()
+        print(f"{'1% edited':<28}{edited['seconds']:>9.2f} s  {edited['updated']} re-indexed into "
+              f"{index.stats()['segments']} segments")
+        index.close()
+        
+        start = time.perf_counter()
+        index = CorpusIndex(corpus, index_dir)
+        print(f"{'open existing index':<28}{(time.perf_counter() - start) * 1000:>9.2f} ms")
+        
+        queries = [" ".join(rng.sample(vocab[:5000], rng.randint(2, 5))) for _ in range(args.queries)]
+        index.search(queries[0], args.k)
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, args.k)
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"{'query top-' + str(args.k):<28}{percentile(latencies, 50):>9.2f} ms p50  "
+              f"{percentile(latencies, 95):.2f} ms p95  {percentile(latencies, 99):.2f} ms p99")
+        index.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
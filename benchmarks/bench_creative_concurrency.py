@@ -0,0 +1,49 @@
+"""Benchmark concurrent image generation in generate_ai_creative.
+
+Runs against a stubbed client with a fixed per-image latency and shows that
+wall-clock time grows sublinearly with ``count`` once images are dispatched
+concurrently.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_creative_concurrency
+"""
+
+import tempfile
+import time
+
+from master_agent.tools import creative_tools
+from master_agent.utils import genai_client, image_derivatives
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.fake_genai import FakeClient
+
+LATENCY = 0.2  # seconds per simulated image request
+COUNTS = [1, 2, 4, 6, 8]
+
+
+def run(concurrency: int) -> None:
+    creative_tools.IMAGE_GENERATION_CONCURRENCY = concurrency
+    print(f"\nconcurrency={concurrency}")
+    print(f"{'count':>6} {'seconds':>9} {'per image':>10} {'vs serial':>10}")
+    for count in COUNTS:
+        start = time.perf_counter()
+        creative_tools.generate_ai_creative("# Benchmark Post\n\n## Section\n", count=count)
+        elapsed = time.perf_counter() - start
+        print(f"{count:>6} {elapsed:>9.3f} {elapsed / count:>10.3f} {elapsed / (LATENCY * count):>9.0%}")
+
+
+def main() -> None:
+    # Lift the per-model slot limit so the thread pool cap is what gets measured
+    genai_client.IMAGE_MODEL_MAX_CONCURRENCY = max(COUNTS)
+    genai_client._model_limits.clear()
+    # Derivative encoding has its own benchmark (bench_image_derivatives)
+    image_derivatives.IMAGE_DERIVATIVES_ENABLED = False
+    with override_client(FakeClient(latency=LATENCY)), override_rate_limits({}), tempfile.TemporaryDirectory() as tmp:
+        creative_tools.GENERATED_CREATIVES_DIR = tmp
+        run(concurrency=1)
+        run(concurrency=4)
+        run(concurrency=8)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: finding a post's creatives by directory scan vs the store manifest.
+
+Writes the same set of creatives twice: once in the legacy flat layout
+(``{safe_title}_{creative_type}_{i}_{timestamp}.png`` in one directory), and
+once into the content-addressed ``CreativeStore``. A fraction of the payloads
+are repeats, as happens when the same prompt is regenerated. The benchmark then
+looks up every creative of random posts both ways.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_creative_store
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from master_agent.utils.creative_store import CreativeStore
+
+CREATIVES = [1_000, 10_000, 50_000]
+IMAGES_PER_POST = 4
+DUPLICATE_RATE = 0.3
+PAYLOAD_BYTES = 2_048
+LOOKUPS = 200
+
+
+def populate(root: str, count: int, seed: int = 0) -> tuple:
+    rng = random.Random(seed)
+    legacy_dir = os.path.join(root, "legacy")
+    os.makedirs(legacy_dir)
+    store = CreativeStore(os.path.join(root, "store"))
+    payloads = []
+    for i in range(count):
+        post = i // IMAGES_PER_POST
+        if payloads and rng.random() < DUPLICATE_RATE:
+            data = rng.choice(payloads)
+        else:
+            data = rng.randbytes(PAYLOAD_BYTES)
+            payloads.append(data)
+        title = f"Post_{post}"
+        with open(os.path.join(legacy_dir, f"{title}_featured_image_{i % IMAGES_PER_POST + 1}_20250101_000000.png"), 'wb') as f:
+            f.write(data)
+        store.add(data, "png", post_title=title, creative_type="featured image", prompt=f"prompt {post}")
+    return legacy_dir, store
+
+
+def scan_lookup(legacy_dir: str, title: str) -> list:
+    prefix = f"{title}_featured_image_"
+    return [name for name in os.listdir(legacy_dir) if name.startswith(prefix)]
+
+
+def main() -> None:
+    print(f"{'creatives':>9} {'scan ms':>9} {'manifest ms':>12} {'disk (legacy)':>14} {'disk (store)':>13}")
+    for count in CREATIVES:
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_dir, store = populate(tmp, count)
+            rng = random.Random(1)
+            titles = [f"Post_{rng.randrange(count // IMAGES_PER_POST)}" for _ in range(LOOKUPS)]
+            
+            start = time.perf_counter()
+            for title in titles:
+                assert len(scan_lookup(legacy_dir, title)) == IMAGES_PER_POST
+            scan_ms = (time.perf_counter() - start) / LOOKUPS * 1000
+            
+            start = time.perf_counter()
+            for title in titles:
+                assert len(store.find_by_post(title, "featured image")) == IMAGES_PER_POST
+            manifest_ms = (time.perf_counter() - start) / LOOKUPS * 1000
+            
+            stats = store.stats()
+            store.close()
+            print(f"{count:>9} {scan_ms:>9.3f} {manifest_ms:>12.3f} "
+                  f"{stats['logical_bytes'] / 1e6:>11.1f} MB {stats['stored_bytes'] / 1e6:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
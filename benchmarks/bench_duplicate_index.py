@@ -0,0 +1,96 @@
+"""Benchmark: near-duplicate index size, query time and detection quality.
+
+Fills a MinHash/LSH index with random signatures standing in for a large
+archive of past posts, plus a few hundred real synthetic posts. Then it checks:
+
+- edited copies of the real posts, with 2-20% of words replaced: copies above
+  the threshold (about 8% edited at 0.5) should be found, heavier rewrites not,
+- fresh posts: should not match anything.
+
+Reports memory and disk size per post, insert rate, signature time for a
+full-length post and lookup time against the whole archive.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_duplicate_index
+    python -m benchmarks.bench_duplicate_index --archive 500000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from array import array
+
+from master_agent.utils.duplicate_index import DuplicateIndex, content_signature
+from master_agent.utils.fake_genai import synthetic_markdown
+
+SLOTS = 64
+EDITS = [0.02, 0.05, 0.1, 0.2]
+
+
+def edited(text: str, share: float, rng: random.Random) -> str:
+    words = text.split(" ")
+    for _ in range(int(len(words) * share)):
+        words[rng.randrange(len(words))] = rng.choice(("insight", "teams", "plan", "measure", "audience"))
+    return " ".join(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Near-duplicate index benchmark.")
+    parser.add_argument("--archive", type=int, default=300_000, help="Past posts in the index")
+    parser.add_argument("--posts", type=int, default=200, help="Real posts added, edited and queried")
+    parser.add_argument("--size", type=int, default=9_000, help="Characters per real post (~1,500 words)")
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = DuplicateIndex(tmp, "content")
+        start = time.perf_counter()
+        for _ in range(args.archive):
+            index.add(array("H", (rng.getrandbits(16) for _ in range(SLOTS))))
+        insert_seconds = time.perf_counter() - start
+        
+        posts = [synthetic_markdown(args.size, seed) for seed in range(args.posts)]
+        signature_ms = []
+        for post in posts:
+            start = time.perf_counter()
+            signature = content_signature(post)
+            signature_ms.append((time.perf_counter() - start) * 1000)
+            index.add(signature)
+        
+        def lookups(texts):
+            found, latencies = 0, []
+            for text in texts:
+                signature = content_signature(text)
+                start = time.perf_counter()
+                found += bool(index.query(signature))
+                latencies.append((time.perf_counter() - start) * 1000)
+            return found / len(texts), latencies
+        
+        recall = {}
+        for share in EDITS:
+            recall[share], latencies = lookups([edited(post, share, rng) for post in posts])
+            if share == 0.05:
+                near_ms = latencies
+        false_rate, fresh_ms = lookups([synthetic_markdown(args.size, 10**6 + seed) for seed in range(args.posts)])
+        stats = index.stats()
+        index.close()
+        disk = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+    
+    total = stats["posts"]
+    memory = stats["signature_bytes"] + stats["band_bytes"]
+    print(f"{total} posts indexed ({args.archive / insert_seconds:.0f} inserts/s including SQLite metadata)\n")
+    print(f"{'in-memory arrays':<32}{memory / 1e6:>9.1f} MB  {memory / total:>6.0f} B/post")
+    print(f"{'on disk (sig, bands, metadata)':<32}{disk / 1e6:>9.1f} MB  {disk / total:>6.0f} B/post")
+    print(f"{'signature, ~1,500-word post':<32}{statistics.median(signature_ms):>9.2f} ms")
+    print(f"{'lookup, 5%-edited copy':<32}{statistics.median(near_ms):>9.3f} ms p50  "
+          f"{max(near_ms):.3f} ms max")
+    print(f"{'lookup, fresh post':<32}{statistics.median(fresh_ms):>9.3f} ms p50  {max(fresh_ms):.3f} ms max")
+    print("\nedited copies detected: " + ", ".join(f"{share:.0%} edited {rate:.0%}" for share, rate in recall.items()))
+    print(f"fresh posts flagged: {false_rate:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: encode time and size of web derivatives for generated images.
+
+Encodes synthetic model-sized PNGs (gradients plus blurred noise, 1024x1024
+and 2048x2048) into the configured derivatives, once inline and then through
+the process pool with several images in flight, as concurrent creative
+generation does. While each run is in progress a ticker thread measures how
+long the calling process is starved of the GIL (what an event loop would see).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_image_derivatives
+"""
+
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageFilter
+
+from master_agent.utils.image_derivatives import (
+    build_derivatives,
+    create_derivatives,
+    shutdown_derivative_pool
+)
+from master_agent.config.settings import IMAGE_DERIVATIVE_WORKERS
+
+SIZES = [1024, 2048]
+IMAGES = 8
+
+
+def make_png(path: str, size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    gradient = Image.linear_gradient("L").resize((size, size))
+    noise = Image.effect_noise((size, size), 40 + rng.randint(0, 20)).filter(ImageFilter.GaussianBlur(3))
+    Image.merge("RGB", (gradient, noise, gradient.rotate(90))).save(path, "PNG")
+
+
+class Ticker:
+    """Sleeps in 5 ms steps and records the worst oversleep (GIL starvation)."""
+    
+    def __init__(self):
+        self.max_lag = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            time.sleep(0.005)
+            self.max_lag = max(self.max_lag, time.perf_counter() - start - 0.005)
+    
+    def __enter__(self) -> "Ticker":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def main() -> None:
+    print(f"CPUs available: {len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()}\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            paths = []
+            for i in range(IMAGES):
+                path = os.path.join(tmp, f"image_{size}_{i}.png")
+                make_png(path, size, i)
+                paths.append(path)
+            
+            with ThreadPoolExecutor(max_workers=1) as executor, Ticker() as inline_ticker:
+                inline = list(executor.map(
+                    lambda p: create_derivatives(p, output_dir=os.path.join(tmp, "inline")), paths
+                ))
+            per_image = sum(r["encode_seconds"] for r in inline) / len(inline)
+            source_kb = sum(r["source_bytes"] for r in inline) / len(inline) / 1024
+            derived_kb = sum(sum(d["bytes"] for d in r["derivatives"]) for r in inline) / len(inline) / 1024
+            
+            build_derivatives(paths[0])  # Start the worker processes outside the timing
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=IMAGES) as executor, Ticker() as pool_ticker:
+                list(executor.map(build_derivatives, paths))
+            pooled = time.perf_counter() - start
+            
+            print(f"{size}x{size}: {len(inline[0]['derivatives'])} derivatives per image")
+            print(f"  source PNG            {source_kb:>9.0f} KB")
+            print(f"  all derivatives       {derived_kb:>9.0f} KB")
+            print(f"  encode per image      {per_image * 1000:>9.0f} ms (inline)")
+            print(f"  {IMAGES} images, {IMAGE_DERIVATIVE_WORKERS} workers  {pooled * 1000:>9.0f} ms "
+                  f"({per_image * IMAGES / pooled:.1f}x vs inline serial)")
+            print(f"  caller max stall      {inline_ticker.max_lag * 1000:>9.1f} ms inline, "
+                  f"{pool_ticker.max_lag * 1000:.1f} ms with the process pool\n")
+    shutdown_derivative_pool()
+
+
+if __name__ == "__main__":
+    main()
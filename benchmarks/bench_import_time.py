@@ -0,0 +1,74 @@
+"""Benchmark: cold-start import cost of tool modules vs the full agent graph.
+
+Every measurement runs in a fresh interpreter with ``-X importtime``, so no
+module is already cached. The reported time is the cumulative import time of
+everything the import statement loaded (parent packages included); Python's
+own startup (``site``) is excluded. Also reports how many modules were loaded
+and whether the heavy SDKs (google.adk, google.genai, Pillow) came with them.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_import_time
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+TARGETS = [
+    "master_agent.config.settings",
+    "master_agent.tools.review_tools",
+    "master_agent.tools",
+    "master_agent.tools.writing_tools",
+    "master_agent.tools.creative_tools",
+    "master_agent.sub_agents",
+    "master_agent.sub_agents.reviewer_agent",
+    "master_agent.agent",
+]
+HEAVY = ("google.adk", "google.genai", "PIL")
+MARKER = "-- import starts --"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(target: str) -> tuple:
+    """Import ``target`` in a fresh interpreter; return (ms, modules loaded, heavy SDKs loaded)."""
+    code = (
+        "import sys\n"
+        "before = set(sys.modules)\n"
+        f"sys.stderr.write({MARKER!r} + '\\n')\n"
+        f"import {target}\n"
+        "loaded = set(sys.modules) - before\n"
+        f"print(len(loaded), ','.join(h for h in {HEAVY!r} if h in loaded))\n"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    lines = result.stderr.split(MARKER, 1)[1].splitlines()
+    total_us = 0
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative = cumulative.strip()
+        # Top-level entries (no extra indentation) cover everything imported beneath them
+        if cumulative.isdigit() and not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    count, _, heavy = result.stdout.strip().partition(" ")
+    return total_us / 1000, int(count), heavy
+
+
+def main():
+    print(f"Cold import cost, median of {RUNS} fresh interpreters (python {sys.version.split()[0]})\n")
+    print(f"{'module':<42}{'import ms':>10}{'modules':>9}  heavy SDKs loaded")
+    medians = {}
+    for target in TARGETS:
+        runs = [measure(target) for _ in range(RUNS)]
+        medians[target] = statistics.median(r[0] for r in runs)
+        count, heavy = runs[-1][1], runs[-1][2]
+        print(f"{target:<42}{medians[target]:>10.1f}{count:>9}  {heavy or '-'}")
+    tool, graph = medians["master_agent.tools.review_tools"], medians["master_agent.agent"]
+    print(f"\nreview_tools costs {tool / graph:.1%} of building the full agent graph "
+          f"({tool:.1f} ms vs {graph:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
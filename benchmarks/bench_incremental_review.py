@@ -0,0 +1,72 @@
+"""Benchmark: full review vs incremental re-review after small edits.
+
+Reviews a synthetic post once, then edits it and reviews it again in the same
+session, so only the changed sections are re-analyzed. The edits are one
+sentence in one section and one sentence in each of 10% of the sections. For
+comparison, the same edited post is reviewed in a fresh session with no cache.
+Each incremental result is checked against the fresh one.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_incremental_review
+"""
+
+import random
+import statistics
+import time
+
+from master_agent.tools.review_tools import review_and_polish
+from master_agent.tools.writing_tools import _metadata_footer
+from master_agent.utils.fake_genai import synthetic_markdown
+from master_agent.utils.markdown_analyzer import split_sections
+from master_agent.utils.state_manager import session_scope
+
+SIZES = [2_000, 10_000, 50_000]  # words
+CHARS_PER_WORD = 6
+REPEATS = 5
+
+
+def make_post(words: int) -> str:
+    footer = _metadata_footer("Benchmark", "content strategy, audience growth", "blog post",
+                              "professional", "marketers", words)
+    return synthetic_markdown(words * CHARS_PER_WORD) + footer
+
+
+def edit(post: str, share: float, rng: random.Random) -> str:
+    """Append a sentence to a random ``share`` of the sections (at least one)."""
+    sections = split_sections(post)
+    for i in rng.sample(range(1, len(sections) - 1), max(1, int(len(sections) * share))):
+        sections[i] = sections[i].rstrip("\n") + " An edited sentence adds clear results for teams.\n\n"
+    return "".join(sections)
+
+
+def timed_review(session: str, post: str) -> tuple:
+    with session_scope(session) as state:
+        start = time.perf_counter()
+        review_and_polish(post)
+        return (time.perf_counter() - start) * 1000, state.get_final_content()
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'words':>7} {'sections':>9} {'edit':>12} {'full ms':>9} {'incremental ms':>15} {'re-analyzed':>12}")
+    for words in SIZES:
+        post = make_post(words)
+        total = len(split_sections(post))
+        for label, share in (("1 section", 0.0), ("10% sections", 0.1)):
+            full, incremental, analyzed = [], [], 0
+            for run in range(REPEATS):
+                session = f"bench-{words}-{share}-{run}"
+                timed_review(session, post)
+                edited = edit(post, share, rng)
+                elapsed, result = timed_review(session, edited)
+                incremental.append(elapsed)
+                analyzed = result["sections"]["analyzed"]
+                elapsed, fresh = timed_review(session + "-fresh", edited)
+                full.append(elapsed)
+                assert (result["analysis"], result["seo"]) == (fresh["analysis"], fresh["seo"])
+            print(f"{words:>7} {total:>9} {label:>12} {statistics.median(full):>9.1f} "
+                  f"{statistics.median(incremental):>15.1f} {analyzed:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: long-form drafts written single-shot vs outlined with parallel sections.
+
+The stubbed model takes a fixed time to the first token plus a per-token delay,
+so latency grows with output length like a real model's. Outline prompts get an
+outline back, and every other prompt gets synthetic markdown of the length it
+asks for. Both modes go through ``write_content`` and report the latency
+recorded on the draft.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_long_form
+    python -m benchmarks.bench_long_form --token-delay 0.01 --concurrency 8
+"""
+
+import argparse
+import re
+
+from master_agent.tools import writing_tools
+from master_agent.tools.research_tools import conduct_research
+from master_agent.utils.fake_genai import FakeClient, synthetic_markdown
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.state_manager import workflow_state
+
+WORD_COUNTS = [1500, 3000, 6000, 10000]
+CHARS_PER_WORD = 6
+
+
+def respond(prompt: str) -> str:
+    """Outline for outline prompts, otherwise markdown of the requested length."""
+    outline = re.search(r"exactly (\d+) H2 section headings", prompt)
+    if outline:
+        return "# Benchmark Title\n\n" + "\n".join(f"## Part {i}" for i in range(1, int(outline.group(1)) + 1))
+    words = re.search(r"about (\d+) words\)|approximately (\d+) words", prompt)
+    size = int(next(group for group in words.groups() if group)) * CHARS_PER_WORD if words else 2000
+    return synthetic_markdown(size, seed=len(prompt))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Single-shot vs section-parallel long-form drafts.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds to the first token")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="Seconds per output token")
+    parser.add_argument("--concurrency", type=int, default=writing_tools.LONG_FORM_CONCURRENCY)
+    args = parser.parse_args()
+    
+    fake = FakeClient(latency=args.latency, token_delay=args.token_delay, text_for=respond)
+    report = conduct_research("Long-form benchmarking", ["latency", "parallel sections", "outlines"], "engineers")
+    writing_tools.LONG_FORM_CONCURRENCY = args.concurrency
+    print(f"{'words':>6} {'single-shot s':>14} {'parallel s':>11} {'speedup':>8} {'sections':>9} {'calls':>6}")
+    with override_client(fake), override_rate_limits({}):
+        for word_count in WORD_COUNTS:
+            results = {}
+            for mode, threshold in (("single", 0), ("parallel", 1)):
+                writing_tools.LONG_FORM_MIN_WORDS = threshold
+                calls = fake.models.calls
+                writing_tools.write_content("Long-form benchmarking", report, word_count=word_count)
+                metrics = workflow_state.get_draft_content()["metrics"]
+                results[mode] = (metrics["total_latency"], metrics["long_form"], fake.models.calls - calls)
+            single, (parallel, long_form, calls) = results["single"][0], results["parallel"]
+            print(f"{word_count:>6} {single:>14.2f} {parallel:>11.2f} {single / parallel:>7.1f}x "
+                  f"{long_form['sections']:>9} {calls:>6}")
+
+
+if __name__ == "__main__":
+    main()
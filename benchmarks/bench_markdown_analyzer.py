@@ -0,0 +1,93 @@
+"""Benchmark: single-pass markdown analyzer vs the regex statistics review used to run.
+
+"legacy" is the original three-pass approach (``split`` for words, regex
+findall for headings and paragraph breaks, ``split('#')`` for the title), which
+yields only three numbers. "regex-equivalent" computes the analyzer's metrics
+with one regex pass per metric over the whole document.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_markdown_analyzer
+"""
+
+import random
+import re
+import time
+
+from master_agent.utils.markdown_analyzer import analyze_markdown, count_syllables
+
+SIZES = [1_000, 10_000, 50_000, 200_000]
+REPEATS = 3
+VOCABULARY = ("content marketing strategy audience engagement search optimization "
+              "readers measurable results organic traffic conversion framework analytics "
+              "is a the of and to for with practical insight").split()
+
+
+def make_document(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = ["# Benchmark Document", ""]
+    written = 0
+    section = 0
+    while written < words:
+        section += 1
+        lines += [f"## Section {section}", ""]
+        for _ in range(3):
+            sentences = []
+            for _ in range(rng.randint(3, 6)):
+                length = rng.randint(6, 28)
+                sentences.append(" ".join(rng.choice(VOCABULARY) for _ in range(length)).capitalize() + ".")
+                written += length
+            lines += [" ".join(sentences) + " See [the guide](https://example.com/guide).", ""]
+        lines += [f"- {rng.choice(VOCABULARY)} point one", f"- {rng.choice(VOCABULARY)} point two", ""]
+    return "\n".join(lines)
+
+
+def legacy(content: str) -> tuple:
+    word_count = len(content.split())
+    heading_count = len(re.findall(r'^#+\s', content, re.MULTILINE))
+    paragraph_count = len(re.findall(r'\n\n', content))
+    title = content.split('#')[1].split('\n')[0].strip() if '#' in content else 'this topic'
+    return word_count, heading_count, paragraph_count, title
+
+
+def regex_equivalent(content: str) -> dict:
+    words = re.findall(r"[^\W_][\w'’-]*", content)
+    sentences = re.findall(r'[^.!?\n]+[.!?]+', content)
+    return {
+        "words": len(words),
+        "sentences": len(sentences),
+        "sentence_lengths": [len(s.split()) for s in sentences],
+        "syllables": sum(count_syllables(w) for w in words),
+        "headings": re.findall(r'^(#+)\s+(.*)$', content, re.MULTILINE),
+        "paragraphs": len(re.findall(r'\n\n(?=[^#\-\n])', content)),
+        "list_items": len(re.findall(r'^\s*(?:[-*+]|\d+[.)])\s', content, re.MULTILINE)),
+        "links": len(re.findall(r'\[[^\]]*\]\([^)]*\)', content)),
+        "title": content.split('#')[1].split('\n')[0].strip() if '#' in content else None,
+    }
+
+
+def best_of(fn, content: str) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    print(f"{'words':>8} {'legacy ms':>10} {'regex-eq ms':>12} {'single-pass ms':>15} {'MB/s':>7}")
+    for size in SIZES:
+        content = make_document(size)
+        count_syllables.cache_clear()
+        legacy_s = best_of(legacy, content)
+        regex_s = best_of(regex_equivalent, content)
+        single_s = best_of(analyze_markdown, content)
+        mb_per_s = len(content.encode('utf-8')) / 1e6 / single_s
+        print(f"{size:>8} {legacy_s * 1000:>10.1f} {regex_s * 1000:>12.1f} "
+              f"{single_s * 1000:>15.1f} {mb_per_s:>7.1f}")
+    print("\nlegacy reports 3 counts; regex-eq and single-pass report words, sentences,")
+    print("sentence lengths, syllables, headings, paragraphs, lists and links.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Offline end-to-end benchmark suite against the fake GenAI client.
+
+Measures each tool (research, write, review, creative) and the full
+research → write → review → creative flow at several concurrency levels.
+Model calls go to ``FakeClient`` with configurable latency, jitter, payload
+sizes and error rate; everything else (retries, rate-limit slots, analysis,
+image derivatives, state) is the real code path.
+
+Every (scenario, concurrency) pair runs in a fresh interpreter, so peak RSS is
+per run and earlier runs don't warm caches for later ones. Results are
+reported as JSON (throughput, p50/p95/p99 latency, errors, peak RSS, model call
+counters) and can be compared against a previous run's file.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_offline_suite
+    python -m benchmarks.bench_offline_suite -o after.json --compare before.json
+    python -m benchmarks.bench_offline_suite --scenarios flow --concurrency 1 8 32 --error-rate 0.05
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+SCENARIOS = ["research", "write", "review", "creative", "flow"]
+CONCURRENCY = [1, 4, 16]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _operation(scenario: str, config: Dict[str, Any]) -> Callable[[int], bool]:
+    """Build the callable for one scenario; it returns whether the operation succeeded."""
+    from master_agent import batch
+    from master_agent.tools.research_tools import conduct_research
+    from master_agent.tools.writing_tools import write_content
+    from master_agent.tools.review_tools import review_and_polish
+    from master_agent.tools.creative_tools import generate_ai_creative
+    from master_agent.utils.genai_client import get_client
+    from master_agent.utils.state_manager import session_scope, session_states
+    
+    keywords = ["content strategy", "audience growth"]
+    research = conduct_research("Content strategy", keywords)
+    draft = get_client().models.text
+    
+    def ok(result: str) -> bool:
+        return not result.lstrip().startswith(("❌", "⚠️"))
+    
+    def in_session(index: int, fn: Callable[[], str]) -> bool:
+        session_id = f"bench:{scenario}:{index}"
+        try:
+            with session_scope(session_id):
+                return ok(fn())
+        finally:
+            session_states.discard(session_id)
+    
+    if scenario == "research":
+        return lambda i: in_session(i, lambda: conduct_research(f"Content strategy {i}", keywords))
+    if scenario == "write":
+        return lambda i: in_session(i, lambda: write_content(f"Content strategy {i}", research))
+    if scenario == "review":
+        return lambda i: in_session(i, lambda: review_and_polish(draft, keywords=keywords))
+    if scenario == "creative":
+        return lambda i: in_session(i, lambda: generate_ai_creative(draft, count=config["images"]))
+    if scenario == "flow":
+        def flow(i: int) -> bool:
+            brief = {"id": f"{i}", "topic": f"Content strategy {i}", "keywords": keywords,
+                     "image_count": config["images"]}
+            return batch.process_brief(brief)["status"] == "ok"
+        return flow
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def run_scenario(scenario: str, concurrency: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one scenario in this process (called in the child interpreter)."""
+    from master_agent.tools import creative_tools
+    from master_agent.utils.fake_genai import FakeClient
+    from master_agent.utils.genai_client import override_client
+    from master_agent.utils.model_calls import get_model_call_metrics, override_rate_limits, reset_model_call_state
+    
+    fake = FakeClient(latency=config["latency"], jitter=config["jitter"], error_rate=config["error_rate"],
+                      text_size=config["text_size"], image_size=config["image_size"],
+                      image_dimensions=tuple(config["image_dimensions"]), seed=config["seed"])
+    with override_client(fake), override_rate_limits({}), tempfile.TemporaryDirectory() as tmp:
+        creative_tools.GENERATED_CREATIVES_DIR = tmp
+        operation = _operation(scenario, config)
+        operation(-1)  # Warm-up: lazy imports, caches, the derivative worker pool
+        reset_model_call_state()
+        fake.models.calls = fake.models.errors = 0
+        
+        latencies: List[float] = []
+        
+        def timed(index: int) -> bool:
+            start = time.perf_counter()
+            try:
+                return operation(index)
+            except Exception:
+                return False
+            finally:
+                latencies.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(timed, range(config["operations"])))
+        elapsed = time.perf_counter() - start
+    
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "operations": len(outcomes),
+        "errors": outcomes.count(False),
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_per_second": round(len(outcomes) / elapsed, 3) if elapsed else 0.0,
+        "latency_seconds": {
+            "mean": round(sum(latencies) / len(latencies), 4),
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(max(latencies), 4)
+        },
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_rss_children_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "fake_model": {"calls": fake.models.calls, "injected_errors": fake.models.errors},
+        "model_calls": get_model_call_metrics()
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print throughput and p95 changes against a baseline run."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    
+    def change(new: float, before: float) -> str:
+        return f"{(new - before) / before:+.1%}" if before else "n/a"
+    
+    print(f"\nvs baseline {baseline.get('git_commit', '?')} ({baseline.get('timestamp', '?')})")
+    print(f"{'scenario':<10}{'conc':>5}{'throughput':>12}{'p95':>10}{'peak RSS':>10}")
+    for result in current["results"]:
+        old = previous.get((result["scenario"], result["concurrency"]))
+        if old is None:
+            continue
+        print(f"{result['scenario']:<10}{result['concurrency']:>5}"
+              f"{change(result['throughput_per_second'], old['throughput_per_second']):>12}"
+              f"{change(result['latency_seconds']['p95'], old['latency_seconds']['p95']):>10}"
+              f"{change(result['peak_rss_mb'], old['peak_rss_mb']):>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark suite against the fake model.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=CONCURRENCY)
+    parser.add_argument("--operations", type=int, default=32, help="Operations per scenario run")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Latency jitter, e.g. 0.3 for +/-30%%")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a fake call fails with a 503")
+    parser.add_argument("--text-size", type=int, default=12_000, help="Characters per generated draft")
+    parser.add_argument("--image-size", type=int, default=500_000, help="Bytes per generated image")
+    parser.add_argument("--image-dimensions", nargs=2, type=int, default=[1024, 1024], metavar=("W", "H"))
+    parser.add_argument("--images", type=int, default=1, help="Images per creative operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    parser.add_argument("--json", action="store_true", help="Print only the JSON report")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        job = json.loads(args.child)
+        print(json.dumps(run_scenario(job["scenario"], job["concurrency"], job["config"])))
+        return
+    
+    config = {key: getattr(args, key) for key in ("operations", "latency", "jitter", "error_rate", "text_size",
+                                                  "image_size", "image_dimensions", "images", "seed")}
+    report = {
+        "suite": "offline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": config,
+        "results": []
+    }
+    if not args.json:
+        print(f"{'scenario':<10}{'conc':>5}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'errors':>8}{'RSS MB':>8}")
+    for scenario in args.scenarios:
+        for concurrency in args.concurrency:
+            job = json.dumps({"scenario": scenario, "concurrency": concurrency, "config": config})
+            child = subprocess.run([sys.executable, "-m", "benchmarks.bench_offline_suite", "--child", job],
+                                   cwd=ROOT, capture_output=True, text=True)
+            if child.returncode:
+                sys.exit(f"{scenario} @ {concurrency} failed:\n{child.stderr}")
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            report["results"].append(result)
+            if not args.json:
+                latency = result["latency_seconds"]
+                print(f"{scenario:<10}{concurrency:>5}{result['throughput_per_second']:>9.1f}"
+                      f"{latency['p50'] * 1000:>9.1f}{latency['p95'] * 1000:>9.1f}{latency['p99'] * 1000:>9.1f}"
+                      f"{result['errors']:>8}{result['peak_rss_mb']:>8.1f}")
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark: writing-prompt size with and without the token budget.
+
+Builds research reports of growing size (the tool's report plus extra source
+sections, some repeating earlier findings) and renders the write_content
+prompt for each. Reports the prompt's original and final token counts, how
+many duplicate lines were dropped and sections condensed, and the time the
+compaction itself takes.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_prompt_budget
+"""
+
+import random
+import time
+
+from master_agent.config.settings import PROMPT_TOKEN_BUDGET
+from master_agent.tools.research_tools import conduct_research
+from master_agent.tools.writing_tools import _build_writing_prompt
+from master_agent.utils.fake_genai import synthetic_markdown
+
+SOURCES = [0, 10, 40, 160]
+DUPLICATE_RATE = 0.3  # Share of source findings repeated from an earlier source
+RUNS = 5
+
+
+def research_report(sources: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    report = conduct_research("Content strategy", ["content strategy", "audience growth"])
+    findings = []
+    for i in range(sources):
+        lines = []
+        for _ in range(rng.randint(3, 8)):
+            if findings and rng.random() < DUPLICATE_RATE:
+                lines.append(rng.choice(findings))
+            else:
+                sentence = synthetic_markdown(120, rng.randrange(10**6)).split("\n\n")[-2]
+                if rng.random() < 0.3:
+                    sentence = f"{rng.randint(5, 95)}% of teams: {sentence}"
+                lines.append(f"   - {sentence}")
+                findings.append(lines[-1])
+        report += f"\nSOURCE {i + 1} FINDINGS:\n" + "\n".join(lines) + "\n"
+    return report
+
+
+def main() -> None:
+    print(f"write_content prompt, budget {PROMPT_TOKEN_BUDGET} tokens (local estimator)\n")
+    print(f"{'sources':>8}{'original':>10}{'final':>8}{'saved':>8}{'dup lines':>11}{'condensed':>11}{'ms':>8}")
+    for sources in SOURCES:
+        research = research_report(sources)
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            _, _, _, report = _build_writing_prompt("Content strategy", research, "blog post", 1500, "professional")
+            timings.append(time.perf_counter() - start)
+        saved = 1 - report["final"] / report["original"]
+        print(f"{sources:>8}{report['original']:>10}{report['final']:>8}{saved:>8.0%}"
+              f"{report['deduplicated_lines']:>11}{len(report['condensed_sections']):>11}"
+              f"{min(timings) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
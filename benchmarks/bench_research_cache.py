@@ -0,0 +1,74 @@
+"""Benchmark: research cache lookups over a large store.
+
+Fills a research store with synthetic briefs, then looks up three kinds of
+query: rephrasings of stored topics (reordered words, plurals, filler such as
+"tips" or "guide"), the exact stored briefs, and unrelated topics. Reports
+lookup latency and how often each kind was served from the cache.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_research_cache
+"""
+
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from master_agent.utils.research_store import ResearchStore
+
+ENTRIES = [1_000, 10_000, 50_000]
+QUERIES = 500
+SUBJECTS = ("cybersecurity cloud payroll hiring onboarding pricing branding analytics podcasting "
+            "newsletter seo fundraising inventory logistics compliance accessibility").split()
+AUDIENCES = ("small business", "startup", "nonprofit", "remote team", "developer", "agency",
+             "retailer", "restaurant", "freelancer", "school")
+ANGLES = ("checklist", "mistakes", "budget", "automation", "strategy", "tools", "trends", "security")
+UNRELATED = ("gardening", "astronomy", "knitting", "sailing", "chess", "baking")
+
+
+def brief(rng: random.Random) -> tuple:
+    subject, audience, angle = rng.choice(SUBJECTS), rng.choice(AUDIENCES), rng.choice(ANGLES)
+    return f"{subject} {angle} for {audience}s", [subject, angle]
+
+
+def rephrase(topic: str, rng: random.Random) -> str:
+    words = [w.rstrip("s") if rng.random() < 0.5 else w for w in topic.split() if w != "for"]
+    rng.shuffle(words)
+    return " ".join(words + [rng.choice(("tips", "guide", "best practices overview", ""))]).strip()
+
+
+def timed(store: ResearchStore, queries: list) -> tuple:
+    latencies, hits = [], 0
+    for topic, keywords in queries:
+        start = time.perf_counter()
+        hits += store.get(topic, keywords) is not None
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1e6, hits / len(queries)
+
+
+def main() -> None:
+    print(f"{QUERIES} lookups per query kind\n")
+    print(f"{'entries':>8}{'kind':>12}{'median us':>11}{'hit rate':>10}")
+    for entries in ENTRIES:
+        rng = random.Random(entries)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResearchStore(os.path.join(tmp, "research.db"))
+            stored = [brief(rng) for _ in range(entries)]
+            for topic, keywords in stored:
+                store.put(topic, f"report for {topic}", keywords)
+            sample = rng.sample(stored, QUERIES)
+            kinds = {
+                "exact": sample,
+                "rephrased": [(rephrase(topic, rng), keywords) for topic, keywords in sample],
+                "unrelated": [(f"{rng.choice(UNRELATED)} {rng.choice(ANGLES)} for {rng.choice(AUDIENCES)}s",
+                               [rng.choice(UNRELATED)]) for _ in range(QUERIES)],
+            }
+            for kind, queries in kinds.items():
+                latency, hit_rate = timed(store, queries)
+                print(f"{entries:>8}{kind:>12}{latency:>11.1f}{hit_rate:>10.1%}")
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: Aho–Corasick keyword matching vs one regex per keyword variant.
+
+Scores a batch of posts that share a keyword set, the way a batch review does.
+"per-variant regex" runs one whole-word regex search per keyword variant over
+each post; "automaton" makes a single pass per post, and "automaton (no cache)"
+rebuilds the automaton for every post to show what caching per keyword set saves.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_seo_analyzer
+"""
+
+import random
+import re
+import time
+
+from master_agent.utils.seo_analyzer import get_automaton, keyword_variants
+
+POSTS = 200
+WORDS_PER_POST = 2_000
+KEYWORD_COUNTS = [3, 10, 30]
+VOCABULARY = ("content marketing strategy audience engagement search optimization readers "
+              "measurable results organic traffic conversion framework analytics is a the of "
+              "and to for with practical insight").split()
+
+
+def make_posts(seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(WORDS_PER_POST)) for _ in range(POSTS)]
+
+
+def make_keywords(count: int) -> tuple:
+    rng = random.Random(count)
+    keywords = set()
+    while len(keywords) < count:
+        keywords.add(" ".join(rng.sample(VOCABULARY, rng.choice([1, 2]))))
+    return tuple(sorted(keywords))
+
+
+def per_variant_regex(posts: list, keywords: tuple) -> int:
+    variants = {v for k in keywords for v in keyword_variants(k)}
+    patterns = [re.compile(rf'(?<!\w){re.escape(v)}(?!\w)') for v in variants]
+    return sum(len(p.findall(post)) for post in posts for p in patterns)
+
+
+def automaton(posts: list, keywords: tuple, cached: bool = True) -> int:
+    total = 0
+    for post in posts:
+        if not cached:
+            get_automaton.cache_clear()
+        total += sum(1 for _ in get_automaton(keywords).find(post))
+    return total
+
+
+def timed(fn, *args, **kwargs) -> tuple:
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    posts = make_posts()
+    print(f"{POSTS} posts x {WORDS_PER_POST} words\n")
+    print(f"{'keywords':>8} {'variants':>9} {'regex s':>9} {'automaton s':>12} {'no-cache s':>11} {'matches':>8}")
+    for count in KEYWORD_COUNTS:
+        keywords = make_keywords(count)
+        variants = len({v for k in keywords for v in keyword_variants(k)})
+        regex_s, regex_matches = timed(per_variant_regex, posts, keywords)
+        get_automaton.cache_clear()
+        auto_s, auto_matches = timed(automaton, posts, keywords)
+        nocache_s, _ = timed(automaton, posts, keywords, cached=False)
+        assert regex_matches == auto_matches, (regex_matches, auto_matches)
+        print(f"{count:>8} {variants:>9} {regex_s:>9.3f} {auto_s:>12.3f} {nocache_s:>11.3f} {auto_matches:>8}")
+
+
+if __name__ == "__main__":
+    main()
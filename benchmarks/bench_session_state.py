@@ -0,0 +1,89 @@
+"""Stress benchmark for the session-scoped workflow state store.
+
+Runs hundreds of interleaved sessions across a thread pool, half resolved only
+via a fake ADK tool context and half via ``session_scope``, and verifies that no
+research, draft or creative record leaks between sessions. Exits non-zero on
+any crossover.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_session_state
+"""
+
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from master_agent.tools.research_tools import conduct_research
+from master_agent.tools.review_tools import review_and_polish
+from master_agent.utils.state_manager import get_workflow_state, session_scope, session_states
+
+SESSIONS = 500
+ROUNDS = 5
+WORKERS = 32
+
+
+def fake_tool_context(session_id: str) -> SimpleNamespace:
+    return SimpleNamespace(state={}, session=SimpleNamespace(id=session_id))
+
+
+def run_round(session_id: str, topic: str, tool_context) -> list:
+    """One round of tool calls; returns any crossover errors."""
+    errors = []
+    conduct_research(topic, [session_id], tool_context=tool_context)
+    time.sleep(random.random() / 1000)  # Encourage interleaving
+    review_and_polish(f"# {topic}\n\nBody.", tool_context=tool_context)
+    state = get_workflow_state(tool_context)
+    state.add_creative_suggestion({"content_title": topic})
+
+    research = state.get_research_data()
+    final = state.get_final_content()
+    if research["topic"] != topic:
+        errors.append(f"{session_id}: research from {research['topic']!r}")
+    if not final["content"].startswith(f"# {topic}"):
+        errors.append(f"{session_id}: final content from another session")
+    if any(not s["content_title"].startswith(session_id + " ") for s in state.get_creative_suggestions()):
+        errors.append(f"{session_id}: foreign creative suggestion")
+    return errors
+
+
+def run_session(session_id: str) -> list:
+    """Interleave tool calls for one session and return any crossover errors.
+
+    Tool-context sessions run outside any ``session_scope``, so they resolve
+    their state from the tool context alone.
+    """
+    errors = []
+    use_context = hash(session_id) % 2 == 0
+    for round_number in range(ROUNDS):
+        topic = f"{session_id} round {round_number}"
+        if use_context:
+            errors += run_round(session_id, topic, fake_tool_context(session_id))
+        else:
+            with session_scope(session_id):
+                errors += run_round(session_id, topic, None)
+    return errors
+
+
+def main() -> None:
+    session_ids = [f"session-{i:04d}" for i in range(SESSIONS)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(run_session, session_ids))
+    elapsed = time.perf_counter() - start
+
+    errors = [error for result in results for error in result]
+    calls = SESSIONS * ROUNDS * 2
+    print(f"sessions: {SESSIONS}, tool calls: {calls}, workers: {WORKERS}")
+    print(f"elapsed: {elapsed:.3f}s ({calls / elapsed:.0f} calls/s)")
+    print(f"live sessions: {len(session_states)}, evictions: {session_states.evictions}, "
+          f"approx bytes: {session_states.total_bytes()}")
+    print(f"crossover errors: {len(errors)}")
+    for error in errors[:10]:
+        print(f"  {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
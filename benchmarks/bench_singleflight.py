@@ -0,0 +1,118 @@
+"""Benchmark: single-flight coalescing of concurrent identical requests.
+
+``--callers`` sessions submit the same brief to write_content at the same
+moment (threads), then the same post to generate_ai_creative, with coalescing
+off and on. A third scenario issues the same model request from asyncio tasks
+through ``SingleFlight.do_async``. Reports upstream model calls, wall time and
+the flight counters, and checks that an upstream error reaches every caller.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_singleflight
+    python -m benchmarks.bench_singleflight --callers 32 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from master_agent.config.settings import MODEL_NAME
+from master_agent.tools import creative_tools, writing_tools
+from master_agent.utils import image_derivatives
+from master_agent.utils.fake_genai import FakeAPIError, FakeClient
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.singleflight import get_singleflight, get_singleflight_stats, request_key
+from master_agent.utils.state_manager import session_scope
+
+RESEARCH = "Keywords: coalescing, concurrency\nTarget Audience: engineers\n"
+POST = "# Coalesced Post\n\n## Why it matters\n\nBody.\n\n**Keywords**: coalescing, concurrency\n"
+
+
+def run_threads(fake: FakeClient, callers: int, call) -> tuple:
+    """Run ``call()`` in ``callers`` sessions on threads at once; return (model calls, wall s)."""
+    def worker(i: int):
+        with session_scope(f"bench-singleflight-{i}"):
+            return call()
+    
+    calls = fake.models.calls
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(worker, range(callers)))
+    return fake.models.calls - calls, time.perf_counter() - start
+
+
+async def run_tasks(fake: FakeClient, callers: int, coalesce: bool) -> tuple:
+    """The same model request from ``callers`` asyncio tasks; return (model calls, wall s)."""
+    flight = get_singleflight("bench_async")
+    key = request_key(MODEL_NAME, "async brief")
+    
+    def request():
+        return fake.models.generate_content(model=MODEL_NAME, contents="async brief")
+    
+    async def task():
+        if coalesce:
+            return await flight.do_async(key, request)
+        return await asyncio.to_thread(request)
+    
+    calls = fake.models.calls
+    start = time.perf_counter()
+    await asyncio.gather(*(task() for _ in range(callers)))
+    return fake.models.calls - calls, time.perf_counter() - start
+
+
+def check_errors(callers: int) -> tuple:
+    """Every caller of a failing request gets the upstream error; return (upstream calls, errors seen)."""
+    failing = FakeClient(latency=0.1, error_rate=1.0)
+    flight = get_singleflight("bench_errors")
+    key = request_key(MODEL_NAME, "failing brief")
+    
+    def call():
+        try:
+            flight.do(key, failing.models.generate_content, model=MODEL_NAME, contents="failing brief")
+        except FakeAPIError as e:
+            return e.code
+        return None
+    
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        codes = list(pool.map(lambda _: call(), range(callers)))
+    return failing.models.calls, sum(1 for code in codes if code == failing.models.error_code)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Single-flight request coalescing benchmark.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per model call")
+    parser.add_argument("--callers", type=int, default=16, help="Concurrent identical requests")
+    args = parser.parse_args()
+    
+    # Derivative encoding has its own benchmark (bench_image_derivatives)
+    image_derivatives.IMAGE_DERIVATIVES_ENABLED = False
+    fake = FakeClient(latency=args.latency, text_size=6_000)
+    scenarios = {
+        "write_content": lambda: writing_tools.write_content("Coalesced post", RESEARCH),
+        "creative": lambda: creative_tools.generate_ai_creative(POST)
+    }
+    with override_client(fake), override_rate_limits({}), tempfile.TemporaryDirectory() as tmp:
+        creative_tools.GENERATED_CREATIVES_DIR = tmp
+        print(f"{'scenario':<15} {'coalescing':<11} {'model calls':>12} {'wall s':>8}")
+        for name, call in scenarios.items():
+            for coalesce in (False, True):
+                writing_tools.REQUEST_COALESCING_ENABLED = coalesce
+                creative_tools.REQUEST_COALESCING_ENABLED = coalesce
+                calls, wall = run_threads(fake, args.callers, call)
+                print(f"{name:<15} {'on' if coalesce else 'off':<11} {calls:>12} {wall:>8.2f}")
+        for coalesce in (False, True):
+            calls, wall = asyncio.run(run_tasks(fake, args.callers, coalesce))
+            print(f"{'asyncio tasks':<15} {'on' if coalesce else 'off':<11} {calls:>12} {wall:>8.2f}")
+    
+    upstream, failed = check_errors(args.callers)
+    print(f"\nerror propagation: {upstream} upstream call(s), {failed}/{args.callers} callers raised the error")
+    print("\nflight counters:")
+    for name, stats in get_singleflight_stats().items():
+        print(f"  {name:<22} calls {stats['calls']:>3}, coalesced {stats['coalesced']:>3}, "
+              f"errors {stats['errors']}, retries {stats['retries']}, in flight {stats['in_flight']}")
+
+
+if __name__ == "__main__":
+    main()
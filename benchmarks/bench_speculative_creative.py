@@ -0,0 +1,78 @@
+"""Benchmark: speculative creative generation overlapped with the review phase.
+
+Drives write_content → review → generate_ai_creative for a series of posts on
+a stubbed client. Between the review and the creative call the benchmark waits
+``--gap`` seconds, which stands in for the reviewer agent's turns and the user
+confirming images. Some posts get a new title in review (``--change-rate``), so
+their speculative images are discarded. Reports the time from the end of the
+review to the finished creative, with and without speculation, plus the
+hit/waste counters.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_speculative_creative
+    python -m benchmarks.bench_speculative_creative --gap 0.2 --change-rate 0.5
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from master_agent.tools import creative_tools, writing_tools
+from master_agent.tools.review_tools import review_and_polish
+from master_agent.utils import image_derivatives
+from master_agent.utils.fake_genai import FakeClient
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.state_manager import session_scope
+
+RESEARCH = "Keywords: creative, speculation\nTarget Audience: engineers\n"
+
+
+def run(speculative: bool, posts: int, gap: float, change_rate: float, rng: random.Random) -> list:
+    writing_tools.SPECULATIVE_CREATIVE_ENABLED = speculative
+    waits = []
+    retitled = set(rng.sample(range(posts), round(posts * change_rate)))
+    for post in range(posts):
+        with session_scope(f"bench-{speculative}-{post}"):
+            draft = writing_tools.write_content(f"Speculative post {post}", RESEARCH)
+            polished = review_and_polish(draft)
+            if post in retitled:
+                polished = polished.replace("# ", "# Revised: ", 1)
+            time.sleep(gap)
+            start = time.perf_counter()
+            creative_tools.generate_ai_creative(polished)
+            waits.append(time.perf_counter() - start)
+    return waits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Speculative creative generation benchmark.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per model call")
+    parser.add_argument("--gap", type=float, default=0.3, help="Seconds between review and the creative call")
+    parser.add_argument("--posts", type=int, default=10)
+    parser.add_argument("--change-rate", type=float, default=0.2, help="Share of posts retitled in review")
+    args = parser.parse_args()
+    
+    # Derivative encoding has its own benchmark (bench_image_derivatives)
+    image_derivatives.IMAGE_DERIVATIVES_ENABLED = False
+    fake = FakeClient(latency=args.latency, text_size=6_000)
+    with override_client(fake), override_rate_limits({}), tempfile.TemporaryDirectory() as tmp:
+        creative_tools.GENERATED_CREATIVES_DIR = tmp
+        print(f"{'mode':<12} {'creative wait p50 s':>20} {'max s':>7} {'image calls':>12}")
+        for speculative in (False, True):
+            calls = fake.models.calls
+            waits = run(speculative, args.posts, args.gap, args.change_rate, random.Random(0))
+            time.sleep(args.latency)  # Let discarded speculations finish so their calls are counted
+            image_calls = fake.models.calls - calls - args.posts  # Minus one draft call per post
+            mode = "speculative" if speculative else "serial"
+            print(f"{mode:<12} {statistics.median(waits):>20.3f} {max(waits):>7.3f} {image_calls:>12}")
+    stats = creative_tools.get_speculation_stats()
+    print(f"\nstarted {stats['started']}, hits {stats['hits']} ({stats['hit_rate']:.0%}), "
+          f"discarded {stats['discarded']}, unused {stats['unused']}, wasted images {stats['wasted_images']}, "
+          f"saved {stats['saved_seconds']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
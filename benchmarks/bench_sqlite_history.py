@@ -0,0 +1,70 @@
+"""Benchmark indexed history lookups over 100k stored posts.
+
+Fills a SQLite workflow store with drafts, finals and creatives for 100k posts,
+then times topic, session and creative lookups against a linear scan over the
+same records held in memory (what the single-dict WorkflowState would require).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_sqlite_history [posts]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from master_agent.utils.sqlite_store import SQLiteStateStore, normalize_topic
+
+POSTS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+SESSIONS = 1000
+QUERIES = 200
+BODY = "lorem ipsum dolor sit amet " * 200
+
+
+def timed(fn, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteStateStore(os.path.join(tmp, "history.db"))
+        finals = []
+        start = time.perf_counter()
+        with store.transaction():
+            for i in range(POSTS):
+                session_id = f"campaign-{i % SESSIONS}"
+                topic = f"Topic number {i}"
+                record = {"topic": topic, "content": f"# {topic}\n\n{BODY}", "review_notes": "ok"}
+                store.record(session_id, "set", "final_content", record)
+                store.record(session_id, "add", "creative_suggestions",
+                             {"content_title": topic, "creative_type": "featured image", "count": 1})
+                finals.append((session_id, record))
+        load_s = time.perf_counter() - start
+        size_mb = os.path.getsize(os.path.join(tmp, "history.db")) / 1e6
+        print(f"stored {POSTS} posts in {load_s:.1f}s ({size_mb:.0f} MB on disk)\n")
+
+        topics = [f"topic NUMBER {random.randrange(POSTS)}" for _ in range(QUERIES)]
+        sessions = [f"campaign-{random.randrange(SESSIONS)}" for _ in range(QUERIES)]
+
+        rows = [
+            ("has_topic", lambda t: store.has_topic(t),
+             lambda t: any(normalize_topic(r["topic"]) == normalize_topic(t) for _, r in finals), topics),
+            ("find_by_topic", lambda t: store.find_by_topic(t),
+             lambda t: [r for _, r in finals if normalize_topic(r["topic"]) == normalize_topic(t)], topics),
+            ("list_posts(session)", lambda s: store.list_posts(s, limit=20),
+             lambda s: [r for sid, r in finals if sid == s][-20:], sessions),
+            ("list_creatives(session)", lambda s: store.list_creatives(session_id=s, limit=50),
+             lambda s: [r for sid, r in finals if sid == s][-50:], sessions),
+        ]
+        print(f"{'lookup':<24} {'sqlite ms':>10} {'scan ms':>10}")
+        for name, indexed, scan, queries in rows:
+            print(f"{name:<24} {timed(indexed, queries):>10.3f} {timed(scan, queries[:20]):>10.3f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark workflow state save cost: full JSON rewrite vs append-only journal.
+
+Grows the persisted state to thousands of posts (one session per post) and
+measures the cost of persisting a single additional update with each approach.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_state_persistence
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from master_agent.utils.state_journal import StateJournal
+from master_agent.utils.state_manager import WorkflowState
+
+CHECKPOINTS = [100, 500, 1000, 2500, 5000]
+SAMPLES = 20
+BODY = "lorem ipsum " * 800  # ~10 KB draft
+
+
+def post(i: int) -> dict:
+    return {"topic": f"post {i}", "content": BODY, "word_count": 1500}
+
+
+def full_rewrite_cost(path: str, states: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(SAMPLES):
+        with open(path, 'w') as f:
+            json.dump(states, f, indent=2)
+    return (time.perf_counter() - start) / SAMPLES
+
+
+def journal_cost(journal: StateJournal, n: int) -> float:
+    state = WorkflowState(f"session-{n}", backend=journal)
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        state.set_draft_content(post(n + i))
+    journal.flush()
+    return (time.perf_counter() - start) / SAMPLES
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = StateJournal(os.path.join(tmp, "state.jsonl"), os.path.join(tmp, "snapshot.json"),
+                               compact_every=10 ** 9)
+        states = {}
+        print(f"{'posts':>6} {'rewrite ms':>11} {'journal ms':>11} {'speedup':>8}")
+        for n in range(max(CHECKPOINTS)):
+            state = WorkflowState(f"session-{n}", backend=journal)
+            state.set_draft_content(post(n))
+            states[state.session_id] = state.state
+            if n + 1 in CHECKPOINTS:
+                rewrite = full_rewrite_cost(os.path.join(tmp, "state.json"), states)
+                append = journal_cost(journal, n + 1)
+                print(f"{n + 1:>6} {rewrite * 1000:>11.2f} {append * 1000:>11.3f} {rewrite / append:>7.0f}x")
+
+        start = time.perf_counter()
+        journal.compact()
+        print(f"\ncompaction of {len(states)} posts: {(time.perf_counter() - start) * 1000:.1f} ms")
+        journal.close()
+
+        start = time.perf_counter()
+        StateJournal(os.path.join(tmp, "state.jsonl"), os.path.join(tmp, "snapshot.json")).close()
+        print(f"replay (snapshot + journal): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
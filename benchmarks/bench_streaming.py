@@ -0,0 +1,33 @@
+"""Benchmark time-to-first-chunk of streamed vs one-shot drafts.
+
+Uses a stubbed client whose latency is spread across the streamed chunks, and
+reports the metrics write_content records on the draft.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_streaming
+"""
+
+from master_agent.tools import writing_tools
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.state_manager import workflow_state
+from master_agent.utils.fake_genai import FakeClient
+
+LATENCY = 1.0  # seconds for a full simulated draft
+RESEARCH = "Keywords: benchmarking, streaming\nTarget Audience: engineers\n"
+
+
+def main() -> None:
+    fake = FakeClient(latency=LATENCY, text="# Streaming Benchmark\n\n" + "word " * 3000)
+    print(f"{'mode':<10} {'first chunk s':>14} {'total s':>9}")
+    with override_client(fake), override_rate_limits({}):
+        for streaming in (False, True):
+            writing_tools.WRITE_CONTENT_STREAMING = streaming
+            writing_tools.write_content("Streaming benchmark", RESEARCH, word_count=3000)
+            metrics = workflow_state.get_draft_content()["metrics"]
+            mode = "stream" if streaming else "one-shot"
+            print(f"{mode:<10} {metrics['time_to_first_chunk']:>14.3f} {metrics['total_latency']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
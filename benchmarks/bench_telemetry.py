@@ -0,0 +1,79 @@
+"""Benchmark: per-call overhead of telemetry on the model call path.
+
+Runs ``call_model`` against a zero-latency stub, so the numbers are pure
+framework overhead: the bare SDK call, ``call_model`` with telemetry off (the
+default), and ``call_model`` with telemetry on exporting spans to JSON lines
+and metrics to Prometheus text. Also times ``span()`` on its own.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_telemetry
+"""
+
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from master_agent.utils import telemetry
+from master_agent.utils.model_calls import call_model, override_rate_limits, reset_model_call_state
+
+CALLS = 20_000
+MODEL = "bench-model"
+RESPONSE = SimpleNamespace(
+    candidates=[SimpleNamespace(content=SimpleNamespace(parts=[SimpleNamespace(text="x" * 2000, inline_data=None)]))],
+    usage_metadata=SimpleNamespace(prompt_token_count=250, candidates_token_count=500)
+)
+
+
+def generate_content(model: str, contents: str) -> SimpleNamespace:
+    return RESPONSE
+
+
+def per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        fn()
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+def main() -> None:
+    prompt = "Write about content strategy. " * 100
+    bare = per_call_us(lambda: generate_content(model=MODEL, contents=prompt))
+    
+    def wrapped():
+        call_model(MODEL, generate_content, model=MODEL, contents=prompt)
+    
+    def noop_span():
+        with telemetry.span("bench"):
+            pass
+    
+    with override_rate_limits({}), tempfile.TemporaryDirectory() as tmp:
+        reset_model_call_state()
+        disabled = per_call_us(wrapped)
+        span_off = per_call_us(noop_span)
+        
+        telemetry.enable(["jsonl", "prometheus"], jsonl_path=os.path.join(tmp, "telemetry.jsonl"),
+                         prometheus_path=os.path.join(tmp, "metrics.prom"))
+        enabled = per_call_us(wrapped)
+        span_on = per_call_us(noop_span)
+        start = time.perf_counter()
+        telemetry.flush()
+        flush_ms = (time.perf_counter() - start) * 1000
+        spans_mb = os.path.getsize(os.path.join(tmp, "telemetry.jsonl")) / 1e6
+        telemetry.disable()
+    
+    print(f"{CALLS} calls per case, zero-latency stub\n")
+    print(f"{'case':<36}{'us/call':>10}{'vs SDK':>10}")
+    print(f"{'SDK call alone':<36}{bare:>10.2f}{'-':>10}")
+    print(f"{'call_model, telemetry off':<36}{disabled:>10.2f}{disabled - bare:>10.2f}")
+    print(f"{'call_model, telemetry on':<36}{enabled:>10.2f}{enabled - bare:>10.2f}")
+    print(f"{'span(), telemetry off':<36}{span_off:>10.2f}")
+    print(f"{'span(), telemetry on':<36}{span_on:>10.2f}")
+    print(f"\ncall_model's own cost (limiter, breaker, slot) dominates when telemetry is off; a disabled "
+          f"span costs {span_off:.2f} us. Enabling telemetry adds {enabled - disabled:.1f} us per call, "
+          f"against 100,000+ us for a real model call.")
+    print(f"Telemetry on: {spans_mb:.1f} MB of spans for {2 * CALLS} spans, flush in {flush_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,8 @@ from .sub_agents.research_agent import research_agent
 from .sub_agents.writer_agent import writer_agent
 from .sub_agents.reviewer_agent import reviewer_agent
 from .tools.creative_tools import generate_ai_creative
-from .config.settings import MODEL_NAME
+from .utils.telemetry import adk_callbacks
+from .config.settings import MODEL_NAME, ROOT_AGENT_MODE
 
 
 # Create AgentTools to enable communication with sub-agents
@@ -98,8 +99,14 @@ master_agent = Agent(
         "content with optional AI creative support, while maintaining clear communication with the user."
     ),
     tools=[research_agent_tool, writer_agent_tool, reviewer_agent_tool, creative_tool],
+    **adk_callbacks(),
 )
 
-# ADK looks for 'root_agent' variable - this is the main agent
-root_agent = master_agent
+# ADK looks for 'root_agent' variable - this is the main agent.
+# "pipeline" swaps in the deterministic workflow that skips LLM routing turns.
+if ROOT_AGENT_MODE == "pipeline":
+    from .pipeline_agent import pipeline_agent
+    root_agent = pipeline_agent
+else:
+    root_agent = master_agent
 
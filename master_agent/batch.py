@@ -0,0 +1,309 @@
+"""Headless batch pipeline: research → write → review → creative for many briefs.
+
+Calls the tool functions directly instead of routing every post through the
+LLM-driven master agent, so each post costs only the model calls its tools make.
+
+Usage:
+    python -m master_agent.batch briefs.jsonl -o results.jsonl --workers 8
+    python -m master_agent.batch briefs.csv -o results.jsonl --fake-model
+
+Each brief is a JSON object (or CSV row) with at least ``topic``; optional
+fields are ``id`` (unique within the file; defaults to the row index),
+``keywords`` (list, or a comma/semicolon separated string),
+``target_audience``, ``content_type``, ``word_count``, ``tone``,
+``creative_type``, ``style`` and ``image_count`` (0 skips the creative stage).
+
+Results are appended to the output file one JSON line per brief as soon as the
+brief finishes, and the output doubles as the checkpoint: re-running with the
+same output skips briefs that already completed successfully.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .tools.research_tools import conduct_research
+from .tools.writing_tools import write_content
+from .tools.review_tools import review_and_polish
+from .tools.creative_tools import generate_ai_creative
+from .utils.genai_client import override_client
+from .utils.model_calls import get_model_call_metrics, override_rate_limits
+from .utils.state_manager import session_scope, session_states
+from .utils import telemetry
+from .config.settings import (
+    BATCH_WORKERS,
+    DEFAULT_WORD_COUNT,
+    DEFAULT_TONE,
+    DEFAULT_TARGET_AUDIENCE,
+    DEFAULT_CREATIVE_TYPE,
+    DEFAULT_IMAGE_STYLE,
+    DEFAULT_IMAGE_COUNT
+)
+
+
+STAGES = ["research", "write", "review", "creative"]
+
+
+class StageError(Exception):
+    """A tool returned an error message instead of a result."""
+
+
+class DuplicateBriefError(ValueError):
+    """Two briefs share an id."""
+
+
+def load_briefs(path: str) -> List[Dict[str, Any]]:
+    """Read briefs from a JSONL or CSV file.
+
+    Args:
+        path: Path to a ``.jsonl``/``.json`` or ``.csv`` file
+
+    Returns:
+        List of brief dictionaries, each with an ``id``
+    
+    Raises:
+        ValueError: If a row is not a valid brief; the message names the file and line
+    """
+    briefs = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for index, (line_number, row) in enumerate(_rows(path, f)):
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{line_number}: a brief must be a JSON object")
+            brief = {key: value for key, value in row.items() if value not in (None, '')}
+            brief.setdefault("id", str(index))
+            briefs.append(brief)
+    return briefs
+
+
+def _rows(path: str, f: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, parsed row) for every row of a briefs file."""
+    if path.endswith('.csv'):
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"{path}:{line_number}: {e}") from e
+
+
+def _keywords(brief: Dict[str, Any]) -> List[str]:
+    keywords = brief.get("keywords", [])
+    if isinstance(keywords, str):
+        keywords = [k.strip() for k in keywords.replace(';', ',').split(',')]
+    return [k for k in keywords if k]
+
+
+def _check(result: str) -> str:
+    """Raise if a tool returned one of its error/warning messages."""
+    if result.lstrip().startswith(("❌", "⚠️")):
+        raise StageError(result.strip().splitlines()[0])
+    return result
+
+
+def process_brief(brief: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one brief through every stage in its own workflow session.
+
+    Args:
+        brief: Brief dictionary (see module docstring for fields)
+
+    Returns:
+        Result record with status, per-stage latency and outputs
+    """
+    session_id = f"batch:{brief['id']}"
+    latency: Dict[str, float] = {}
+    result: Dict[str, Any] = {"id": brief["id"], "topic": brief.get("topic"), "status": "ok"}
+    stage = STAGES[0]
+    
+    def timed(name: str, fn, *args, **kwargs) -> str:
+        nonlocal stage
+        stage = name
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            with telemetry.span(f"tool {fn.__name__}", {"tool.name": fn.__name__, "batch.stage": name}):
+                output = _check(fn(*args, **kwargs))
+            outcome = "ok"
+            return output
+        finally:
+            latency[name] = time.perf_counter() - start
+            telemetry.observe("tool_duration_seconds", latency[name], tool=fn.__name__, outcome=outcome)
+    
+    try:
+        with telemetry.span("batch.brief", {"brief.id": str(brief["id"])}), \
+                session_scope(session_id) as state:
+            research = timed("research", conduct_research, brief["topic"], _keywords(brief),
+                             brief.get("target_audience", DEFAULT_TARGET_AUDIENCE))
+            draft = timed("write", write_content, brief["topic"], research,
+                          brief.get("content_type", "blog post"),
+                          int(brief.get("word_count", DEFAULT_WORD_COUNT)),
+                          brief.get("tone", DEFAULT_TONE))
+            timed("review", review_and_polish, draft)
+            final_content = state.get_final_content()["content"]
+            result["final_content"] = final_content
+            
+            image_count = int(brief.get("image_count", DEFAULT_IMAGE_COUNT))
+            if image_count > 0:
+                timed("creative", generate_ai_creative, final_content,
+                      brief.get("creative_type", DEFAULT_CREATIVE_TYPE),
+                      brief.get("style", DEFAULT_IMAGE_STYLE), image_count)
+                result["creatives"] = state.get_creative_suggestions()[-1]["generated_images"]
+    except Exception as e:
+        result.update({"status": "error", "stage": stage, "error": str(e)})
+    finally:
+        session_states.discard(session_id)
+    
+    result["latency"] = latency
+    return result
+
+
+def _completed_ids(output_path: str) -> set:
+    """Ids of briefs that already finished successfully in a previous run."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn line from an interrupted run
+            if record.get("status") == "ok":
+                done.add(str(record["id"]))
+    return done
+
+
+def _has_torn_tail(path: str) -> bool:
+    """Whether a file ends in a partial line."""
+    if os.path.getsize(path) == 0:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _report(results: List[Dict[str, Any]], skipped: int, elapsed: float, workers: int) -> Dict[str, Any]:
+    errors = [r for r in results if r["status"] != "ok"]
+    stages = {}
+    for name in STAGES:
+        values = [r["latency"][name] for r in results if name in r["latency"]]
+        if values:
+            stages[name] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "max": max(values)
+            }
+    return {
+        "processed": len(results),
+        "skipped": skipped,
+        "succeeded": len(results) - len(errors),
+        "failed": len(errors),
+        "error_rate": len(errors) / len(results) if results else 0.0,
+        "errors_by_stage": {
+            name: sum(1 for r in errors if r.get("stage") == name) for name in STAGES
+        },
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": len(results) / elapsed if elapsed else 0.0,
+        "workers": workers,
+        "stage_latency_seconds": stages,
+        "model_calls": get_model_call_metrics()
+    }
+
+
+def run_batch(briefs: List[Dict[str, Any]], output_path: str, workers: int = BATCH_WORKERS,
+              fake_model: bool = False, fake_latency: float = 0.05) -> Dict[str, Any]:
+    """Process briefs concurrently, streaming one result line per brief.
+
+    Args:
+        briefs: Briefs to process (see ``load_briefs``)
+        output_path: JSONL file results are appended to; also the resume checkpoint
+        workers: Number of briefs processed in parallel
+        fake_model: Use the offline fake GenAI client instead of the real API
+        fake_latency: Simulated per-call latency of the fake client, in seconds
+
+    Returns:
+        Run report with throughput, error rate and per-stage latency
+    
+    Raises:
+        DuplicateBriefError: If two briefs share an id (ids key the sessions and the checkpoint)
+    """
+    seen, duplicates = set(), set()
+    for brief in briefs:
+        brief_id = str(brief["id"])
+        if brief_id in seen:
+            duplicates.add(brief_id)
+        seen.add(brief_id)
+    if duplicates:
+        raise DuplicateBriefError(f"Duplicate brief ids: {', '.join(sorted(duplicates))}")
+    done = _completed_ids(output_path)
+    pending = [b for b in briefs if str(b["id"]) not in done]
+    results: List[Dict[str, Any]] = []
+    
+    client_override = contextlib.nullcontext()
+    if fake_model:
+        from .utils.fake_genai import FakeClient
+        client_override = contextlib.ExitStack()
+        client_override.enter_context(override_client(FakeClient(latency=fake_latency)))
+        # The fake client has no provider quota to respect
+        client_override.enter_context(override_rate_limits({}))
+    
+    start = time.perf_counter()
+    with client_override, open(output_path, 'a', encoding='utf-8') as out, \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        if _has_torn_tail(output_path):
+            out.write("\n")  # Start after the partial line left by an interrupted run
+        futures = [executor.submit(process_brief, brief) for brief in pending]
+        # Stream results in completion order so one slow brief never holds back the file
+        for future in as_completed(futures):
+            result = future.result()
+            out.write(json.dumps(result, default=str) + "\n")
+            out.flush()
+            results.append(result)
+    
+    return _report(results, skipped=len(briefs) - len(pending),
+                   elapsed=time.perf_counter() - start, workers=workers)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the content pipeline for a file of briefs.")
+    parser.add_argument("briefs", help="JSONL or CSV file of briefs")
+    parser.add_argument("-o", "--output", required=True, help="JSONL results file (also the resume checkpoint)")
+    parser.add_argument("-w", "--workers", type=int, default=BATCH_WORKERS, help="Briefs processed in parallel")
+    parser.add_argument("--report", help="Write the run report as JSON to this path")
+    parser.add_argument("--fake-model", action="store_true", help="Use the offline fake model")
+    parser.add_argument("--fake-latency", type=float, default=0.05, help="Fake model latency per call (s)")
+    args = parser.parse_args(argv)
+    
+    try:
+        report = run_batch(load_briefs(args.briefs), args.output, workers=args.workers,
+                           fake_model=args.fake_model, fake_latency=args.fake_latency)
+    except DuplicateBriefError as e:
+        parser.error(str(e))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
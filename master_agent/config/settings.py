@@ -4,21 +4,129 @@
 MODEL_NAME = 'gemini-2.5-flash'
 IMAGE_GENERATION_MODEL = 'gemini-2.5-flash-image-preview'  # Model for AI creative generation
 
+# Root agent: "conversational" (LLM master agent delegating to LLM sub-agents) or
+# "pipeline" (fixed research → write → review/creative workflow calling tools directly)
+ROOT_AGENT_MODE = "conversational"
+
+# GenAI client pooling
+GENAI_HTTP_POOL_SIZE = 20  # Keep-alive HTTP connections shared by all tools
+GENAI_KEEPALIVE_EXPIRY = 60  # seconds an idle pooled connection is kept open
+TEXT_MODEL_MAX_CONCURRENCY = 8  # Max in-flight requests to MODEL_NAME
+IMAGE_MODEL_MAX_CONCURRENCY = 4  # Max in-flight requests to IMAGE_GENERATION_MODEL
+
+# Response cache for write_content (opt-in)
+RESPONSE_CACHE_ENABLED = False
+RESPONSE_CACHE_DIR = ".cache/responses"
+RESPONSE_CACHE_TTL = 7 * 24 * 3600  # seconds
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU-evicted beyond this size
+
+# Single-flight coalescing (opt-in): concurrent identical write_content briefs and
+# generate_ai_creative requests share one upstream call, across sessions
+REQUEST_COALESCING_ENABLED = False
+
+# Research cache for conduct_research (opt-in): reports are reused for briefs whose
+# normalized topic/keyword terms are similar enough, within the freshness window
+RESEARCH_CACHE_ENABLED = False
+RESEARCH_CACHE_DB = ".cache/research.db"
+RESEARCH_CACHE_MAX_AGE = 3 * 24 * 3600  # seconds a cached report stays fresh
+RESEARCH_CACHE_MIN_SIMILARITY = 0.8  # Token-set similarity (0-1) needed to reuse a report
+
+# Local knowledge base for conduct_research (see utils/corpus_index.py): top BM25
+# passages for the topic and keywords are added to the research report
+RESEARCH_CORPUS_DIR = None  # Directory of .md/.html/.txt documents (None = disabled)
+RESEARCH_CORPUS_INDEX_DIR = ".cache/corpus_index"
+RESEARCH_CORPUS_EXTENSIONS = [".md", ".markdown", ".txt", ".html", ".htm"]
+RESEARCH_CORPUS_PASSAGE_WORDS = 120  # Target passage length
+RESEARCH_CORPUS_TOP_K = 5  # Passages added to each report
+RESEARCH_CORPUS_REFRESH_INTERVAL = 300  # seconds between incremental index updates
+
 # Directory configuration
 GENERATED_CREATIVES_DIR = "generated_creatives"
 WORKFLOW_STATE_FILE = "workflow_state.json"
 
+# Workflow state persistence: "json" rewrites WORKFLOW_STATE_FILE on save_to_file,
+# "journal" appends every mutation to WORKFLOW_JOURNAL_FILE as it happens,
+# "sqlite" keeps the full queryable history in WORKFLOW_DB_FILE
+WORKFLOW_STATE_BACKEND = "json"
+WORKFLOW_DB_FILE = "workflow_state.db"
+WORKFLOW_JOURNAL_FILE = "workflow_state.jsonl"
+WORKFLOW_SNAPSHOT_FILE = "workflow_state.snapshot.json"
+JOURNAL_FSYNC_BATCH = 32  # Records per fsync
+JOURNAL_COMPACT_EVERY = 10000  # Records between snapshot compactions
+
+# Session-scoped workflow state
+SESSION_STORE_MAX_SESSIONS = 1000  # LRU-evicted beyond this many sessions
+SESSION_STORE_MAX_BYTES = 256 * 1024 * 1024  # Approximate memory cap across sessions
+SESSION_IDLE_TTL = 2 * 3600  # seconds before an idle session is evicted
+MAX_CREATIVE_SUGGESTIONS = 50  # Most recent creative records kept per session
+
 # Image generation settings
 DEFAULT_IMAGE_STYLE = "professional"
 DEFAULT_CREATIVE_TYPE = "featured image"
 DEFAULT_IMAGE_COUNT = 1
+IMAGE_GENERATION_CONCURRENCY = 4  # Max images generated in parallel (1 = sequential)
+SPECULATIVE_CREATIVE_ENABLED = False  # Start the default creative when a draft is stored; reused if review keeps the title and headings
+SPECULATIVE_CREATIVE_WORKERS = 2  # Background threads for speculative creatives
+SPECULATIVE_CREATIVE_TTL = 30 * 60  # seconds an unclaimed speculation is kept before its images are deleted
+
+# Web derivatives of generated images (requires Pillow; skipped when it isn't installed)
+IMAGE_DERIVATIVES_ENABLED = True
+IMAGE_DERIVATIVE_WIDTHS = [480, 960, 1600]  # Responsive widths in pixels (never upscaled)
+IMAGE_DERIVATIVE_FORMATS = ["webp"]  # Also "avif" or "jpeg"; unsupported formats are skipped
+IMAGE_DERIVATIVE_QUALITY = 80
+IMAGE_THUMBNAIL_SIZE = (320, 320)  # Thumbnail bounding box
+IMAGE_DERIVATIVE_WORKERS = 2  # Encoder processes
+
+# Content-addressed creative store (opt-in): images are saved once per distinct
+# payload under CREATIVE_STORE_DIR/blobs and indexed in CREATIVE_STORE_DIR/manifest.db
+CREATIVE_STORE_ENABLED = False
+CREATIVE_STORE_DIR = "generated_creatives/store"
 
-# Retry settings
-MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+# Retry settings (shared by every model call, see utils/model_calls.py)
+MAX_RETRIES = 3  # Total attempts per call, including the first
+RETRY_DELAY = 2  # seconds; base of the exponential backoff (full jitter)
+RETRY_MAX_DELAY = 30  # seconds; cap on a single backoff sleep
+MODEL_RATE_LIMITS = {  # Requests per minute per model, shared across tools (0 = unlimited)
+    MODEL_NAME: 60,
+    IMAGE_GENERATION_MODEL: 10,
+}
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures before failing fast
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30  # seconds before a trial call is let through
+
+# Batch pipeline
+BATCH_WORKERS = 4  # Briefs processed in parallel by master_agent.batch
 
 # Content settings
 DEFAULT_WORD_COUNT = 1500
 DEFAULT_TONE = "professional"
 DEFAULT_TARGET_AUDIENCE = "general"
+WRITE_CONTENT_STREAMING = False  # Use the streaming API for drafts (records time-to-first-chunk)
+PROMPT_TOKEN_BUDGET = 6000  # Tokens for the whole writing prompt; low-value research is condensed to fit (0 = no limit)
+PROMPT_TOKEN_COUNTER = "local"  # "local" estimator or "api" (the SDK's count_tokens, one request per count)
+LONG_FORM_MIN_WORDS = 3000  # Drafts of this length are outlined, then written section by section in parallel (0 = never)
+LONG_FORM_SECTION_WORDS = 600  # Target words per section; sets how many H2 sections the outline asks for
+LONG_FORM_CONCURRENCY = 4  # Sections generated in parallel
+
+# Near-duplicate detection (see utils/duplicate_index.py): final posts are indexed
+# with MinHash/LSH; drafts are checked against them and briefs are checked before
+# generation
+DUPLICATE_INDEX_ENABLED = False
+DUPLICATE_INDEX_DIR = ".cache/duplicates"
+DUPLICATE_SHINGLE_WORDS = 5  # Words per content shingle
+DUPLICATE_CONTENT_THRESHOLD = 0.5  # Estimated shingle Jaccard similarity for a duplicate post (~8% of words changed)
+DUPLICATE_BRIEF_THRESHOLD = 0.7  # Estimated Jaccard similarity of topic/keyword terms for a duplicate brief
+DUPLICATE_BRIEF_POLICY = "warn"  # "warn" (log and continue) or "block" (refuse to generate)
+
+# SEO review
+SEO_MIN_KEYWORD_DENSITY = 0.5  # percent; primary keyword below this is flagged
+SEO_MAX_KEYWORD_DENSITY = 3.0  # percent; any keyword above this is over-optimized
+SEO_AUTOMATON_CACHE_SIZE = 128  # Keyword sets whose matching automaton is kept
 
+# Telemetry (see utils/telemetry.py): spans per agent turn, tool and model call,
+# plus counters/histograms. Off by default; when off, nothing is registered on
+# the agents and recording calls return immediately.
+TELEMETRY_ENABLED = False
+TELEMETRY_EXPORTERS = ["jsonl"]  # Any of "jsonl", "prometheus", "otel" (OpenTelemetry API)
+TELEMETRY_JSONL_PATH = ".cache/telemetry/telemetry.jsonl"  # Spans as they end, metrics on flush
+TELEMETRY_PROMETHEUS_PATH = ".cache/telemetry/metrics.prom"  # Text exposition format, rewritten on flush
+TELEMETRY_LATENCY_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120]  # seconds
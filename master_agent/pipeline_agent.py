@@ -0,0 +1,167 @@
+"""Pipeline Agent - Deterministic research → write → review/creative workflow.
+
+Alternative root agent to the conversational ``master_agent``. Only the first
+step uses an LLM turn (to turn the user's request into a structured brief);
+every later stage calls its tool function directly and hands results to the
+next stage through session state, so a post costs one routing call plus the
+model calls made by the tools themselves. Select it with
+``ROOT_AGENT_MODE = "pipeline"`` in ``config/settings.py``.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from google.adk.agents import BaseAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.llm_agent import Agent
+from google.adk.events import Event, EventActions
+from google.genai import types
+from pydantic import BaseModel, Field
+from .tools.research_tools import conduct_research
+from .tools.writing_tools import write_content
+from .tools.review_tools import review_and_polish
+from .tools.creative_tools import generate_ai_creative
+from .utils.state_manager import SESSION_STATE_KEY, get_workflow_state, session_scope
+from .utils.telemetry import adk_callbacks
+from .config.settings import (
+    MODEL_NAME,
+    DEFAULT_WORD_COUNT,
+    DEFAULT_TONE,
+    DEFAULT_TARGET_AUDIENCE,
+    DEFAULT_CREATIVE_TYPE,
+    DEFAULT_IMAGE_STYLE,
+    DEFAULT_IMAGE_COUNT
+)
+
+
+class ContentBrief(BaseModel):
+    """Structured brief extracted from the user's request."""
+    
+    topic: str = Field(description="Main topic of the post")
+    keywords: List[str] = Field(default_factory=list, description="SEO keywords")
+    target_audience: str = Field(default=DEFAULT_TARGET_AUDIENCE)
+    content_type: str = Field(default="blog post")
+    word_count: int = Field(default=DEFAULT_WORD_COUNT)
+    tone: str = Field(default=DEFAULT_TONE)
+    creative_type: str = Field(default=DEFAULT_CREATIVE_TYPE)
+    style: str = Field(default=DEFAULT_IMAGE_STYLE)
+    image_count: int = Field(default=DEFAULT_IMAGE_COUNT, description="0 to skip image generation")
+
+
+class ToolStepAgent(BaseAgent):
+    """Runs one pipeline stage by calling its tool function directly (no LLM turn).
+
+    ``step`` receives the session state and returns a dict with a ``message``
+    shown to the user and a ``state_delta`` merged into the session state.
+    """
+    
+    step: Callable[[Dict[str, Any]], Dict[str, Any]]
+    
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = dict(ctx.session.state)
+        session_id = state.get(SESSION_STATE_KEY) or ctx.session.id
+        
+        def run() -> Dict[str, Any]:
+            with session_scope(session_id):
+                return self.step(state)
+        
+        # Tools are synchronous; keep the event loop free while they run
+        result = await asyncio.to_thread(run)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=result["message"])]),
+            actions=EventActions(state_delta={SESSION_STATE_KEY: session_id, **result["state_delta"]}),
+        )
+
+
+def _brief(state: Dict[str, Any]) -> ContentBrief:
+    brief = state.get("brief") or {}
+    if isinstance(brief, str):
+        brief = json.loads(brief)
+    return ContentBrief(**brief)
+
+
+def _research_step(state: Dict[str, Any]) -> Dict[str, Any]:
+    brief = _brief(state)
+    report = conduct_research(brief.topic, brief.keywords, brief.target_audience)
+    return {"message": report, "state_delta": {"research_report": report}}
+
+
+def _write_step(state: Dict[str, Any]) -> Dict[str, Any]:
+    brief = _brief(state)
+    draft = write_content(brief.topic, state["research_report"], brief.content_type,
+                          brief.word_count, brief.tone)
+    return {"message": draft, "state_delta": {"draft_content": draft}}
+
+
+def _review_step(state: Dict[str, Any]) -> Dict[str, Any]:
+    review = review_and_polish(state["draft_content"])
+    final = get_workflow_state().get_final_content()
+    return {
+        "message": review,
+        "state_delta": {"final_content": final["content"] if final else review}
+    }
+
+
+def _creative_step(state: Dict[str, Any]) -> Dict[str, Any]:
+    brief = _brief(state)
+    if brief.image_count <= 0:
+        return {"message": "Skipping AI creative generation.", "state_delta": {}}
+    # The image prompt only needs the title and headings, which review leaves
+    # untouched, so this runs in parallel with the review stage.
+    report = generate_ai_creative(state["draft_content"], brief.creative_type,
+                                  brief.style, brief.image_count)
+    return {"message": report, "state_delta": {"creative_report": report}}
+
+
+def build_pipeline_agent(brief_model: Optional[Any] = None) -> SequentialAgent:
+    """Build the deterministic content pipeline.
+
+    Args:
+        brief_model: Model used for brief extraction (defaults to MODEL_NAME)
+
+    Returns:
+        Root agent running brief → research → write → (review ∥ creative)
+    """
+    brief_agent = Agent(
+        model=brief_model or MODEL_NAME,
+        name='brief_agent',
+        description='Extracts a structured content brief from the user request.',
+        instruction=(
+            "Extract a content brief from the user's request. Use the topic they ask about, "
+            "any keywords, audience, content type, word count, tone and image preferences they "
+            "mention, and sensible defaults for anything they don't. Suggest 3-6 relevant SEO "
+            "keywords if none are given."
+        ),
+        output_schema=ContentBrief,
+        output_key='brief',
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        **adk_callbacks(),
+    )
+    # Workflow and tool-step agents make no LLM requests; only their turns are traced
+    traced = adk_callbacks(llm=False)
+    
+    return SequentialAgent(
+        name='pipeline_agent',
+        description='Deterministic research, writing, review and creative pipeline for blog content.',
+        sub_agents=[
+            brief_agent,
+            ToolStepAgent(name='research_step', step=_research_step, **traced),
+            ToolStepAgent(name='write_step', step=_write_step, **traced),
+            ParallelAgent(
+                name='finish_step',
+                sub_agents=[
+                    ToolStepAgent(name='review_step', step=_review_step, **traced),
+                    ToolStepAgent(name='creative_step', step=_creative_step, **traced),
+                ],
+                **traced,
+            ),
+        ],
+        **traced,
+    )
+
+
+pipeline_agent = build_pipeline_agent()
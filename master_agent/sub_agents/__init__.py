@@ -1,8 +1,25 @@
 """Sub-agents for the multi-agent workflow system."""
 
-from .research_agent import research_agent
-from .writer_agent import writer_agent
-from .reviewer_agent import reviewer_agent
+import importlib
+from typing import Any
 
-__all__ = ['research_agent', 'writer_agent', 'reviewer_agent']
+# Resolved on first access (PEP 562) so importing one sub-agent (and google.adk) doesn't import the rest
+_LAZY_ATTRIBUTES = {
+    'research_agent': '.research_agent',
+    'writer_agent': '.writer_agent',
+    'reviewer_agent': '.reviewer_agent',
+}
 
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -3,6 +3,7 @@
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools.function_tool import FunctionTool
 from ..tools.research_tools import conduct_research
+from ..utils.telemetry import adk_callbacks
 from ..config.settings import MODEL_NAME
 
 
@@ -36,5 +37,6 @@ research_agent = Agent(
         "Always provide structured, actionable research findings."
     ),
     tools=[research_tool],
+    **adk_callbacks(),
 )
 
@@ -3,6 +3,7 @@
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools.function_tool import FunctionTool
 from ..tools.review_tools import review_and_polish
+from ..utils.telemetry import adk_callbacks
 from ..config.settings import MODEL_NAME
 
 
@@ -41,5 +42,6 @@ reviewer_agent = Agent(
         "Always provide comprehensive reviews that significantly improve content quality."
     ),
     tools=[review_tool],
+    **adk_callbacks(),
 )
 
@@ -3,6 +3,7 @@
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools.function_tool import FunctionTool
 from ..tools.writing_tools import write_content
+from ..utils.telemetry import adk_callbacks
 from ..config.settings import MODEL_NAME
 
 
@@ -39,5 +40,6 @@ writer_agent = Agent(
         "Always create high-quality, comprehensive content based on the research provided."
     ),
     tools=[writing_tool],
+    **adk_callbacks(),
 )
 
@@ -1,14 +1,26 @@
 """Tools module for the multi-agent workflow system."""
 
-from .research_tools import conduct_research
-from .writing_tools import write_content
-from .review_tools import review_and_polish
-from .creative_tools import generate_ai_creative
-
-__all__ = [
-    'conduct_research',
-    'write_content',
-    'review_and_polish',
-    'generate_ai_creative'
-]
+import importlib
+from typing import Any
 
+# Resolved on first access (PEP 562) so importing one tool doesn't import the rest
+_LAZY_ATTRIBUTES = {
+    'conduct_research': '.research_tools',
+    'write_content': '.writing_tools',
+    'review_and_polish': '.review_tools',
+    'generate_ai_creative': '.creative_tools',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
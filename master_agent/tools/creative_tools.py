@@ -3,38 +3,230 @@
 import re
 import os
 import base64
+import contextvars
+import copy
+import tempfile
+import threading
 import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from google.genai import Client
-from ..utils.state_manager import workflow_state
+from typing import Any, Dict, List, Optional, Tuple
+from ..utils.state_manager import get_workflow_state, session_states
+from ..utils.genai_client import get_client
+from ..utils.model_calls import call_model
+from ..utils.image_derivatives import build_derivatives
+from ..utils.creative_store import get_creative_store
+from ..utils.singleflight import get_singleflight, request_key
+from ..utils import telemetry
+from ..utils.telemetry import record_bytes_written
 from ..utils.file_utils import ensure_directory_exists, clean_filename
 from ..config.settings import (
     GENERATED_CREATIVES_DIR,
     IMAGE_GENERATION_MODEL,
     DEFAULT_IMAGE_STYLE,
     DEFAULT_CREATIVE_TYPE,
-    MAX_RETRIES,
-    RETRY_DELAY
+    DEFAULT_IMAGE_COUNT,
+    IMAGE_GENERATION_CONCURRENCY,
+    CREATIVE_STORE_ENABLED,
+    REQUEST_COALESCING_ENABLED,
+    SPECULATIVE_CREATIVE_TTL,
+    SPECULATIVE_CREATIVE_WORKERS
 )
 
 
-def generate_ai_creative(content: str, creative_type: str = DEFAULT_CREATIVE_TYPE, 
-                         style: str = DEFAULT_IMAGE_STYLE, count: int = 1) -> str:
-    """Generate AI creative images for blog posts and save them to a directory.
+def _attach_derivatives(image_info: Dict[str, Any], filepath: str, **options: Any) -> None:
+    """Add web derivatives of a saved image to its record.
+    
+    Derivatives (responsive widths, WebP, thumbnail) are encoded in worker
+    processes; a failure there still keeps the original.
+    """
+    try:
+        derivatives = build_derivatives(filepath, **options)
+    except Exception as e:
+        image_info["derivatives_error"] = str(e)
+    else:
+        if derivatives:
+            image_info.update(derivatives)
+
+
+def _store_image(image_bytes: bytes, ext: str, number: int, image_prompt: str, title: Optional[str],
+                 creative_type: str, session_id: Optional[str]) -> Dict[str, Any]:
+    """Save an image in the content-addressed creative store.
+    
+    Identical bytes are stored once; when an image was already stored, its
+    derivatives are reused from the manifest instead of being encoded again.
+    """
+    store = get_creative_store()
+    stored = store.add(image_bytes, ext, post_title=title, creative_type=creative_type,
+                       prompt=image_prompt, session_id=session_id, metadata={"number": number})
+    image_info = {
+        "number": number,
+        "filename": os.path.basename(stored["path"]),
+        "filepath": stored["path"],
+        "prompt": image_prompt,
+        "blob_hash": stored["blob_hash"],
+        "deduplicated": stored["deduplicated"]
+    }
+    
+    known = store.derivatives_of(stored["blob_hash"]) if stored["deduplicated"] else []
+    if known:
+        image_info.update({
+            "source_bytes": len(image_bytes),
+            "derivatives": [
+                {"kind": d["variant"], "format": d["format"], "width": d["width"], "height": d["height"],
+                 "path": d["path"], "bytes": d["bytes"], "blob_hash": d["blob_hash"]}
+                for d in known
+            ],
+            "encode_seconds": 0.0
+        })
+        return image_info
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        _attach_derivatives(image_info, stored["path"], output_dir=tmp)
+        for derivative in image_info.get("derivatives", []):
+            record = store.add_file(
+                derivative["path"], post_title=title, creative_type=creative_type,
+                kind="derivative", parent_hash=stored["blob_hash"], session_id=session_id,
+                metadata={"variant": derivative["kind"], "format": derivative["format"],
+                          "width": derivative["width"], "height": derivative["height"]}
+            )
+            derivative.update(path=record["path"], blob_hash=record["blob_hash"])
+    return image_info
+
+
+def _claim_images(images: List[Dict[str, Any]], title: Optional[str], creative_type: str,
+                  session_id: Optional[str]) -> None:
+    """Record stored images generated by another session in the manifest under this one."""
+    if not CREATIVE_STORE_ENABLED:
+        return
+    store = get_creative_store()
+    for image in images:
+        if "blob_hash" not in image:
+            continue  # Prompt file fallback, not in the store
+        store.add_reference(image["blob_hash"], post_title=title, creative_type=creative_type,
+                            prompt=image["prompt"], session_id=session_id, metadata={"number": image["number"]})
+        for derivative in image.get("derivatives", []):
+            store.add_reference(
+                derivative["blob_hash"], post_title=title, creative_type=creative_type,
+                kind="derivative", parent_hash=image["blob_hash"], session_id=session_id,
+                metadata={"variant": derivative["kind"], "format": derivative["format"],
+                          "width": derivative["width"], "height": derivative["height"]}
+            )
+
+
+def _generate_single_image(client: Any, number: int, image_prompt: str, images_dir: str,
+                           safe_title: str, creative_type: str, timestamp: str,
+                           title: Optional[str] = None, session_id: Optional[str] = None) -> Dict[str, Any]:
+    """Generate and save a single image, retrying independently of other images.
     
     Args:
-        content: The blog post content to create creatives for
-        creative_type: Type of creative (featured image, social media graphic, infographic, etc.)
-        style: Visual style (professional, modern, minimalist, vibrant, etc.)
-        count: Number of creatives to generate
+        client: GenAI client used for the request
+        number: 1-based image number within the batch
+        image_prompt: Prompt sent to the image generation model
+        images_dir: Directory the image (or prompt fallback) is saved to
+        safe_title: Filename-safe post title
+        creative_type: Type of creative being generated
+        timestamp: Batch timestamp plus a random suffix, shared by all images of one call
+        title: Post title, recorded in the creative store manifest
+        session_id: Workflow session, recorded in the creative store manifest
     
     Returns:
-        Information about generated images including file paths.
+        Image record for the workflow state (a prompt file record if generation failed).
     """
-    if not content:
-        return "❌ Error: No content provided for creative generation."
+    # Try to generate image using Gemini (note: Gemini 2.5 Flash may not support image generation)
+    # This is a placeholder - you may need to use a different image generation API
+    try:
+        # Generate image using Gemini 2.5 Flash Image Preview model; retries,
+        # backoff and rate limiting are shared with the other tools
+        response = call_model(
+            IMAGE_GENERATION_MODEL,
+            client.models.generate_content,
+            model=IMAGE_GENERATION_MODEL,
+            contents=image_prompt,
+        )
+        
+        # Check if response contains image data
+        if hasattr(response, 'candidates') and response.candidates:
+            candidate = response.candidates[0]
+            if hasattr(candidate, 'content') and candidate.content:
+                parts = candidate.content.parts
+                for part in parts:
+                    if hasattr(part, 'inline_data') and part.inline_data:
+                        # Extract image data
+                        image_data = part.inline_data.data
+                        image_mime = part.inline_data.mime_type
+                        
+                        # Determine file extension
+                        ext = 'png'
+                        if 'jpeg' in image_mime or 'jpg' in image_mime:
+                            ext = 'jpg'
+                        elif 'webp' in image_mime:
+                            ext = 'webp'
+                        
+                        # Decode image
+                        if isinstance(image_data, str):
+                            image_bytes = base64.b64decode(image_data)
+                        else:
+                            image_bytes = image_data
+                        
+                        if CREATIVE_STORE_ENABLED:
+                            return _store_image(image_bytes, ext, number, image_prompt,
+                                                title, creative_type, session_id)
+                        
+                        # Save image to file
+                        filename = f"{safe_title}_{creative_type.replace(' ', '_')}_{number}_{timestamp}.{ext}"
+                        filepath = os.path.join(images_dir, filename)
+                        with open(filepath, 'wb') as f:
+                            f.write(image_bytes)
+                        record_bytes_written("image", len(image_bytes))
+                        
+                        image_info = {
+                            "number": number,
+                            "filename": filename,
+                            "filepath": filepath,
+                            "prompt": image_prompt
+                        }
+                        _attach_derivatives(image_info, filepath)
+                        record_bytes_written("derivative", sum(d["bytes"] for d in image_info.get("derivatives", [])))
+                        return image_info
+        
+        # If no image data, create a placeholder file with prompt info
+        filename = f"{safe_title}_{creative_type.replace(' ', '_')}_{number}_{timestamp}.txt"
+        filepath = os.path.join(images_dir, filename)
+        with open(filepath, 'w') as f:
+            f.write(f"Image Prompt: {image_prompt}\n\n")
+            f.write(f"Note: Image generation requires an image generation API.\n")
+            f.write(f"Use this prompt with DALL-E, Midjourney, or Stable Diffusion.\n")
+        
+        return {
+            "number": number,
+            "filename": filename,
+            "filepath": filepath,
+            "prompt": image_prompt,
+            "note": "Prompt saved - use with image generation API"
+        }
     
-    # Extract key information from content
+    except Exception as e:
+        # Create prompt file as fallback
+        filename = f"{safe_title}_{creative_type.replace(' ', '_')}_{number}_{timestamp}.txt"
+        filepath = os.path.join(images_dir, filename)
+        with open(filepath, 'w') as f:
+            f.write(f"Image Prompt: {image_prompt}\n\n")
+            f.write(f"Error: {str(e)}\n")
+            f.write(f"Note: Use this prompt with an image generation API.\n")
+        
+        return {
+            "number": number,
+            "filename": filename,
+            "filepath": filepath,
+            "prompt": image_prompt,
+            "error": str(e)
+        }
+
+
+def _creative_brief(content: str) -> Tuple[str, List[str]]:
+    """Post title and the top three H2 headings, which are all the image prompt uses."""
     title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
     title = title_match.group(1).strip() if title_match else "Blog Post"
     
@@ -43,16 +235,273 @@ def generate_ai_creative(content: str, creative_type: str = DEFAULT_CREATIVE_TYP
     heading_matches = re.findall(r'^##\s+(.+)$', content, re.MULTILINE)
     if heading_matches:
         keywords.extend(heading_matches[:3])  # Top 3 headings as keywords
+    return title, keywords
+
+
+def _generate_images(title: str, keywords: List[str], creative_type: str, style: str, count: int,
+                     session_id: Optional[str],
+                     cancelled: Optional[threading.Event] = None) -> Tuple[List[Dict[str, Any]], List[str], str]:
+    """Generate ``count`` images for a post concurrently.
     
+    Returns:
+        Tuple of (image records in image order, error messages, images directory)
+    """
     # Create directory for storing images
     images_dir = ensure_directory_exists(GENERATED_CREATIVES_DIR)
     
     # Clean title for filename
     safe_title = clean_filename(title)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Concurrent calls for the same title within one second must not overwrite each other
+    timestamp = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+    client = get_client()
+    
+    # Create enhanced prompt for image generation
+    main_keyword = keywords[0] if keywords else title
+    image_prompt = (
+        f"A {style} {creative_type} for a blog post about {title}. "
+        f"The image should be visually appealing, on-brand, and relevant to the content. "
+        f"Use colors that complement the topic and maintain a {style} aesthetic. "
+        f"Include visual elements that represent {main_keyword}. "
+        f"High quality, professional design, suitable for web use."
+    )
+    
+    def generate(number: int) -> Optional[Dict[str, Any]]:
+        if cancelled is not None and cancelled.is_set():
+            return None
+        return _generate_single_image(client, number, image_prompt, images_dir, safe_title,
+                                      creative_type, timestamp, title, session_id)
     
-    generated_images = []
-    client = Client()
+    # Dispatch every image at once, bounded by the configured concurrency cap.
+    # Each worker runs its own retries, so one failing image never holds up the others.
+    # Workers run in a copy of this context so their model call spans nest under the tool's.
+    generated_images, errors = [], []
+    max_workers = max(1, min(count, IMAGE_GENERATION_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, generate, i) for i in range(1, count + 1)]
+        
+        # Collect in submission order so the output stays ordered by image number
+        for i, future in enumerate(futures, start=1):
+            try:
+                image_info = future.result()
+                if image_info:
+                    generated_images.append(image_info)
+            except Exception as e:
+                errors.append(f"Error generating image #{i}: {str(e)}")
+    return generated_images, errors, images_dir
+
+
+class _Speculation:
+    """Images being generated in the background for a stored draft."""
+    
+    def __init__(self, key: Tuple[Any, ...]):
+        self.key = key
+        self.created = time.monotonic()
+        self.cancelled = threading.Event()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.future: Optional[Future] = None
+    
+    def run(self, title: str, keywords: List[str], creative_type: str, style: str, count: int,
+            session_id: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str], str]:
+        self.started = time.perf_counter()
+        try:
+            return _generate_images(title, keywords, creative_type, style, count, session_id, self.cancelled)
+        finally:
+            self.finished = time.perf_counter()
+
+
+_speculations: Dict[Optional[str], _Speculation] = {}
+_speculation_lock = threading.Lock()
+_speculation_pool: Optional[ThreadPoolExecutor] = None
+_speculation_stats = {"started": 0, "hits": 0, "discarded": 0, "unused": 0,
+                      "wasted_images": 0, "saved_seconds": 0.0}
+
+
+def _speculation_key(content: str, creative_type: str, style: str, count: int) -> Tuple[Any, ...]:
+    title, keywords = _creative_brief(content)
+    return (title, tuple(keywords), creative_type, style, count)
+
+
+def _record_speculation(outcome: str, **amounts: float) -> None:
+    with _speculation_lock:
+        _speculation_stats[outcome] += 1
+        for name, amount in amounts.items():
+            _speculation_stats[name] += amount
+    telemetry.count("speculative_creatives_total", outcome=outcome)
+
+
+def _discard(speculation: _Speculation, outcome: str) -> None:
+    """Cancel a speculation, or drop its images once the running generation ends.
+    
+    Images saved as plain files are deleted; images in the creative store are
+    kept, since the store deduplicates and other posts may share them.
+    """
+    speculation.cancelled.set()
+    if speculation.future is None or speculation.future.cancel():
+        _record_speculation(outcome)
+        return
+    
+    def drop(future: Future) -> None:
+        images = [] if future.exception() else future.result()[0]
+        for image in images:
+            if "blob_hash" in image:
+                continue
+            for path in [image["filepath"]] + [d["path"] for d in image.get("derivatives", [])]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        _record_speculation(outcome, wasted_images=sum(1 for image in images if "error" not in image))
+    speculation.future.add_done_callback(drop)
+
+
+def _expire_speculations() -> None:
+    """Discard speculations left unclaimed for longer than ``SPECULATIVE_CREATIVE_TTL``."""
+    cutoff = time.monotonic() - SPECULATIVE_CREATIVE_TTL
+    with _speculation_lock:
+        expired = [session_id for session_id, speculation in _speculations.items()
+                   if speculation.created < cutoff]
+        speculations = [_speculations.pop(session_id) for session_id in expired]
+    for speculation in speculations:
+        _discard(speculation, "unused")
+
+
+def discard_speculation(session_id: Optional[str]) -> None:
+    """Discard a session's unclaimed speculation (e.g. when the session is evicted)."""
+    with _speculation_lock:
+        speculation = _speculations.pop(session_id, None)
+    if speculation is not None:
+        _discard(speculation, "unused")
+
+
+# Sessions evicted from the state store will never claim their speculation
+session_states.add_eviction_listener(discard_speculation)
+
+
+def speculate_creative(content: str, session_id: Optional[str] = None) -> None:
+    """Start generating the default creative for a draft in the background.
+    
+    Called when ``write_content`` stores a draft and ``SPECULATIVE_CREATIVE_ENABLED``
+    is set. The image prompt only depends on the title and first headings, which
+    review rarely changes, so ``generate_ai_creative`` can usually reuse the
+    result. A newer draft for the same session replaces (and discards) an
+    unclaimed speculation, as do session eviction and ``SPECULATIVE_CREATIVE_TTL``.
+    
+    Args:
+        content: Draft content
+        session_id: Workflow session the draft belongs to
+    """
+    global _speculation_pool
+    _expire_speculations()
+    key = _speculation_key(content, DEFAULT_CREATIVE_TYPE, DEFAULT_IMAGE_STYLE, DEFAULT_IMAGE_COUNT)
+    speculation = _Speculation(key)
+    with _speculation_lock:
+        if _speculation_pool is None:
+            _speculation_pool = ThreadPoolExecutor(max_workers=SPECULATIVE_CREATIVE_WORKERS,
+                                                   thread_name_prefix="speculative-creative")
+        previous = _speculations.pop(session_id, None)
+        title, keywords, creative_type, style, image_count = key
+        speculation.future = _speculation_pool.submit(
+            contextvars.copy_context().run, speculation.run, title, list(keywords),
+            creative_type, style, image_count, session_id
+        )
+        _speculations[session_id] = speculation
+        _speculation_stats["started"] += 1
+    if previous is not None:
+        _discard(previous, "unused")
+
+
+def _claim_speculation(session_id: Optional[str], key: Tuple[Any, ...]
+                       ) -> Optional[Tuple[List[Dict[str, Any]], List[str], str]]:
+    """Take the session's speculative images if they were made for ``key``.
+    
+    A speculation for a different title, headings or options is discarded.
+    Waits for a matching speculation that is still running.
+    """
+    _expire_speculations()
+    with _speculation_lock:
+        speculation = _speculations.pop(session_id, None)
+    if speculation is None:
+        return None
+    if speculation.key != key:
+        _discard(speculation, "discarded")
+        return None
+    claimed = time.perf_counter()
+    try:
+        result = speculation.future.result()
+    except Exception as e:
+        print(f"⚠️ Speculative creative generation failed, generating again: {e}")
+        _record_speculation("discarded")
+        return None
+    # Time saved is the part of the generation that overlapped with the review
+    started = speculation.started or claimed
+    _record_speculation("hits", saved_seconds=max(0.0, min(claimed, speculation.finished or claimed) - started))
+    return result
+
+
+def get_speculation_stats() -> Dict[str, Any]:
+    """Counters for speculative creative generation.
+    
+    Returns:
+        Dictionary with ``started``, ``hits`` (reused), ``discarded`` (title or
+        headings changed), ``unused`` (replaced by a newer draft, expired or
+        evicted with its session), ``wasted_images``
+        (generated but thrown away), ``saved_seconds`` and ``hit_rate``
+    """
+    with _speculation_lock:
+        stats = dict(_speculation_stats)
+    settled = stats["hits"] + stats["discarded"] + stats["unused"]
+    stats["hit_rate"] = stats["hits"] / settled if settled else 0.0
+    return stats
+
+
+def generate_ai_creative(content: str, creative_type: str = DEFAULT_CREATIVE_TYPE, 
+                         style: str = DEFAULT_IMAGE_STYLE, count: int = DEFAULT_IMAGE_COUNT,
+                         tool_context: Optional[Any] = None) -> str:
+    """Generate AI creative images for blog posts and save them to a directory.
+    
+    Args:
+        content: The blog post content to create creatives for
+        creative_type: Type of creative (featured image, social media graphic, infographic, etc.)
+        style: Visual style (professional, modern, minimalist, vibrant, etc.)
+        count: Number of creatives to generate
+        tool_context: ADK tool context, injected by the framework to scope state to the session
+    
+    Returns:
+        Information about generated images including file paths.
+    """
+    if not content:
+        return "❌ Error: No content provided for creative generation."
+    
+    # Extract key information from content
+    title, keywords = _creative_brief(content)
+    state = get_workflow_state(tool_context)
+    
+    # Reuse images generated in the background while the draft was reviewed
+    speculative = _claim_speculation(state.session_id, (title, tuple(keywords), creative_type, style, count))
+    if speculative is not None:
+        generated_images, errors, images_dir = speculative
+    elif REQUEST_COALESCING_ENABLED:
+        # Concurrent requests for the same creative share one set of images; the
+        # manifest rows carry the leader's session, so followers add their own
+        coalesced = True
+        
+        def lead() -> Tuple[List[Dict[str, Any]], List[str], str]:
+            nonlocal coalesced
+            coalesced = False
+            return _generate_images(title, keywords, creative_type, style, count, state.session_id)
+        
+        key = request_key(IMAGE_GENERATION_MODEL, title, keywords, creative_type, style, count)
+        # Every caller gets its own copy of the shared records to store in its state
+        generated_images, errors, images_dir = copy.deepcopy(
+            get_singleflight("generate_ai_creative").do(key, lead)
+        )
+        if coalesced:
+            _claim_images(generated_images, title, creative_type, state.session_id)
+    else:
+        generated_images, errors, images_dir = _generate_images(
+            title, keywords, creative_type, style, count, state.session_id
+        )
     
     result_message = f"""
 🎨 AI CREATIVE GENERATION
@@ -65,116 +514,10 @@ def generate_ai_creative(content: str, creative_type: str = DEFAULT_CREATIVE_TYP
 
 🖼️ GENERATING IMAGES...
 """
-    
-    for i in range(1, count + 1):
-        try:
-            # Create enhanced prompt for image generation
-            main_keyword = keywords[0] if keywords else title
-            image_prompt = (
-                f"A {style} {creative_type} for a blog post about {title}. "
-                f"The image should be visually appealing, on-brand, and relevant to the content. "
-                f"Use colors that complement the topic and maintain a {style} aesthetic. "
-                f"Include visual elements that represent {main_keyword}. "
-                f"High quality, professional design, suitable for web use."
-            )
-            
-            # Try to generate image using Gemini (note: Gemini 2.5 Flash may not support image generation)
-            # This is a placeholder - you may need to use a different image generation API
-            image_generated = False
-            
-            for retry in range(MAX_RETRIES):
-                try:
-                    if retry > 0:
-                        time.sleep(RETRY_DELAY)
-                    
-                    # Generate image using Gemini 2.5 Flash Image Preview model
-                    response = client.models.generate_content(
-                        model=IMAGE_GENERATION_MODEL,
-                        contents=image_prompt,
-                    )
-                    
-                    # Check if response contains image data
-                    if hasattr(response, 'candidates') and response.candidates:
-                        candidate = response.candidates[0]
-                        if hasattr(candidate, 'content') and candidate.content:
-                            parts = candidate.content.parts
-                            for part in parts:
-                                if hasattr(part, 'inline_data') and part.inline_data:
-                                    # Extract image data
-                                    image_data = part.inline_data.data
-                                    image_mime = part.inline_data.mime_type
-                                    
-                                    # Determine file extension
-                                    ext = 'png'
-                                    if 'jpeg' in image_mime or 'jpg' in image_mime:
-                                        ext = 'jpg'
-                                    elif 'webp' in image_mime:
-                                        ext = 'webp'
-                                    
-                                    # Save image to file
-                                    filename = f"{safe_title}_{creative_type.replace(' ', '_')}_{i}_{timestamp}.{ext}"
-                                    filepath = os.path.join(images_dir, filename)
-                                    
-                                    # Decode and save image
-                                    if isinstance(image_data, str):
-                                        image_bytes = base64.b64decode(image_data)
-                                    else:
-                                        image_bytes = image_data
-                                    
-                                    with open(filepath, 'wb') as f:
-                                        f.write(image_bytes)
-                                    
-                                    generated_images.append({
-                                        "number": i,
-                                        "filename": filename,
-                                        "filepath": filepath,
-                                        "prompt": image_prompt
-                                    })
-                                    image_generated = True
-                                    break
-                    
-                    if not image_generated:
-                        # If no image data, create a placeholder file with prompt info
-                        filename = f"{safe_title}_{creative_type.replace(' ', '_')}_{i}_{timestamp}.txt"
-                        filepath = os.path.join(images_dir, filename)
-                        with open(filepath, 'w') as f:
-                            f.write(f"Image Prompt: {image_prompt}\n\n")
-                            f.write(f"Note: Image generation requires an image generation API.\n")
-                            f.write(f"Use this prompt with DALL-E, Midjourney, or Stable Diffusion.\n")
-                        
-                        generated_images.append({
-                            "number": i,
-                            "filename": filename,
-                            "filepath": filepath,
-                            "prompt": image_prompt,
-                            "note": "Prompt saved - use with image generation API"
-                        })
-                    
-                    break
-                    
-                except Exception as e:
-                    if retry == MAX_RETRIES - 1:
-                        # Create prompt file as fallback
-                        filename = f"{safe_title}_{creative_type.replace(' ', '_')}_{i}_{timestamp}.txt"
-                        filepath = os.path.join(images_dir, filename)
-                        with open(filepath, 'w') as f:
-                            f.write(f"Image Prompt: {image_prompt}\n\n")
-                            f.write(f"Error: {str(e)}\n")
-                            f.write(f"Note: Use this prompt with an image generation API.\n")
-                        
-                        generated_images.append({
-                            "number": i,
-                            "filename": filename,
-                            "filepath": filepath,
-                            "prompt": image_prompt,
-                            "error": str(e)
-                        })
-                    else:
-                        time.sleep(RETRY_DELAY)
-                        continue
-        
-        except Exception as e:
-            result_message += f"\n⚠️ Error generating image #{i}: {str(e)}\n"
+    if speculative is not None:
+        result_message += "\n⚡ Reused images generated in the background during review\n"
+    for error in errors:
+        result_message += f"\n⚠️ {error}\n"
     
     # Build result message
     result_message += f"\n✅ GENERATION COMPLETE\n"
@@ -191,6 +534,13 @@ def generate_ai_creative(content: str, creative_type: str = DEFAULT_CREATIVE_TYP
             result_message += f"  🎨 Prompt: {img['prompt'][:100]}...\n"
             if 'note' in img:
                 result_message += f"  ℹ️  Note: {img['note']}\n"
+            if img.get('derivatives'):
+                derived_bytes = sum(d['bytes'] for d in img['derivatives'])
+                result_message += (f"  🧩 Derivatives: {len(img['derivatives'])} files, "
+                                   f"{derived_bytes / 1024:.0f} KB total "
+                                   f"(original {img['source_bytes'] / 1024:.0f} KB)\n")
+            elif 'derivatives_error' in img:
+                result_message += f"  ⚠️ Derivatives failed: {img['derivatives_error']}\n"
             result_message += "\n"
         
         result_message += f"💡 Usage:\n"
@@ -203,13 +553,14 @@ def generate_ai_creative(content: str, creative_type: str = DEFAULT_CREATIVE_TYP
     result_message += f"\n{'=' * 60}\n"
     
     # Store in workflow state
-    workflow_state.add_creative_suggestion({
+    state.add_creative_suggestion({
         "content_title": title,
         "creative_type": creative_type,
         "style": style,
         "count": count,
         "generated_images": generated_images,
-        "images_directory": images_dir
+        "images_directory": images_dir,
+        "speculative": speculative is not None
     })
     
     return result_message
@@ -1,12 +1,207 @@
 """Review and editing tools for content polishing."""
 
-import re
-from typing import List, Optional
-from ..utils.state_manager import workflow_state
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+from ..utils.state_manager import WorkflowState, get_workflow_state
+from ..utils.markdown_analyzer import MarkdownStats, analyze_markdown, readability_label, split_sections
+from ..utils.seo_analyzer import combine_placements, keyword_placements, keywords_from_content, score_placements
+
+# Metrics compared against the previous review: (key in the review summary, label)
+_DIFF_METRICS = (
+    ("words", "Word Count"),
+    ("sentences", "Sentences"),
+    ("paragraphs", "Paragraphs"),
+    ("headings", "Headings"),
+    ("list_items", "List Items"),
+    ("links", "Links"),
+    ("images", "Images"),
+    ("avg_sentence_length", "Avg Sentence Length"),
+    ("long_sentences", "Long Sentences"),
+    ("flesch_reading_ease", "Flesch Reading Ease"),
+    ("flesch_kincaid_grade", "Grade Level"),
+    ("seo_score", "SEO Score")
+)
+
+
+def _assess(stats: MarkdownStats) -> Tuple[List[str], List[str]]:
+    """Derive strengths and recommendations from the measured statistics."""
+    strengths, recommendations = [], []
+    
+    if len(stats.headings) >= 3 and not stats.skipped_heading_levels:
+        strengths.append(f"Clear structure: {len(stats.headings)} headings with a consistent hierarchy")
+    elif len(stats.headings) < 3:
+        recommendations.append(f"Only {len(stats.headings)} heading(s); break the content into more sections")
+    for jump, text in stats.skipped_heading_levels[:3]:
+        recommendations.append(f"Heading level skips {jump} at \"{text}\"")
+    
+    ease = stats.flesch_reading_ease
+    if stats.sentences and ease >= 60:
+        strengths.append(f"Readable prose (Flesch {ease:.0f}, {readability_label(ease)})")
+    elif stats.sentences and ease < 50:
+        recommendations.append(f"Readability is {readability_label(ease)} (Flesch {ease:.0f}); "
+                               "use shorter sentences and simpler words")
+    
+    if stats.sentences and stats.long_sentences / stats.sentences > 0.2:
+        recommendations.append(f"{stats.long_sentences} of {stats.sentences} sentences are longer "
+                               "than 25 words; split them up")
+    elif stats.sentences:
+        strengths.append(f"Sentences average {stats.avg_sentence_length:.1f} words")
+    
+    if stats.avg_paragraph_length > 120:
+        recommendations.append(f"Paragraphs average {stats.avg_paragraph_length:.0f} words; "
+                               "shorter paragraphs scan better")
+    if stats.list_items:
+        strengths.append(f"{stats.list_items} list items make key points easy to scan")
+    else:
+        recommendations.append("Add bulleted or numbered lists for key points")
+    if stats.links:
+        strengths.append(f"{stats.links} link(s) to supporting resources")
+    else:
+        recommendations.append("Add internal/external links where appropriate")
+    if not stats.images:
+        recommendations.append("Consider adding images or visual elements")
+    return strengths, recommendations
+
+
+def _target_keywords(content: str, keywords: Optional[List[str]], state: WorkflowState) -> List[str]:
+    """Keywords to score: explicit ones, else the draft's metadata, else the research brief."""
+    if keywords:
+        return keywords
+    found = keywords_from_content(content)
+    if found:
+        return found
+    research = state.get_research_data() or {}
+    return list(research.get("keywords") or [])
+
+
+def _seo_notes(seo: Dict[str, Any]) -> str:
+    """SEO section of the review report."""
+    if seo["score"] is None:
+        return "\n🔍 SEO Analysis:\n   - No target keywords found; keyword checks skipped\n"
+    mark = lambda found: "✅" if found else "❌"
+    notes = f"\n🔍 SEO Analysis (score {seo['score']}/100):\n"
+    for result in seo["keywords"]:
+        label = " (primary)" if result["primary"] else ""
+        notes += (f"   - \"{result['keyword']}\"{label}: {result['count']} uses, "
+                  f"{result['density']}% density; title {mark(result['in_title'])}, "
+                  f"first paragraph {mark(result['in_first_paragraph'])}, "
+                  f"H2s {result['h2_count']}, meta {mark(result['in_meta_description'])}\n")
+    notes += "".join(f"   ⚠️ {issue}\n" for issue in seo["issues"])
+    return notes
+
+
+def _section_label(section: str) -> str:
+    first = section.split("\n", 1)[0].strip()
+    return first.lstrip("#").strip() if first.startswith("#") else "(before the first heading)"
+
+
+def _analyze_sections(content: str, keywords: Optional[List[str]], cache: Dict[str, Any]
+                      ) -> Tuple[MarkdownStats, Optional[Dict[str, Any]], Dict[str, Any], int, List[str]]:
+    """Analyze content section by section, reusing cached results for unchanged sections.
+    
+    Sections are split at headings and keyed by a hash of their text. Only
+    sections missing from the cache are analyzed; keyword placements are redone
+    for a cached section only when the target keywords changed. Section results
+    merge exactly into the results for the whole document.
+    
+    Args:
+        content: Markdown content
+        keywords: Target keywords, or None to skip keyword placements
+        cache: Section cache of the previous review (``{hash: entry}``)
+    
+    Returns:
+        Tuple of (stats, keyword placements or None, section cache for this
+        content, number of sections, labels of the sections that were analyzed).
+        Identical sections share one cache entry but each counts as a section.
+    """
+    keyword_key = "|".join(keywords) if keywords is not None else None
+    sections: Dict[str, Any] = {}
+    stats = MarkdownStats()
+    placements = []
+    analyzed = []
+    total = 0
+    for section in split_sections(content):
+        total += 1
+        digest = hashlib.blake2b(section.encode("utf-8"), digest_size=16).hexdigest()
+        entry = sections.get(digest) or dict(cache.get(digest) or {})
+        if "stats" not in entry:
+            entry["stats"] = analyze_markdown(section).totals()
+            analyzed.append(_section_label(section))
+        if keyword_key is not None and entry.get("keywords") != keyword_key:
+            entry["keywords"] = keyword_key
+            entry["placements"] = keyword_placements(section, keywords)
+        sections[digest] = entry
+        stats.merge(MarkdownStats.from_totals(entry["stats"]))
+        if keyword_key is not None:
+            placements.append(entry["placements"])
+    combined = combine_placements(placements) if keyword_key is not None else None
+    return stats, combined, sections, total, analyzed
+
+
+def _review_summary(stats: MarkdownStats, seo: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Metrics kept for comparison with the next review."""
+    metrics = stats.to_dict()
+    summary = {key: metrics[key] for key, _ in _DIFF_METRICS if key in metrics}
+    summary["seo_score"] = seo["score"] if seo else None
+    return summary
+
+
+def _changes_notes(previous: Dict[str, Any], current: Dict[str, Any], total: int, analyzed: List[str]) -> str:
+    """Report section comparing this review's metrics with the previous review's."""
+    notes = "\n🔁 Changes Since Last Review:\n"
+    notes += f"   - Sections: {len(analyzed)} of {total} re-analyzed ({total - len(analyzed)} unchanged)"
+    if analyzed:
+        notes += ": " + ", ".join(f'"{label}"' for label in analyzed[:5]) + ("…" if len(analyzed) > 5 else "")
+    notes += "\n"
+    changed = False
+    for key, label in _DIFF_METRICS:
+        before, after = previous.get(key), current.get(key)
+        if before == after or before is None or after is None:
+            continue
+        changed = True
+        delta = after - before
+        delta_text = f"{delta:+.1f}" if isinstance(delta, float) else f"{delta:+d}"
+        notes += f"   - {label}: {before} → {after} ({delta_text})\n"
+    if not changed:
+        notes += "   - No metric changes\n"
+    return notes
+
+
+def _review_notes(stats: MarkdownStats, seo: Optional[Dict[str, Any]] = None, changes: str = "") -> str:
+    """Build the review report from the content statistics, SEO analysis and changes since the last review."""
+    strengths, recommendations = _assess(stats)
+    levels = ", ".join(f"H{level}: {n}" for level, n in stats.heading_levels.items()) or "none"
+    distribution = ", ".join(f"{label}: {n}" for label, n in stats.sentence_length_distribution.items())
+    
+    notes = f"""
+📝 CONTENT REVIEW REPORT
+{'=' * 60}
+
+📊 Content Analysis:
+   - Word Count: {stats.words} words (~{max(1, round(stats.reading_time_minutes))} min read)
+   - Sentences: {stats.sentences} (avg {stats.avg_sentence_length:.1f} words)
+   - Sentence Lengths: {distribution}
+   - Paragraphs: {stats.paragraphs} paragraphs
+   - Headings: {len(stats.headings)} headings ({levels})
+   - Lists: {stats.list_items} items
+   - Links: {stats.links} links, {stats.images} images
+   - Readability: Flesch {stats.flesch_reading_ease:.1f} ({readability_label(stats.flesch_reading_ease)}), grade {stats.flesch_kincaid_grade:.1f}
+"""
+    if seo is not None:
+        notes += _seo_notes(seo)
+    notes += changes
+    notes += "\n✅ Strengths:\n"
+    notes += "".join(f"   - {item}\n" for item in strengths) or "   - None identified\n"
+    notes += "\n💡 Recommendations:\n"
+    notes += "".join(f"   - {item}\n" for item in recommendations) or "   - No issues found\n"
+    notes += f"\n{'=' * 60}\n"
+    return notes
 
 
 def review_and_polish(content: str, focus_areas: Optional[List[str]] = None, 
-                      seo_optimization: bool = True, grammar_check: bool = True) -> str:
+                      seo_optimization: bool = True, grammar_check: bool = True,
+                      keywords: Optional[List[str]] = None,
+                      tool_context: Optional[Any] = None) -> str:
     """Review, edit, and polish content for quality, SEO, and readability.
     
     Args:
@@ -14,6 +209,9 @@ def review_and_polish(content: str, focus_areas: Optional[List[str]] = None,
         focus_areas: Specific areas to focus on (clarity, SEO, engagement, etc.)
         seo_optimization: Whether to optimize for SEO (default: True)
         grammar_check: Whether to check grammar and spelling (default: True)
+        keywords: Target keywords, primary first (default: the draft's **Keywords** line,
+            then the research keywords)
+        tool_context: ADK tool context, injected by the framework to scope state to the session
     
     Returns:
         Polished and improved content with review notes.
@@ -23,61 +221,13 @@ def review_and_polish(content: str, focus_areas: Optional[List[str]] = None,
     
     focus_areas = focus_areas or ["clarity", "SEO", "engagement", "readability"]
     
-    # Analyze content
-    word_count = len(content.split())
-    heading_count = len(re.findall(r'^#+\s', content, re.MULTILINE))
-    paragraph_count = len(re.findall(r'\n\n', content))
+    state = get_workflow_state(tool_context)
     
-    # Review notes
-    review_notes = f"""
-📝 CONTENT REVIEW REPORT
-{'=' * 60}
-
-📊 Content Analysis:
-   - Word Count: {word_count} words
-   - Headings: {heading_count} headings
-   - Paragraphs: {paragraph_count} paragraphs
-
-✅ Strengths:
-   - Well-structured with clear headings
-   - Good use of formatting and organization
-   - Comprehensive coverage of the topic
-   - Engaging introduction and conclusion
-
-🔧 Improvements Made:
-
-1. Grammar and Spelling:
-   - ✅ Checked for grammatical errors
-   - ✅ Verified spelling accuracy
-   - ✅ Improved sentence structure
-   - ✅ Enhanced clarity and readability
-
-2. SEO Optimization:
-   - ✅ Optimized headings for search engines
-   - ✅ Ensured keyword integration
-   - ✅ Improved meta descriptions
-   - ✅ Enhanced content structure
-
-3. Engagement:
-   - ✅ Strengthened introduction hook
-   - ✅ Added more actionable insights
-   - ✅ Improved flow between sections
-   - ✅ Enhanced call-to-action
-
-4. Readability:
-   - ✅ Improved sentence length and variety
-   - ✅ Enhanced paragraph structure
-   - ✅ Better use of formatting
-   - ✅ Clearer transitions
-
-💡 Recommendations:
-   - Consider adding more specific examples
-   - Include relevant statistics or data points
-   - Add internal/external links where appropriate
-   - Consider adding images or visual elements
-
-{'=' * 60}
-"""
+    # Analyze only the sections that changed since the last review
+    cache = state.get_review_cache() or {}
+    target_keywords = _target_keywords(content, keywords, state) if seo_optimization else None
+    stats, placements, sections, total_sections, analyzed = _analyze_sections(content, target_keywords, cache.get("sections", {}))
+    seo = None
     
     # Polish the content (in production, this would use actual NLP tools)
     polished_content = content
@@ -85,12 +235,16 @@ def review_and_polish(content: str, focus_areas: Optional[List[str]] = None,
     # Add review improvements
     if seo_optimization:
         # Add meta description suggestion
+        title = stats.title or 'this topic'
+        meta_description = (f"Discover everything you need to know about {title}. "
+                            "Comprehensive guide with insights, best practices, and actionable tips.")
         polished_content = polished_content.replace(
             "**Status**: Draft - Ready for Review",
             "**Status**: ✅ Reviewed and Polished\n\n**Meta Description Suggestion**: " +
-            f"Discover everything you need to know about {content.split('#')[1].split('\n')[0].strip() if '#' in content else 'this topic'}. " +
-            "Comprehensive guide with insights, best practices, and actionable tips."
+            meta_description
         )
+        seo = score_placements(placements, target_keywords, total_words=stats.words,
+                               meta_description=meta_description)
     
     if grammar_check:
         # Mark as grammar-checked
@@ -99,13 +253,23 @@ def review_and_polish(content: str, focus_areas: Optional[List[str]] = None,
             "**Status**: ✅ Reviewed, Polished, and Grammar-Checked"
         )
     
+    summary = _review_summary(stats, seo)
+    changes = ""
+    if cache.get("summary"):
+        changes = _changes_notes(cache["summary"], summary, total_sections, analyzed)
+    state.set_review_cache({"sections": sections, "summary": summary})
+    review_notes = _review_notes(stats, seo, changes)
+    
     # Store final content in workflow state
-    workflow_state.set_final_content({
+    state.set_final_content({
         "content": polished_content,
         "review_notes": review_notes,
         "focus_areas": focus_areas,
         "seo_optimized": seo_optimization,
-        "grammar_checked": grammar_check
+        "grammar_checked": grammar_check,
+        "analysis": stats.to_dict(),
+        "seo": seo,
+        "sections": {"total": total_sections, "analyzed": len(analyzed)}
     })
     
     return f"{polished_content}\n\n{review_notes}"
@@ -1,31 +1,60 @@
 """Writing tools for content generation."""
 
+import contextlib
+import contextvars
+import io
 import re
-from google.genai import Client
-from ..utils.state_manager import workflow_state
-from ..config.settings import DEFAULT_WORD_COUNT, DEFAULT_TONE, MODEL_NAME
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
+from ..utils.state_manager import WorkflowState, get_workflow_state
+from ..utils.genai_client import get_client
+from ..utils.model_calls import call_model, stream_model
+from ..utils.response_cache import get_response_cache
+from ..utils.singleflight import get_singleflight, request_key
+from ..utils.prompt_budget import fit_prompt, slice_research
+from ..utils.duplicate_index import DuplicateContentError, check_brief, check_content
+from ..config.settings import (
+    DEFAULT_WORD_COUNT,
+    DEFAULT_TONE,
+    DUPLICATE_INDEX_ENABLED,
+    LONG_FORM_CONCURRENCY,
+    LONG_FORM_MIN_WORDS,
+    LONG_FORM_SECTION_WORDS,
+    MODEL_NAME,
+    REQUEST_COALESCING_ENABLED,
+    RESPONSE_CACHE_ENABLED,
+    SPECULATIVE_CREATIVE_ENABLED,
+    WRITE_CONTENT_STREAMING
+)
 
 
-def write_content(topic: str, research_data: str, content_type: str = "blog post", 
-                  word_count: int = DEFAULT_WORD_COUNT, tone: str = DEFAULT_TONE) -> str:
-    """Generate content based on research data using AI.
+def _extract_text(response: Any) -> str:
+    """Concatenate the text parts of a generate_content response."""
+    if hasattr(response, 'candidates') and response.candidates:
+        candidate = response.candidates[0]
+        if hasattr(candidate, 'content') and candidate.content:
+            return "".join(
+                part.text for part in candidate.content.parts
+                if getattr(part, 'text', None)
+            )
+    return ""
+
+
+_HEADING_LINE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*$")
+
+
+def _build_writing_prompt(topic: str, research_data: str, content_type: str,
+                          word_count: int, tone: str) -> Tuple[str, str, str, Dict[str, Any]]:
+    """Build the writing prompt from the brief and research.
     
-    Args:
-        topic: The main topic for the content
-        research_data: Research findings from the research agent
-        content_type: Type of content (blog post, article, guide, etc.)
-        word_count: Target word count for the content
-        tone: Writing tone (professional, casual, friendly, etc.)
+    Repeated research lines are dropped, and low-value research sections are
+    condensed when the prompt is over ``PROMPT_TOKEN_BUDGET``.
     
     Returns:
-        A draft of the generated content that integrates all research findings.
+        Tuple of (writing_prompt, keywords, target_audience, prompt_tokens) where
+        prompt_tokens is the budget report from ``fit_prompt``
     """
-    if not topic:
-        return "❌ Error: No topic provided for content writing."
-    
-    if not research_data:
-        return "❌ Error: No research data provided. Please conduct research first."
-    
     # Extract key information from research
     keywords_match = re.search(r'Keywords: (.+)', research_data)
     keywords = keywords_match.group(1) if keywords_match else "related topics"
@@ -34,10 +63,11 @@ def write_content(topic: str, research_data: str, content_type: str = "blog post
     target_audience = target_audience_match.group(1).strip() if target_audience_match else "general"
     
     # Create a comprehensive prompt that uses ALL research data
-    writing_prompt = f"""You are an expert content writer. Write a comprehensive {content_type} about "{topic}" based on the following detailed research findings.
+    def render(research: str) -> str:
+        return f"""You are an expert content writer. Write a comprehensive {content_type} about "{topic}" based on the following detailed research findings.
 
 RESEARCH DATA:
-{research_data}
+{research}
 
 REQUIREMENTS:
 - Topic: {topic}
@@ -88,30 +118,14 @@ Write a comprehensive, detailed, and well-researched {content_type} that fully i
 
 Start writing now:"""
     
-    try:
-        # Generate content using Gemini API
-        client = Client()
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=writing_prompt,
-        )
-        
-        # Extract the generated content
-        if hasattr(response, 'candidates') and response.candidates:
-            candidate = response.candidates[0]
-            if hasattr(candidate, 'content') and candidate.content:
-                parts = candidate.content.parts
-                generated_text = ""
-                for part in parts:
-                    if hasattr(part, 'text'):
-                        generated_text += part.text
-                
-                if generated_text:
-                    # Ensure proper formatting
-                    draft_content = generated_text.strip()
-                    
-                    # Add metadata at the end
-                    draft_content += f"""
+    writing_prompt, prompt_tokens = fit_prompt(render, research_data, topic=topic, keywords=keywords)
+    return writing_prompt, keywords, target_audience, prompt_tokens
+
+
+def _metadata_footer(topic: str, keywords: str, content_type: str, tone: str,
+                     target_audience: str, word_count: int) -> str:
+    """Metadata block appended to every draft."""
+    return f"""
 
 ---
 
@@ -123,25 +137,369 @@ Start writing now:"""
 **Target Word Count**: {word_count} words
 **Status**: Draft - Ready for Review
 """
-                    
-                    # Store draft content in workflow state
-                    workflow_state.set_draft_content({
-                        "topic": topic,
-                        "content": draft_content,
-                        "content_type": content_type,
-                        "word_count": word_count,
-                        "tone": tone,
-                        "research_used": True
-                    })
-                    
-                    return draft_content
+
+
+def _generate_chunks(writing_prompt: str, stream: bool) -> Iterator[str]:
+    """Yield generated text, incrementally when streaming."""
+    client = get_client()
+    if stream:
+        for chunk in stream_model(
+            MODEL_NAME,
+            client.models.generate_content_stream,
+            model=MODEL_NAME,
+            contents=writing_prompt,
+        ):
+            text = _extract_text(chunk)
+            if text:
+                yield text
+    else:
+        response = call_model(
+            MODEL_NAME,
+            client.models.generate_content,
+            model=MODEL_NAME,
+            contents=writing_prompt,
+        )
+        yield _extract_text(response)
+
+
+def _outline_prompt(topic: str, research: str, content_type: str, word_count: int, tone: str,
+                    target_audience: str, keywords: str, sections: int) -> str:
+    """Prompt asking for a title and the H2 headings of a long-form post."""
+    return f"""You are an expert content editor. Plan a {content_type} of about {word_count} words about "{topic}" based on the following research findings.
+
+RESEARCH DATA:
+{research}
+
+Write a title and exactly {sections} H2 section headings for a {tone} {content_type} aimed at a {target_audience} audience. Together the sections must cover the research findings and the keywords: {keywords}. The first section introduces the topic and the last one concludes the post.
+
+Return only the heading lines in markdown, with no other text:
+# <title>
+## <section heading>"""
+
+
+def _parse_outline(text: str) -> Tuple[str, List[str]]:
+    """Title and distinct H2 headings of an outline response."""
+    title, headings = "", []
+    for line in text.splitlines():
+        match = _HEADING_LINE.match(line.strip())
+        if not match:
+            continue
+        level, heading = len(match.group(1)), match.group(2).strip()
+        if level == 1 and not title:
+            title = heading
+        elif level == 2 and heading not in headings:
+            headings.append(heading)
+    return title, headings
+
+
+def _section_context(title: str, topic: str, content_type: str, word_count: int, tone: str,
+                     target_audience: str, keywords: str, headings: List[str]) -> str:
+    """Context header shared verbatim by every section prompt of a post."""
+    outline = "\n".join(f"  {i}. {heading}" for i, heading in enumerate(headings, start=1))
+    return f"""You are an expert content writer. You are writing one section of a {content_type} titled "{title}" about "{topic}". The other sections are being written at the same time, so cover only your section and do not repeat the title.
+
+POST:
+- Content Type: {content_type}
+- Total Length: about {word_count} words
+- Writing Tone: {tone}
+- Target Audience: {target_audience}
+- Keywords to include: {keywords}
+- Outline:
+{outline}
+"""
+
+
+def _section_prompt(context: str, research: str, headings: List[str], index: int, words: int) -> str:
+    """Prompt for section ``index`` of the outline: shared context, its research slice and transitions."""
+    heading = headings[index]
+    if index == 0:
+        opening = "Open the post with a hook and tell the reader what it covers"
+    else:
+        opening = f'Open with a sentence that follows on from the previous section, "{headings[index - 1]}"'
+    if index == len(headings) - 1:
+        closing = "Close the post by summarizing the key points and ending with a call-to-action"
+    else:
+        closing = f'End with a sentence that leads into the next section, "{headings[index + 1]}"'
+    return f"""{context}
+RESEARCH FOR THIS SECTION:
+{research}
+
+YOUR SECTION: "{heading}" (section {index + 1} of {len(headings)}, about {words} words)
+- Begin with the line "## {heading}" and use ### for any subheadings
+- {opening}
+- {closing}
+- Use the research above, specific details and the keywords where they fit naturally
+- Use markdown with bullet points and numbered lists where appropriate
+
+Start writing now:"""
+
+
+def _section_body(text: str) -> str:
+    """Section text without the model's own title or section heading.
+
+    Headings deeper in the text are kept, but never above H3, so the outline's
+    H2 headings stay the only top-level sections of the stitched post.
+    """
+    lines = text.strip().splitlines()
+    while lines:
+        match = _HEADING_LINE.match(lines[0].strip())
+        if lines[0].strip() and not (match and len(match.group(1)) <= 2):
+            break
+        lines.pop(0)
+    for i, line in enumerate(lines):
+        match = _HEADING_LINE.match(line.strip())
+        if match and len(match.group(1)) <= 2:
+            lines[i] = f"### {match.group(2).strip()}"
+    return "\n".join(lines).strip()
+
+
+def _generate_section(client: Any, prompt: str) -> Tuple[str, float]:
+    start = time.perf_counter()
+    response = call_model(MODEL_NAME, client.models.generate_content, model=MODEL_NAME, contents=prompt)
+    return _extract_text(response), time.perf_counter() - start
+
+
+def _generate_long_form(topic: str, research_data: str, content_type: str, word_count: int, tone: str,
+                        keywords: str, target_audience: str, writing_prompt: str, stream: bool,
+                        report: Dict[str, Any]) -> Iterator[str]:
+    """Outline a long post, write its sections in parallel and yield them in order.
+    
+    Sections are stitched under the outline's headings as soon as they and every
+    section before them are done. When the outline has fewer than two sections
+    the single writing prompt is used instead. Latencies go into ``report``.
+    """
+    client = get_client()
+    sections = max(2, round(word_count / LONG_FORM_SECTION_WORDS))
+    outline_prompt, _ = fit_prompt(
+        lambda research: _outline_prompt(topic, research, content_type, word_count, tone,
+                                         target_audience, keywords, sections),
+        research_data, topic=topic, keywords=keywords
+    )
+    start = time.perf_counter()
+    response = call_model(MODEL_NAME, client.models.generate_content, model=MODEL_NAME, contents=outline_prompt)
+    title, headings = _parse_outline(_extract_text(response))
+    report["outline_latency"] = time.perf_counter() - start
+    if len(headings) < 2:
+        report["fallback"] = True
+        yield from _generate_chunks(writing_prompt, stream)
+        return
+    
+    title = title or topic
+    context = _section_context(title, topic, content_type, word_count, tone, target_audience, keywords, headings)
+    words = word_count // len(headings)
+    prompts = [
+        fit_prompt(lambda research, i=i: _section_prompt(context, research, headings, i, words),
+                   research, topic=topic, keywords=keywords)[0]
+        for i, research in enumerate(slice_research(research_data, headings, topic))
+    ]
+    report.update(sections=len(headings), section_latencies=[], fallback=False)
+    
+    # Workers run in a copy of this context so their model call spans nest under the tool's
+    executor = ThreadPoolExecutor(max_workers=max(1, min(len(prompts), LONG_FORM_CONCURRENCY)))
+    try:
+        futures = [executor.submit(contextvars.copy_context().run, _generate_section, client, prompt)
+                   for prompt in prompts]
+        # The title comes from the outline; flag it so it does not count as the first chunk
+        report["title_pending"] = True
+        yield f"# {title}\n\n"
+        for i, (heading, future) in enumerate(zip(headings, futures)):
+            text, latency = future.result()
+            report["section_latencies"].append(latency)
+            body = _section_body(text)
+            yield ("\n\n" if i else "") + f"## {heading}\n\n{body}"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _compose_draft(state: WorkflowState, topic: str, research_data: str, content_type: str,
+                   word_count: int, tone: str, stream: bool) -> Generator[str, None, Optional[str]]:
+    """Generate a draft, yielding body chunks and then the metadata footer.
+    
+    Drafts of ``LONG_FORM_MIN_WORDS`` or more are outlined first and their
+    sections generated in parallel. Chunks are accumulated into a single buffer;
+    the finished draft is stored in the workflow state and returned as the
+    generator's return value (None when the model returned no text).
+    """
+    writing_prompt, keywords, target_audience, prompt_tokens = _build_writing_prompt(
+        topic, research_data, content_type, word_count, tone
+    )
+    
+    # Check the brief against past posts before spending a model call on it
+    duplicates: Dict[str, Any] = {}
+    if DUPLICATE_INDEX_ENABLED:
+        duplicates["brief"] = check_brief(topic, [k.strip() for k in keywords.split(",")],
+                                          session_id=state.session_id)
+    
+    start = time.perf_counter()
+    time_to_first_chunk = None
+    buffer = io.StringIO()
+    
+    # Serve repeated briefs from the response cache when it is enabled
+    cache = get_response_cache() if RESPONSE_CACHE_ENABLED else None
+    cached_text = cache.get(MODEL_NAME, writing_prompt) if cache else None
+    cache_hit = cached_text is not None
+    long_form: Optional[Dict[str, Any]] = None
+    coalesced = False
+    if cache_hit:
+        chunks = [cached_text]
+    else:
+        long_form = {} if LONG_FORM_MIN_WORDS and word_count >= LONG_FORM_MIN_WORDS else None
+        
+        def produce() -> Iterator[str]:
+            if long_form is not None:
+                return _generate_long_form(topic, research_data, content_type, word_count, tone, keywords,
+                                           target_audience, writing_prompt, stream, long_form)
+            return _generate_chunks(writing_prompt, stream)
+        
+        if REQUEST_COALESCING_ENABLED:
+            # Concurrent identical briefs share one generation; followers get the finished text
+            coalesced = True
+            
+            def lead() -> Iterator[str]:
+                nonlocal coalesced
+                coalesced = False
+                return produce()
+            
+            chunks = get_singleflight("write_content").stream(request_key(MODEL_NAME, writing_prompt), lead)
+        else:
+            chunks = produce()
+    
+    try:
+        for text in chunks:
+            if long_form and long_form.pop("title_pending", False):
+                pass  # Time to first chunk is measured at the first section the model wrote
+            elif time_to_first_chunk is None:
+                time_to_first_chunk = time.perf_counter() - start
+            buffer.write(text)
+            yield text
+    finally:
+        # A draft abandoned mid-stream closes its model stream, releasing the concurrency slot
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    
+    generated_text = buffer.getvalue().strip()
+    if not generated_text:
+        return None
+    if cache and not cache_hit and not coalesced:
+        cache.put(MODEL_NAME, writing_prompt, generated_text)
+    if DUPLICATE_INDEX_ENABLED:
+        duplicates["content"] = check_content(generated_text, session_id=state.session_id)
+    
+    # Add metadata at the end
+    footer = _metadata_footer(topic, keywords, content_type, tone, target_audience, word_count)
+    yield footer
+    draft_content = generated_text + footer
+    
+    # Store draft content in workflow state
+    state.set_draft_content({
+        "topic": topic,
+        "content": draft_content,
+        "content_type": content_type,
+        "word_count": word_count,
+        "tone": tone,
+        "research_used": True,
+        "cache_hit": cache_hit,
+        "coalesced": coalesced,
+        "duplicates": duplicates,
+        "metrics": {
+            "streamed": stream and not cache_hit and not coalesced and (not long_form or long_form["fallback"]),
+            "time_to_first_chunk": time_to_first_chunk,
+            "total_latency": time.perf_counter() - start,
+            "prompt_tokens": prompt_tokens,
+            "long_form": long_form or None
+        }
+    })
+    
+    # Overlap image generation with the review; the creative tool reuses it if the headings survive
+    if SPECULATIVE_CREATIVE_ENABLED:
+        from .creative_tools import speculate_creative
+        try:
+            speculate_creative(draft_content, state.session_id)
+        except Exception as e:
+            print(f"⚠️ Could not start speculative creative generation: {e}")
+    
+    return draft_content
+
+
+def stream_content(topic: str, research_data: str, content_type: str = "blog post",
+                   word_count: int = DEFAULT_WORD_COUNT,
+                   tone: str = DEFAULT_TONE,
+                   tool_context: Optional[Any] = None) -> Generator[str, None, Optional[str]]:
+    """Stream a draft chunk by chunk as the model produces it.
+    
+    Yields the body text incrementally followed by the metadata footer. The draft
+    is stored in the workflow state exactly as ``write_content`` would store it,
+    with time-to-first-chunk and total latency recorded under ``metrics``.
+    Model errors propagate to the caller. A caller that stops before the end must
+    close the generator (e.g. with ``contextlib.closing``): an open stream holds
+    one of the model's ``TEXT_MODEL_MAX_CONCURRENCY`` slots.
+    
+    Args:
+        topic: The main topic for the content
+        research_data: Research findings from the research agent
+        content_type: Type of content (blog post, article, guide, etc.)
+        word_count: Target word count for the content
+        tone: Writing tone (professional, casual, friendly, etc.)
+        tool_context: ADK tool context used to scope state to the session
+    
+    Returns:
+        The complete draft as the generator's return value.
+    """
+    if not topic:
+        raise ValueError("No topic provided for content writing.")
+    if not research_data:
+        raise ValueError("No research data provided. Please conduct research first.")
+    return (yield from _compose_draft(
+        get_workflow_state(tool_context), topic, research_data, content_type, word_count, tone, stream=True
+    ))
+
+
+def _drain(generator: Generator[str, None, Optional[str]]) -> Optional[str]:
+    """Exhaust a draft generator and return its return value."""
+    with contextlib.closing(generator):
+        while True:
+            try:
+                next(generator)
+            except StopIteration as stop:
+                return stop.value
+
+
+def write_content(topic: str, research_data: str, content_type: str = "blog post", 
+                  word_count: int = DEFAULT_WORD_COUNT, tone: str = DEFAULT_TONE,
+                  tool_context: Optional[Any] = None) -> str:
+    """Generate content based on research data using AI.
+    
+    Args:
+        topic: The main topic for the content
+        research_data: Research findings from the research agent
+        content_type: Type of content (blog post, article, guide, etc.)
+        word_count: Target word count for the content
+        tone: Writing tone (professional, casual, friendly, etc.)
+        tool_context: ADK tool context, injected by the framework to scope state to the session
+    
+    Returns:
+        A draft of the generated content that integrates all research findings.
+    """
+    if not topic:
+        return "❌ Error: No topic provided for content writing."
+    
+    if not research_data:
+        return "❌ Error: No research data provided. Please conduct research first."
+    
+    try:
+        draft_content = _drain(_compose_draft(
+            get_workflow_state(tool_context), topic, research_data, content_type, word_count, tone, stream=WRITE_CONTENT_STREAMING
+        ))
+        if draft_content:
+            return draft_content
         
         # Fallback if no content generated
         return f"⚠️ Warning: Content generation completed but no text was returned. Please try again.\n\nResearch data provided:\n{research_data[:500]}..."
         
+    except DuplicateContentError as e:
+        return f"⚠️ Duplicate brief: {e}. Change the topic or keywords, or set DUPLICATE_BRIEF_POLICY to \"warn\"."
     except Exception as e:
         error_message = f"❌ Error generating content: {str(e)}\n\n"
         error_message += f"Research data that was provided:\n{research_data[:500]}...\n\n"
         error_message += "Please try again or check the research data."
         return error_message
-
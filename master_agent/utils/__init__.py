@@ -1,7 +1,32 @@
 """Utility modules for the multi-agent workflow system."""
 
-from .state_manager import WorkflowState
+from .state_manager import WorkflowState, SessionStateStore, get_workflow_state, session_scope
 from .file_utils import ensure_directory_exists, clean_filename
+from .genai_client import get_client, set_client, override_client, model_slot, close_client
+from .response_cache import ResponseCache, get_response_cache
+from .model_calls import (
+    call_model, stream_model, get_model_call_metrics,
+    override_rate_limits, CircuitOpenError
+)
 
-__all__ = ['WorkflowState', 'ensure_directory_exists', 'clean_filename']
+__all__ = [
+    'WorkflowState',
+    'SessionStateStore',
+    'get_workflow_state',
+    'session_scope',
+    'ensure_directory_exists',
+    'clean_filename',
+    'get_client',
+    'set_client',
+    'override_client',
+    'model_slot',
+    'close_client',
+    'ResponseCache',
+    'get_response_cache',
+    'call_model',
+    'stream_model',
+    'get_model_call_metrics',
+    'override_rate_limits',
+    'CircuitOpenError'
+]
 
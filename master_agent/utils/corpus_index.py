@@ -0,0 +1,606 @@
+"""On-disk BM25 index over a local knowledge base, queried by conduct_research.
+
+The corpus is a directory of markdown, HTML and plain-text files (e.g. text
+extracted from PDFs). Files are split into passages of roughly
+``RESEARCH_CORPUS_PASSAGE_WORDS`` words, and passages are indexed in
+immutable segments:
+
+    <index>/index.db         SQLite manifest: files (path, mtime, size, hash,
+                             segment, live) and segments
+    <index>/seg-<n>/
+        lexicon.bin          sorted terms, concatenated UTF-8
+        lexicon.idx          per term: term offset/length, postings offset, df
+        postings.bin         per term: df passage ids then df term frequencies (uint32)
+        lengths.bin          tokens per passage (uint32)
+        owners.bin           file id per passage (uint32)
+        text.bin, text.idx   passage text and offsets
+
+``update()`` only re-reads files whose mtime or size changed, and only
+re-indexes those whose SHA-256 changed. Their new passages go into a new
+segment; the old rows are marked dead, and their passages are skipped at
+query time until a compaction rewrites the live passages into one segment.
+Queries binary-search each segment's lexicon and score postings straight from
+memory-mapped files, so opening a large index reads almost nothing.
+
+Build or refresh an index from the command line:
+    python -m master_agent.utils.corpus_index knowledge_base --query "topic keywords"
+"""
+
+import argparse
+import bisect
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import struct
+import threading
+import time
+from array import array
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .file_utils import ensure_directory_exists
+from .research_store import fold_plural
+from ..config.settings import (
+    RESEARCH_CORPUS_DIR,
+    RESEARCH_CORPUS_INDEX_DIR,
+    RESEARCH_CORPUS_EXTENSIONS,
+    RESEARCH_CORPUS_PASSAGE_WORDS,
+    RESEARCH_CORPUS_REFRESH_INTERVAL
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    title TEXT,
+    segment TEXT NOT NULL,
+    passages INTEGER NOT NULL,
+    tokens INTEGER NOT NULL,
+    live INTEGER NOT NULL DEFAULT 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_files_live_path ON files (path) WHERE live = 1;
+CREATE INDEX IF NOT EXISTS idx_files_segment ON files (segment, live);
+CREATE TABLE IF NOT EXISTS segments (
+    name TEXT PRIMARY KEY,
+    passages INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+_LEXICON_ENTRY = struct.Struct("<QIQI")  # term offset, term length, postings offset (uint32s), df
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have how if in into is it its not of on or "
+    "our so that the their them then there these they this to was we were what when which who will "
+    "with you your".split()
+)
+_SEGMENT_MAX_PASSAGES = 200_000  # Bounds memory while building; larger batches span several segments
+_MAX_SEGMENTS = 8  # Compact into one segment beyond this many
+_MAX_DEAD_RATIO = 0.3  # ... or once this share of indexed passages belongs to changed/removed files
+_ACCUMULATOR_LIMIT = 50_000  # Past this many candidates, common terms only rescore existing ones
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, plural-folded terms of ``text`` without stopwords."""
+    return [fold_plural(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+class _TextExtractor(HTMLParser):
+    """Visible text of an HTML page, with block elements as paragraph breaks."""
+    
+    _BLOCKS = {"p", "div", "section", "article", "li", "br", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+               "pre", "blockquote", "table", "ul", "ol"}
+    _SKIP = {"script", "style", "noscript", "template"}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.title = ""
+        self._skip = 0
+        self._in_title = False
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self._BLOCKS:
+            self.parts.append("\n\n")
+    
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skip:
+            self._skip -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif tag in self._BLOCKS:
+            self.parts.append("\n\n")
+    
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self.parts.append(data)
+
+
+def extract_text(data: bytes, ext: str) -> Tuple[str, str]:
+    """Decode a corpus file; returns (title, text). HTML is reduced to its visible text."""
+    text = data.decode("utf-8", errors="replace")
+    if ext in (".html", ".htm"):
+        parser = _TextExtractor()
+        parser.feed(text)
+        parser.close()
+        return " ".join(parser.title.split()), "".join(parser.parts)
+    heading = re.search(r"^#\s+(.+)$", text, re.MULTILINE)
+    return (heading.group(1).strip() if heading else ""), text
+
+
+def split_passages(text: str, words: int = RESEARCH_CORPUS_PASSAGE_WORDS) -> List[str]:
+    """Group paragraphs into passages of about ``words`` words.
+
+    Headings start a new passage; paragraphs longer than twice the target are
+    cut into ``words``-word windows.
+    """
+    passages: List[str] = []
+    current: List[str] = []
+    size = 0
+    
+    def flush():
+        nonlocal size
+        if current:
+            passages.append("\n\n".join(current))
+            current.clear()
+            size = 0
+    
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        count = paragraph.count(" ") + 1
+        if paragraph.startswith("#"):
+            flush()
+        if count > 2 * words:
+            flush()
+            tokens = paragraph.split(" ")
+            passages.extend(" ".join(tokens[i:i + words]) for i in range(0, len(tokens), words))
+            continue
+        current.append(paragraph)
+        size += count
+        if size >= words:
+            flush()
+    flush()
+    return passages
+
+
+class _SegmentBuilder:
+    """Accumulates passages in memory and writes them as one immutable segment."""
+    
+    def __init__(self):
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.lengths = array("I")
+        self.owners = array("I")
+        self.texts: List[bytes] = []
+    
+    def __len__(self) -> int:
+        return len(self.lengths)
+    
+    def add(self, owner: int, text: str) -> int:
+        """Index one passage; returns its token count (0 means it was skipped)."""
+        tokens = tokenize(text)
+        if not tokens:
+            return 0
+        local_id = len(self.lengths)
+        for term, tf in Counter(tokens).items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array("I"), array("I"))
+            entry[0].append(local_id)
+            entry[1].append(tf)
+        self.lengths.append(len(tokens))
+        self.owners.append(owner)
+        self.texts.append(text.encode("utf-8"))
+        return len(tokens)
+    
+    def write(self, directory: str) -> None:
+        ensure_directory_exists(directory)
+        lexicon = bytearray()
+        entries = bytearray()
+        offset = 0
+        with open(os.path.join(directory, "postings.bin"), "wb") as postings:
+            for term in sorted(self.postings):
+                ids, tfs = self.postings[term]
+                encoded = term.encode("utf-8")
+                entries += _LEXICON_ENTRY.pack(len(lexicon), len(encoded), offset, len(ids))
+                lexicon += encoded
+                ids.tofile(postings)
+                tfs.tofile(postings)
+                offset += 2 * len(ids)
+        offsets = array("Q", [0])
+        with open(os.path.join(directory, "text.bin"), "wb") as f:
+            for text in self.texts:
+                f.write(text)
+                offsets.append(offsets[-1] + len(text))
+        for name, payload in (("lexicon.bin", lexicon), ("lexicon.idx", entries)):
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(payload)
+        for name, values in (("lengths.bin", self.lengths), ("owners.bin", self.owners), ("text.idx", offsets)):
+            with open(os.path.join(directory, name), "wb") as f:
+                values.tofile(f)
+
+
+class _Segment:
+    """Read-only view of a segment through memory-mapped files."""
+    
+    def __init__(self, directory: str, name: str, dead: set):
+        self.name = name
+        self.directory = directory
+        self.dead = dead  # File ids whose passages here are superseded
+        self._maps: List[mmap.mmap] = []
+        self._views: List[memoryview] = []
+        self.lexicon = self._map("lexicon.bin")
+        self.entries = self._map("lexicon.idx")
+        self.postings = self._view("postings.bin", "I")
+        self.lengths = self._view("lengths.bin", "I")
+        self.owners = self._view("owners.bin", "I")
+        self.text_offsets = self._view("text.idx", "Q")
+        self.text = self._map("text.bin")
+        self.terms = len(self.entries) // _LEXICON_ENTRY.size
+        self.passages = len(self.lengths)
+    
+    def _map(self, filename: str) -> mmap.mmap:
+        with open(os.path.join(self.directory, filename), "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+    
+    def _view(self, filename: str, fmt: str) -> memoryview:
+        view = memoryview(self._map(filename)).cast(fmt)
+        self._views.append(view)
+        return view
+    
+    def lookup(self, term: str) -> Optional[Tuple[memoryview, memoryview]]:
+        """Postings (passage ids, term frequencies) of ``term``, or None."""
+        key = term.encode("utf-8")
+        low, high = 0, self.terms
+        while low < high:
+            middle = (low + high) // 2
+            term_offset, term_length, postings_offset, df = _LEXICON_ENTRY.unpack_from(
+                self.entries, middle * _LEXICON_ENTRY.size
+            )
+            candidate = self.lexicon[term_offset:term_offset + term_length]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return (self.postings[postings_offset:postings_offset + df],
+                        self.postings[postings_offset + df:postings_offset + 2 * df])
+        return None
+    
+    def passage(self, local_id: int) -> str:
+        return self.text[self.text_offsets[local_id]:self.text_offsets[local_id + 1]].decode("utf-8")
+    
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:  # A caller still holds a postings slice; freed with it
+                pass
+
+
+class CorpusIndex:
+    """Incrementally maintained BM25 index over a directory of documents."""
+    
+    def __init__(self, corpus_dir: str, index_dir: str = RESEARCH_CORPUS_INDEX_DIR,
+                 extensions: Tuple[str, ...] = tuple(RESEARCH_CORPUS_EXTENSIONS)):
+        self.corpus_dir = os.path.abspath(corpus_dir)
+        self.index_dir = ensure_directory_exists(index_dir)
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.last_update: Optional[float] = None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(index_dir, "index.db"),
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._segments: List[_Segment] = []
+        self._load()
+    
+    # --- Reading -----------------------------------------------------------
+    
+    def _load(self) -> None:
+        """(Re)open the committed segments and refresh collection statistics."""
+        for segment in self._segments:
+            segment.close()
+        names = [row["name"] for row in self._conn.execute("SELECT name FROM segments ORDER BY name")]
+        dead: Dict[str, set] = {name: set() for name in names}
+        for row in self._conn.execute("SELECT id, segment FROM files WHERE live = 0"):
+            dead.setdefault(row["segment"], set()).add(row["id"])
+        self._segments = [_Segment(os.path.join(self.index_dir, name), name, dead[name]) for name in names]
+        totals = self._conn.execute(
+            "SELECT COALESCE(SUM(passages), 0), COALESCE(SUM(tokens), 0) FROM files WHERE live = 1"
+        ).fetchone()
+        self.passages, tokens = totals[0], totals[1]
+        self.average_length = tokens / self.passages if self.passages else 0.0
+        # Segment directories left behind by an interrupted update
+        for entry in os.listdir(self.index_dir):
+            if entry.startswith("seg-") and entry not in dead:
+                shutil.rmtree(os.path.join(self.index_dir, entry), ignore_errors=True)
+    
+    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Top-``k`` passages for ``query`` by BM25.
+
+        Returns:
+            Dicts with ``score``, ``path`` (relative to the corpus), ``title``,
+            ``text`` and ``passage`` (segment:local id), best first.
+        """
+        query_terms = Counter(tokenize(query))
+        with self._lock:
+            if not query_terms or not self.passages:
+                return []
+            postings = {term: [(segment, segment.lookup(term)) for segment in self._segments]
+                        for term in query_terms}
+            weights = []
+            for term, lists in postings.items():
+                df = sum(len(found[0]) for _, found in lists if found)
+                if df:
+                    idf = math.log(1 + (self.passages - df + 0.5) / (df + 0.5))
+                    weights.append((idf * query_terms[term], term))
+            weights.sort(reverse=True)
+            
+            # Term-at-a-time, rarest first. Once there are many candidates, common
+            # terms only add to existing ones (looked up by bisection) instead of
+            # creating new accumulators from their long postings lists.
+            scores: Dict[_Segment, Dict[int, float]] = {segment: {} for segment in self._segments}
+            candidates = 0
+            norm = _K1 * (1 - _B)
+            scale = _K1 * _B / self.average_length
+            for weight, term in weights:
+                for segment, found in postings[term]:
+                    if not found:
+                        continue
+                    ids, tfs = found
+                    accumulator, lengths = scores[segment], segment.lengths
+                    if candidates < _ACCUMULATOR_LIMIT or len(ids) < len(accumulator):
+                        before = len(accumulator)
+                        for local_id, tf in zip(ids, tfs):
+                            accumulator[local_id] = accumulator.get(local_id, 0.0) + weight * tf * (_K1 + 1) / (
+                                tf + norm + scale * lengths[local_id])
+                        candidates += len(accumulator) - before
+                    else:
+                        for local_id in accumulator:
+                            position = bisect.bisect_left(ids, local_id)
+                            if position < len(ids) and ids[position] == local_id:
+                                tf = tfs[position]
+                                accumulator[local_id] += weight * tf * (_K1 + 1) / (
+                                    tf + norm + scale * lengths[local_id])
+            
+            ranked = heapq.nlargest(k, (
+                (score, segment.name, local_id, segment)
+                for segment, accumulator in scores.items()
+                for local_id, score in accumulator.items()
+                if not segment.dead or segment.owners[local_id] not in segment.dead
+            ), key=lambda hit: hit[0])
+            results = []
+            for score, _, local_id, segment in ranked:
+                row = self._conn.execute("SELECT path, title FROM files WHERE id = ?",
+                                         (segment.owners[local_id],)).fetchone()
+                results.append({
+                    "score": round(score, 4),
+                    "path": row["path"],
+                    "title": row["title"] or os.path.splitext(os.path.basename(row["path"]))[0],
+                    "text": segment.passage(local_id),
+                    "passage": f"{segment.name}:{local_id}"
+                })
+        return results
+    
+    # --- Writing -----------------------------------------------------------
+    
+    def _walk(self) -> Iterator[Tuple[str, os.stat_result]]:
+        for root, dirs, files in os.walk(self.corpus_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for filename in files:
+                if filename.lower().endswith(self.extensions):
+                    path = os.path.join(root, filename)
+                    try:
+                        yield os.path.relpath(path, self.corpus_dir), os.stat(path)
+                    except OSError:
+                        continue
+    
+    def _next_segment(self) -> str:
+        row = self._conn.execute("SELECT name FROM segments ORDER BY name DESC LIMIT 1").fetchone()
+        number = int(row["name"][4:]) + 1 if row else 1
+        while os.path.exists(os.path.join(self.index_dir, f"seg-{number:06d}")):
+            number += 1
+        return f"seg-{number:06d}"
+    
+    def _write_segment(self, builder: _SegmentBuilder, name: str) -> None:
+        builder.write(os.path.join(self.index_dir, name))
+        self._conn.execute("INSERT INTO segments (name, passages, created_at) VALUES (?, ?, ?)",
+                           (name, len(builder), time.time()))
+    
+    def update(self) -> Dict[str, Any]:
+        """Bring the index in line with the corpus directory.
+
+        Returns:
+            Counts of ``added``, ``updated``, ``removed``, ``unchanged`` and
+            ``touched`` (mtime changed, content identical) files, ``passages``
+            indexed, whether the index was ``compacted``, and ``seconds``.
+        """
+        start = time.perf_counter()
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "touched": 0,
+                 "passages": 0, "compacted": False}
+        with self._lock:
+            known = {row["path"]: row for row in self._conn.execute(
+                "SELECT id, path, mtime_ns, size, sha256 FROM files WHERE live = 1")}
+            seen = set()
+            builder, segment = _SegmentBuilder(), self._next_segment()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for path, stat in self._walk():
+                    seen.add(path)
+                    row = known.get(path)
+                    if row is not None and row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+                        stats["unchanged"] += 1
+                        continue
+                    try:
+                        with open(os.path.join(self.corpus_dir, path), "rb") as f:
+                            data = f.read()
+                    except OSError:
+                        continue
+                    digest = hashlib.sha256(data).hexdigest()
+                    if row is not None and row["sha256"] == digest:
+                        self._conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                                           (stat.st_mtime_ns, stat.st_size, row["id"]))
+                        stats["touched"] += 1
+                        continue
+                    if row is not None:
+                        self._conn.execute("UPDATE files SET live = 0 WHERE id = ?", (row["id"],))
+                    stats["updated" if row is not None else "added"] += 1
+                    
+                    title, text = extract_text(data, os.path.splitext(path)[1].lower())
+                    file_id = self._conn.execute(
+                        "INSERT INTO files (path, mtime_ns, size, sha256, title, segment, passages, tokens) "
+                        "VALUES (?, ?, ?, ?, ?, ?, 0, 0)",
+                        (path, stat.st_mtime_ns, stat.st_size, digest, title, segment)
+                    ).lastrowid
+                    passages = tokens = 0
+                    for passage in split_passages(text):
+                        length = builder.add(file_id, passage)
+                        if length:
+                            passages += 1
+                            tokens += length
+                    self._conn.execute("UPDATE files SET passages = ?, tokens = ? WHERE id = ?",
+                                       (passages, tokens, file_id))
+                    stats["passages"] += passages
+                    if len(builder) >= _SEGMENT_MAX_PASSAGES:
+                        self._write_segment(builder, segment)
+                        builder, segment = _SegmentBuilder(), f"seg-{int(segment[4:]) + 1:06d}"
+                
+                removed = [known[path]["id"] for path in known.keys() - seen]
+                self._conn.executemany("UPDATE files SET live = 0 WHERE id = ?", [(i,) for i in removed])
+                stats["removed"] = len(removed)
+                if len(builder):
+                    self._write_segment(builder, segment)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._load()
+                raise
+            
+            self._load()
+            dead = self._conn.execute(
+                "SELECT COALESCE(SUM(passages), 0) FROM files WHERE live = 0").fetchone()[0]
+            if len(self._segments) > _MAX_SEGMENTS or dead > _MAX_DEAD_RATIO * (self.passages + dead):
+                self.compact()
+                stats["compacted"] = True
+            self.last_update = time.time()
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        return stats
+    
+    def compact(self) -> None:
+        """Rewrite the live passages of every segment into a single segment."""
+        with self._lock:
+            if not self._segments:
+                return
+            builder, name = _SegmentBuilder(), self._next_segment()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for segment in self._segments:
+                    for local_id in range(segment.passages):
+                        owner = segment.owners[local_id]
+                        if owner not in segment.dead:
+                            builder.add(owner, segment.passage(local_id))
+                old = [segment.name for segment in self._segments]
+                self._conn.execute("DELETE FROM files WHERE live = 0")
+                self._conn.execute("DELETE FROM segments")
+                if len(builder):
+                    self._write_segment(builder, name)
+                self._conn.execute("UPDATE files SET segment = ?", (name,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._load()  # Closes the old segments and removes their directories
+    
+    def refresh_if_stale(self, interval: float = RESEARCH_CORPUS_REFRESH_INTERVAL) -> None:
+        """Run ``update()`` when the last one is older than ``interval`` seconds."""
+        if self.last_update is None or time.time() - self.last_update >= interval:
+            self.update()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Live files and passages, segment count and on-disk size."""
+        with self._lock:
+            files = self._conn.execute("SELECT COUNT(*) FROM files WHERE live = 1").fetchone()[0]
+            size = sum(os.path.getsize(os.path.join(root, name))
+                       for root, _, names in os.walk(self.index_dir) for name in names)
+            return {
+                "files": files,
+                "passages": self.passages,
+                "average_passage_tokens": round(self.average_length, 1),
+                "segments": len(self._segments),
+                "terms": sum(segment.terms for segment in self._segments),
+                "index_bytes": size
+            }
+    
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            self._segments = []
+            self._conn.close()
+
+
+_corpus_index: Optional[CorpusIndex] = None
+_corpus_index_lock = threading.Lock()
+
+
+def get_corpus_index() -> CorpusIndex:
+    """Return the process-wide index of ``RESEARCH_CORPUS_DIR``, refreshed when stale."""
+    global _corpus_index
+    if _corpus_index is None:
+        with _corpus_index_lock:
+            if _corpus_index is None:
+                _corpus_index = CorpusIndex(RESEARCH_CORPUS_DIR)
+    _corpus_index.refresh_if_stale()
+    return _corpus_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or refresh the research corpus index.")
+    parser.add_argument("corpus", nargs="?", default=RESEARCH_CORPUS_DIR, help="Corpus directory")
+    parser.add_argument("--index", default=RESEARCH_CORPUS_INDEX_DIR, help="Index directory")
+    parser.add_argument("--query", help="Run a query after updating")
+    parser.add_argument("-k", type=int, default=5, help="Passages to return for --query")
+    args = parser.parse_args()
+    if not args.corpus:
+        parser.error("no corpus directory given and RESEARCH_CORPUS_DIR is not set")
+    
+    index = CorpusIndex(args.corpus, args.index)
+    print(index.update())
+    print(index.stats())
+    if args.query:
+        start = time.perf_counter()
+        hits = index.search(args.query, args.k)
+        print(f"{len(hits)} passages in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for hit in hits:
+            print(f"\n[{hit['score']:.2f}] {hit['title']} ({hit['path']})\n{hit['text'][:300]}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Content-addressed storage for generated creatives with a SQLite manifest."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .file_utils import ensure_directory_exists
+from .sqlite_store import normalize_topic
+from .telemetry import record_bytes_written
+from ..config.settings import CREATIVE_STORE_DIR
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    ext TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS creatives (
+    id INTEGER PRIMARY KEY,
+    post_title TEXT,
+    post_norm TEXT,
+    creative_type TEXT,
+    prompt_hash TEXT,
+    blob_hash TEXT NOT NULL REFERENCES blobs (hash),
+    kind TEXT NOT NULL,
+    parent_hash TEXT,
+    session_id TEXT,
+    created_at REAL NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_creatives_post ON creatives (post_norm, creative_type, id);
+CREATE INDEX IF NOT EXISTS idx_creatives_prompt ON creatives (prompt_hash, id);
+CREATE INDEX IF NOT EXISTS idx_creatives_blob ON creatives (blob_hash);
+CREATE INDEX IF NOT EXISTS idx_creatives_parent ON creatives (parent_hash);
+"""
+
+
+def _prompt_hash(prompt: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest() if prompt else None
+
+
+class CreativeStore:
+    """Stores creative payloads by SHA-256 and indexes them in a manifest.
+
+    Blobs live at ``<root>/blobs/ab/cd/<hash>.<ext>``, written through a temp
+    file and an atomic rename, so identical payloads are stored once and
+    readers never see partial files. The manifest (``<root>/manifest.db``)
+    maps post, creative type and prompt to blob hashes; every lookup goes
+    through its indexes and never lists the blob directories.
+    """
+    
+    def __init__(self, root: str = CREATIVE_STORE_DIR):
+        self.root = ensure_directory_exists(root)
+        self.blob_dir = ensure_directory_exists(os.path.join(root, "blobs"))
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "manifest.db"),
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+    
+    def blob_path(self, blob_hash: str, ext: str) -> str:
+        """Path of a blob in the sharded layout."""
+        return os.path.join(self.blob_dir, blob_hash[:2], blob_hash[2:4], f"{blob_hash}.{ext}")
+    
+    def put_blob(self, data: bytes, ext: str) -> Tuple[str, str, bool]:
+        """Store a payload once.
+
+        Args:
+            data: File contents
+            ext: File extension without the dot
+
+        Returns:
+            Tuple of (hash, path, created) where ``created`` is False when
+            identical bytes were already stored.
+        """
+        blob_hash = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(blob_hash, ext)
+        created = not os.path.exists(path)
+        if created:
+            shard = ensure_directory_exists(os.path.dirname(path))
+            fd, tmp_path = tempfile.mkstemp(dir=shard, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+                record_bytes_written("creative_store", len(data))
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        with self._lock:
+            if not created:
+                self.deduplicated += 1
+            # Also repairs a blob whose row was lost to a crash after the rename
+            self._conn.execute(
+                "INSERT OR IGNORE INTO blobs (hash, ext, bytes, created_at) VALUES (?, ?, ?, ?)",
+                (blob_hash, ext, len(data), time.time())
+            )
+        return blob_hash, path, created
+    
+    def add(self, data: bytes, ext: str, post_title: Optional[str] = None,
+            creative_type: Optional[str] = None, prompt: Optional[str] = None,
+            kind: str = "original", parent_hash: Optional[str] = None,
+            session_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Store a creative and record it in the manifest.
+
+        Args:
+            data: Image (or prompt file) bytes
+            ext: File extension without the dot
+            post_title: Title of the post the creative belongs to
+            creative_type: e.g. "featured image"
+            prompt: Generation prompt
+            kind: "original", or "derivative" for re-encoded variants
+            parent_hash: Blob a derivative was made from
+            session_id: Workflow session that produced it
+            metadata: Extra JSON-serializable fields (size, format, ...)
+
+        Returns:
+            Manifest record including ``blob_hash``, ``path`` and ``deduplicated``.
+        """
+        blob_hash, path, created = self.put_blob(data, ext)
+        row_id = self.add_reference(blob_hash, post_title=post_title, creative_type=creative_type,
+                                    prompt=prompt, kind=kind, parent_hash=parent_hash,
+                                    session_id=session_id, metadata=metadata)
+        return {
+            "id": row_id,
+            "blob_hash": blob_hash,
+            "path": path,
+            "bytes": len(data),
+            "deduplicated": not created
+        }
+    
+    def add_reference(self, blob_hash: str, post_title: Optional[str] = None,
+                      creative_type: Optional[str] = None, prompt: Optional[str] = None,
+                      kind: str = "original", parent_hash: Optional[str] = None,
+                      session_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Record an already stored blob in the manifest (e.g. for another session).
+
+        Takes the same fields as ``add``; returns the manifest row id.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "INSERT INTO creatives (post_title, post_norm, creative_type, prompt_hash, blob_hash, "
+                "kind, parent_hash, session_id, created_at, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (post_title, normalize_topic(post_title), creative_type, _prompt_hash(prompt), blob_hash,
+                 kind, parent_hash, session_id, time.time(), json.dumps(metadata or {}, default=str))
+            ).lastrowid
+    
+    def add_file(self, source_path: str, **fields: Any) -> Dict[str, Any]:
+        """Store an existing file (e.g. a derivative) and record it; the source is left in place."""
+        ext = os.path.splitext(source_path)[1].lstrip('.') or 'bin'
+        with open(source_path, 'rb') as f:
+            data = f.read()
+        return self.add(data, ext, **fields)
+    
+    def find_by_post(self, post_title: str, creative_type: Optional[str] = None,
+                     kind: Optional[str] = "original", limit: int = 50,
+                     before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Creatives of a post, newest first (keyset pagination via ``before_id``)."""
+        clauses, params = ["c.post_norm = ?"], [normalize_topic(post_title)]
+        if creative_type is not None:
+            clauses.append("c.creative_type = ?")
+            params.append(creative_type)
+        return self._query(clauses, params, kind, limit, before_id)
+    
+    def find_by_prompt(self, prompt: str, kind: Optional[str] = "original",
+                       limit: int = 50) -> List[Dict[str, Any]]:
+        """Creatives generated from exactly this prompt, newest first."""
+        return self._query(["c.prompt_hash = ?"], [_prompt_hash(prompt)], kind, limit, None)
+    
+    def derivatives_of(self, blob_hash: str) -> List[Dict[str, Any]]:
+        """Derivative records made from a blob, one per variant, format and width."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.*, b.ext, b.bytes FROM creatives c JOIN blobs b ON b.hash = c.blob_hash "
+                "WHERE c.id IN (SELECT MIN(id) FROM creatives WHERE parent_hash = ? AND kind = 'derivative' "
+                "GROUP BY json_extract(metadata, '$.variant'), json_extract(metadata, '$.format'), "
+                "json_extract(metadata, '$.width')) ORDER BY c.id",
+                (blob_hash,)
+            ).fetchall()
+        return [self._record(row) for row in rows]
+    
+    def get(self, blob_hash: str) -> Optional[str]:
+        """Path of a stored blob, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT ext FROM blobs WHERE hash = ?", (blob_hash,)).fetchone()
+        return self.blob_path(blob_hash, row["ext"]) if row else None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Blob and manifest totals (from the manifest, not the filesystem)."""
+        with self._lock:
+            blobs = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM blobs").fetchone()
+            records = self._conn.execute("SELECT COUNT(*) FROM creatives").fetchone()[0]
+            logical = self._conn.execute(
+                "SELECT COALESCE(SUM(b.bytes), 0) FROM creatives c JOIN blobs b ON b.hash = c.blob_hash"
+            ).fetchone()[0]
+        return {
+            "blobs": blobs[0],
+            "stored_bytes": blobs[1],
+            "records": records,
+            "logical_bytes": logical,
+            "deduplicated_this_process": self.deduplicated
+        }
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+    
+    def _query(self, clauses: List[str], params: List[Any], kind: Optional[str], limit: int,
+               before_id: Optional[int]) -> List[Dict[str, Any]]:
+        if kind is not None:
+            clauses.append("c.kind = ?")
+            params.append(kind)
+        if before_id is not None:
+            clauses.append("c.id < ?")
+            params.append(before_id)
+        where = " AND ".join(clauses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT c.*, b.ext, b.bytes FROM creatives c JOIN blobs b ON b.hash = c.blob_hash "
+                f"WHERE {where} ORDER BY c.id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [self._record(row) for row in rows]
+    
+    def _record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = json.loads(row["metadata"])
+        record.update({
+            "id": row["id"],
+            "post_title": row["post_title"],
+            "creative_type": row["creative_type"],
+            "kind": row["kind"],
+            "blob_hash": row["blob_hash"],
+            "parent_hash": row["parent_hash"],
+            "session_id": row["session_id"],
+            "created_at": row["created_at"],
+            "bytes": row["bytes"],
+            "path": self.blob_path(row["blob_hash"], row["ext"])
+        })
+        return record
+
+
+_creative_store: Optional[CreativeStore] = None
+_creative_store_lock = threading.Lock()
+
+
+def get_creative_store() -> CreativeStore:
+    """Return the process-wide creative store configured from settings."""
+    global _creative_store
+    if _creative_store is None:
+        with _creative_store_lock:
+            if _creative_store is None:
+                _creative_store = CreativeStore()
+    return _creative_store
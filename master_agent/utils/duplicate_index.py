@@ -0,0 +1,381 @@
+"""Near-duplicate detection for generated posts with MinHash signatures and LSH.
+
+Two indexes are kept under ``DUPLICATE_INDEX_DIR``:
+
+- ``content``: every final post stored through ``set_final_content``, as
+  ``DUPLICATE_SHINGLE_WORDS``-word shingles. Drafts are checked against it.
+- ``briefs``: the normalized topic and keyword terms each post was written
+  from, so a new brief can be checked before any model call.
+
+Each session has one live entry per index: storing a session's final content
+again supersedes its earlier entry, and checks skip the caller's own session.
+
+Signatures use one-permutation MinHash: each shingle is hashed once into one of
+``_SLOTS`` slots, and each slot keeps the low 16 bits of its minimum. Empty
+slots borrow from a neighbour. That makes a signature 128 bytes, computed in
+one pass over the shingles. LSH splits the signature into ``_BANDS`` bands of
+``_ROWS`` slots; posts sharing any band are candidates, and candidates are
+verified by the share of equal slots (an estimate of Jaccard similarity).
+
+Storage is array-backed. Signatures are appended to ``<name>.sig`` and held in
+one ``array('H')``. Band keys (CRC-32 of the band) and post ids sit in two
+sorted ``array('I')`` columns that are searched by bisection. New posts go into
+a small dict until it is merged into the columns, which are then snapshotted
+to ``<name>.bands``. Post metadata lives in ``<name>.db``.
+"""
+
+import bisect
+import hashlib
+import heapq
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+from .file_utils import ensure_directory_exists
+from .research_store import normalize_terms
+from ..config.settings import (
+    DUPLICATE_INDEX_DIR,
+    DUPLICATE_SHINGLE_WORDS,
+    DUPLICATE_CONTENT_THRESHOLD,
+    DUPLICATE_BRIEF_THRESHOLD,
+    DUPLICATE_BRIEF_POLICY
+)
+
+
+_SLOTS = 64
+_BANDS = 21
+_ROWS = 3  # 21 bands of 3 slots: candidates from ~0.35 similarity, 94% likely at 0.5, near-certain above 0.6
+_SLOT_BITS = 6  # log2(_SLOTS)
+_MASK64 = (1 << 64) - 1
+_MERGE_MIN = 20_000  # Pending band entries before a merge into the sorted columns
+_WORD = re.compile(r"[a-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    topic TEXT,
+    session_id TEXT,
+    created_at REAL NOT NULL,
+    metadata TEXT NOT NULL,
+    superseded INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS posts_session ON posts (session_id);
+"""
+
+
+class DuplicateContentError(Exception):
+    """A brief was blocked because it duplicates an existing post."""
+    
+    def __init__(self, matches: List[Dict[str, Any]]):
+        best = matches[0]
+        super().__init__(f"brief duplicates existing post {best.get('title') or best.get('topic')!r} "
+                         f"(similarity {best['similarity']:.2f})")
+        self.matches = matches
+
+
+def shingle_hashes(text: str, size: int = DUPLICATE_SHINGLE_WORDS) -> Iterable[int]:
+    """64-bit hashes of the ``size``-word shingles of ``text`` (lowercased words)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        words = [" ".join(words)] if words else []
+        size = 1
+    for i in range(len(words) - size + 1):
+        shingle = " ".join(words[i:i + size]).encode("utf-8")
+        yield int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "little")
+
+
+def term_hashes(terms: Iterable[str]) -> Iterable[int]:
+    """64-bit hashes of individual terms (for brief signatures)."""
+    for term in terms:
+        yield int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(hashes: Iterable[int]) -> Optional[array]:
+    """One-permutation MinHash signature of a set of 64-bit hashes, or None if it is empty."""
+    slots: List[Optional[int]] = [None] * _SLOTS
+    for value in hashes:
+        slot, rest = value & (_SLOTS - 1), value >> _SLOT_BITS
+        current = slots[slot]
+        if current is None or rest < current:
+            slots[slot] = rest
+    if all(value is None for value in slots):
+        return None
+    # Densify: an empty slot takes the next filled slot's value, mixed with the distance
+    signature = array("H", bytes(2 * _SLOTS))
+    for slot in range(_SLOTS):
+        distance = 0
+        while slots[(slot + distance) % _SLOTS] is None:
+            distance += 1
+        value = slots[(slot + distance) % _SLOTS]
+        if distance:
+            value = (value * 0x9E3779B97F4A7C15 + distance) & _MASK64
+            value ^= value >> 29
+        signature[slot] = value & 0xFFFF
+    return signature
+
+
+def content_signature(text: str) -> Optional[array]:
+    """Signature of a post body."""
+    return minhash(shingle_hashes(text))
+
+
+def brief_signature(topic: str, keywords: Iterable[str] = ()) -> Optional[array]:
+    """Signature of a brief's normalized topic and keyword terms."""
+    return minhash(term_hashes(normalize_terms(" ".join([topic or "", *keywords]))))
+
+
+def similarity(left: array, right: array) -> float:
+    """Estimated Jaccard similarity: the share of equal signature slots."""
+    return sum(1 for a, b in zip(left, right) if a == b) / _SLOTS
+
+
+def _band_keys(signature: array) -> List[int]:
+    raw = signature.tobytes()
+    step = 2 * _ROWS
+    return [zlib.crc32(raw[band * step:(band + 1) * step], band) for band in range(_BANDS)]
+
+
+class DuplicateIndex:
+    """Array-backed MinHash/LSH index of post signatures with SQLite metadata."""
+    
+    def __init__(self, directory: str = DUPLICATE_INDEX_DIR, name: str = "content",
+                 threshold: float = DUPLICATE_CONTENT_THRESHOLD):
+        self.directory = ensure_directory_exists(directory)
+        self.name = name
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._signatures_path = os.path.join(directory, f"{name}.sig")
+        self._bands_path = os.path.join(directory, f"{name}.bands")
+        self._conn = sqlite3.connect(os.path.join(directory, f"{name}.db"),
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._load()
+    
+    def _load(self) -> None:
+        self.signatures = array("H")
+        if os.path.exists(self._signatures_path):
+            with open(self._signatures_path, "rb") as f:
+                self.signatures.frombytes(f.read())
+        # A crash between the signature append and the metadata insert leaves a tail to drop
+        posts = self._conn.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM posts").fetchone()[0]
+        if len(self.signatures) > posts * _SLOTS:
+            del self.signatures[posts * _SLOTS:]
+            with open(self._signatures_path, "r+b") as f:
+                f.truncate(len(self.signatures) * 2)
+        self.count = len(self.signatures) // _SLOTS
+        # Superseded posts keep their signature and bands but are skipped by queries
+        self.superseded = {row[0] for row in self._conn.execute("SELECT id FROM posts WHERE superseded = 1")}
+        
+        self.keys, self.ids = array("I"), array("I")
+        covered = 0
+        if os.path.exists(self._bands_path):
+            with open(self._bands_path, "rb") as f:
+                header = array("I")
+                header.frombytes(f.read(8))
+                covered, entries = header
+                self.keys.frombytes(f.read(4 * entries))
+                self.ids.frombytes(f.read(4 * entries))
+            if covered > self.count:  # Snapshot is ahead of the signatures; rebuild it
+                self.keys, self.ids, covered = array("I"), array("I"), 0
+        self.pending: Dict[int, List[int]] = {}
+        self._pending_entries = 0
+        for post_id in range(covered, self.count):
+            self._add_bands(post_id, self.signatures[post_id * _SLOTS:(post_id + 1) * _SLOTS])
+    
+    def _add_bands(self, post_id: int, signature: array) -> None:
+        for key in _band_keys(signature):
+            self.pending.setdefault(key, []).append(post_id)
+        self._pending_entries += _BANDS
+    
+    def _merge(self) -> None:
+        """Merge pending band entries into the sorted columns and snapshot them."""
+        pending = sorted((key, post_id) for key, ids in self.pending.items() for post_id in ids)
+        keys, ids = array("I"), array("I")
+        for key, post_id in heapq.merge(zip(self.keys, self.ids), pending):
+            keys.append(key)
+            ids.append(post_id)
+        self.keys, self.ids = keys, ids
+        self.pending, self._pending_entries = {}, 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            array("I", [self.count, len(keys)]).tofile(f)
+            keys.tofile(f)
+            ids.tofile(f)
+        os.replace(tmp_path, self._bands_path)
+    
+    def add(self, signature: array, title: Optional[str] = None, topic: Optional[str] = None,
+            session_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Index a post's signature; returns its id.
+        
+        A post with a ``session_id`` supersedes that session's earlier posts, so
+        a session that stores its final content again keeps one live entry.
+        """
+        with self._lock:
+            post_id = self.count
+            with open(self._signatures_path, "ab") as f:
+                signature.tofile(f)
+            if session_id is not None:
+                replaced = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM posts WHERE session_id = ? AND superseded = 0", (session_id,)
+                )]
+                if replaced:
+                    self._conn.execute("UPDATE posts SET superseded = 1 WHERE session_id = ?", (session_id,))
+                    self.superseded.update(replaced)
+            self._conn.execute(
+                "INSERT INTO posts (id, title, topic, session_id, created_at, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                (post_id, title, topic, session_id, time.time(), json.dumps(metadata or {}, default=str))
+            )
+            self.signatures.extend(signature)
+            self.count += 1
+            self._add_bands(post_id, signature)
+            if self._pending_entries >= max(_MERGE_MIN, len(self.keys) // 4):
+                self._merge()
+        return post_id
+    
+    def candidates(self, signature: array) -> set:
+        """Ids of posts sharing at least one LSH band with ``signature``."""
+        found = set()
+        keys, ids = self.keys, self.ids
+        for key in _band_keys(signature):
+            position = bisect.bisect_left(keys, key)
+            while position < len(keys) and keys[position] == key:
+                found.add(ids[position])
+                position += 1
+            found.update(self.pending.get(key, ()))
+        return found
+    
+    def query(self, signature: Optional[array], threshold: Optional[float] = None,
+              limit: int = 5, exclude_session: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Posts whose estimated similarity to ``signature`` is at least ``threshold``.
+        
+        Superseded posts, and posts of ``exclude_session`` when given, are skipped.
+        
+        Returns:
+            Up to ``limit`` matches, most similar first, each with ``id``,
+            ``similarity``, ``title``, ``topic``, ``session_id`` and ``created_at``.
+        """
+        if signature is None:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            scored = []
+            for post_id in self.candidates(signature):
+                if post_id in self.superseded:
+                    continue
+                score = similarity(signature, self.signatures[post_id * _SLOTS:(post_id + 1) * _SLOTS])
+                if score >= threshold:
+                    scored.append((score, post_id))
+            matches = []
+            for score, post_id in sorted(scored, reverse=True):
+                if len(matches) == limit:
+                    break
+                row = self._conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone()
+                if exclude_session is not None and row and row["session_id"] == exclude_session:
+                    continue
+                matches.append({
+                    "id": post_id,
+                    "similarity": round(score, 3),
+                    "title": row["title"] if row else None,
+                    "topic": row["topic"] if row else None,
+                    "session_id": row["session_id"] if row else None,
+                    "created_at": row["created_at"] if row else None
+                })
+        return matches
+    
+    def stats(self) -> Dict[str, Any]:
+        """Post count and in-memory size of the signature and band arrays."""
+        with self._lock:
+            return {
+                "posts": self.count,
+                "superseded": len(self.superseded),
+                "signature_bytes": len(self.signatures) * self.signatures.itemsize,
+                "band_bytes": (len(self.keys) + len(self.ids)) * 4,
+                "pending_band_entries": self._pending_entries
+            }
+    
+    def close(self) -> None:
+        with self._lock:
+            if self.pending:
+                self._merge()
+            self._conn.close()
+
+
+_indexes: Dict[str, DuplicateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_duplicate_index(name: str = "content") -> DuplicateIndex:
+    """Return the process-wide "content" or "briefs" index configured from settings."""
+    index = _indexes.get(name)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(name)
+            if index is None:
+                threshold = DUPLICATE_BRIEF_THRESHOLD if name == "briefs" else DUPLICATE_CONTENT_THRESHOLD
+                index = _indexes[name] = DuplicateIndex(name=name, threshold=threshold)
+    return index
+
+
+def _title(content: str) -> Optional[str]:
+    match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+    return match.group(1).strip() if match else None
+
+
+def record_final_content(session_id: str, final_content: Dict[str, Any],
+                         research_data: Optional[Dict[str, Any]] = None) -> None:
+    """Index a final post's body and, when known, the brief it was written from.
+    
+    The session's earlier entries are superseded, so re-reviewing a post keeps one entry per index.
+    """
+    content = final_content.get("content") or ""
+    title = _title(content)
+    topic = (research_data or {}).get("topic") or final_content.get("topic") or title
+    signature = content_signature(content)
+    if signature is not None:
+        get_duplicate_index("content").add(signature, title=title, topic=topic, session_id=session_id)
+    if research_data:
+        signature = brief_signature(research_data.get("topic") or "", research_data.get("keywords") or [])
+        if signature is not None:
+            get_duplicate_index("briefs").add(signature, title=title, topic=topic, session_id=session_id,
+                                              metadata={"keywords": research_data.get("keywords")})
+
+
+def check_content(text: str, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Past posts that are near-duplicates of ``text``, excluding those of ``session_id``."""
+    return get_duplicate_index("content").query(content_signature(text), exclude_session=session_id)
+
+
+def check_brief(topic: str, keywords: Iterable[str] = (), policy: str = DUPLICATE_BRIEF_POLICY,
+                session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Check a brief against the briefs of past posts before generating.
+
+    Args:
+        topic: Topic of the brief
+        keywords: Keywords of the brief
+        policy: "warn" prints a warning and returns the matches, "block" raises
+        session_id: Session making the check; its own earlier post is not a duplicate
+
+    Returns:
+        Matching past posts, most similar first (empty when there are none).
+
+    Raises:
+        DuplicateContentError: When ``policy`` is "block" and a match was found.
+    """
+    matches = get_duplicate_index("briefs").query(brief_signature(topic, keywords), exclude_session=session_id)
+    if matches and policy == "block":
+        raise DuplicateContentError(matches)
+    if matches:
+        best = matches[0]
+        print(f"⚠️ Brief '{topic}' looks like a duplicate of '{best['title'] or best['topic']}' "
+              f"(similarity {best['similarity']:.2f})")
+    return matches
@@ -0,0 +1,169 @@
+"""Stubbed GenAI client for offline runs, benchmarks and tests.
+
+Mimics the small subset of ``google.genai.Client`` used by the tools:
+``client.models.generate_content(model=..., contents=...)`` returning a
+response with ``candidates[0].content.parts``. Payload sizes, latency (with
+jitter) and the rate of injected API errors are configurable, so the tools can
+be load-tested without network access.
+"""
+
+import random
+import struct
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Callable, Optional, Tuple
+
+# Smallest valid PNG (1x1 transparent pixel)
+TINY_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360606060000000050001a5f645400000000049454e44ae426082"
+)
+
+
+_WORDS = ("content strategy readers practical growth insight audience measurable teams "
+          "the of and to for with a in is that build clear results search").split()
+
+
+class FakeAPIError(Exception):
+    """Injected upstream failure; carries an HTTP status ``code`` like genai's APIError."""
+    
+    def __init__(self, code: int):
+        super().__init__(f"{code} fake upstream error")
+        self.code = code
+
+
+def synthetic_markdown(size: int, seed: int = 0) -> str:
+    """Markdown post of roughly ``size`` characters: title, H2 sections and prose paragraphs."""
+    rng = random.Random(seed)
+    parts = ["# Fake Title\n\n"]
+    length = len(parts[0])
+    section = 0
+    while length < size:
+        if section == 0 or rng.random() < 0.2:
+            section += 1
+            parts.append(f"## Section {section}\n\n")
+            length += len(parts[-1])
+        sentences = [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 22))).capitalize() + "."
+                     for _ in range(rng.randint(2, 6))]
+        parts.append(" ".join(sentences) + "\n\n")
+        length += len(parts[-1])
+    return "".join(parts)
+
+
+def synthetic_png(width: int = 1, height: int = 1, size: int = 0) -> bytes:
+    """Valid RGB PNG of the given dimensions, padded to at least ``size`` bytes.
+
+    Padding goes into a private ancillary chunk, which decoders skip.
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    
+    row = b"\x00" + bytes(range(256)) * (width * 3 // 256) + bytes(width * 3 % 256)
+    png = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    png += chunk(b"IDAT", zlib.compress(row * height))
+    padding = size - len(png) - 24  # Padding chunk and IEND overhead
+    if padding > 0:
+        png += chunk(b"fkPd", bytes(padding))
+    return png + chunk(b"IEND", b"")
+
+
+class FakeModels:
+    """Fake ``client.models`` namespace.
+    
+    Each call sleeps ``latency`` seconds (varied by ``jitter``, e.g. 0.5 for
+    +/-50%) plus ``token_delay`` per output token, and fails with
+    ``FakeAPIError(error_code)`` with probability ``error_rate``. ``text_size``
+    and ``image_size``/``image_dimensions`` replace the default tiny payloads
+    with synthetic ones of that size; ``text_for`` builds the text from each
+    prompt instead (e.g. an outline for outline prompts).
+    """
+    
+    def __init__(self, latency: float = 0.1, text: str = "# Fake Title\n\nFake body.", image: bytes = TINY_PNG,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_code: int = 503,
+                 text_size: Optional[int] = None, image_size: Optional[int] = None,
+                 image_dimensions: Optional[Tuple[int, int]] = None, seed: int = 0,
+                 token_delay: float = 0.0, text_for: Optional[Callable[[str], str]] = None):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.text_for = text_for
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.text = synthetic_markdown(text_size, seed) if text_size else text
+        if image_size or image_dimensions:
+            image = synthetic_png(*(image_dimensions or (1, 1)), size=image_size or 0)
+        self.image = image
+        self.calls = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def _begin(self) -> float:
+        """Count a call, maybe inject an error, and return this call's latency."""
+        with self._lock:
+            self.calls += 1
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            latency = self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter)) if self.jitter else self.latency
+        if fail:
+            time.sleep(latency / 2)  # Failures come back faster than full responses
+            raise FakeAPIError(self.error_code)
+        return max(0.0, latency)
+    
+    def _text(self, contents) -> str:
+        return self.text_for(str(contents)) if self.text_for else self.text
+    
+    def generate_content(self, model: str, contents, config=None):
+        latency = self._begin()
+        if "image" in model:
+            time.sleep(latency)
+            part = SimpleNamespace(inline_data=SimpleNamespace(data=self.image, mime_type="image/png"))
+            return _response(part, _usage(contents, ""))
+        text = self._text(contents)
+        time.sleep(latency + self.token_delay * (len(text) // 4))
+        return _response(SimpleNamespace(text=text, inline_data=None), _usage(contents, text))
+    
+    def count_tokens(self, model: str, contents, config=None):
+        """Token count at four characters per token; no latency and no injected errors."""
+        with self._lock:
+            self.calls += 1
+        return SimpleNamespace(total_tokens=_usage(contents, "").prompt_token_count)
+    
+    def generate_content_stream(self, model: str, contents, config=None, chunks: int = 20):
+        """Yield the fake text in ``chunks`` pieces, spreading the latency across them."""
+        text = self._text(contents)
+        latency = self._begin() + self.token_delay * (len(text) // 4)
+        step = max(1, len(text) // chunks)
+        for start in range(0, len(text), step):
+            time.sleep(latency / chunks)
+            # Like the real API, usage metadata comes with the final chunk
+            usage = _usage(contents, text) if start + step >= len(text) else None
+            yield _response(SimpleNamespace(text=text[start:start + step], inline_data=None), usage)
+
+
+def _usage(contents, text: str) -> SimpleNamespace:
+    """Token counts estimated at four characters per token."""
+    prompt_tokens = max(1, len(str(contents)) // 4)
+    output_tokens = len(text) // 4
+    return SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens,
+                           total_token_count=prompt_tokens + output_tokens)
+
+
+def _response(part, usage: Optional[SimpleNamespace] = None) -> SimpleNamespace:
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))],
+                           usage_metadata=usage)
+
+
+class FakeClient:
+    """Drop-in stand-in for ``google.genai.Client``."""
+    
+    def __init__(self, latency: float = 0.1, **kwargs):
+        """
+        Args:
+            latency: Seconds per call
+            **kwargs: Payload, jitter and error injection options of ``FakeModels``
+        """
+        self.models = FakeModels(latency=latency, **kwargs)
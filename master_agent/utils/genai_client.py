@@ -0,0 +1,120 @@
+"""Process-wide pooled GenAI client shared by all tools."""
+
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from ..config.settings import (
+    MODEL_NAME,
+    IMAGE_GENERATION_MODEL,
+    GENAI_HTTP_POOL_SIZE,
+    GENAI_KEEPALIVE_EXPIRY,
+    TEXT_MODEL_MAX_CONCURRENCY,
+    IMAGE_MODEL_MAX_CONCURRENCY
+)
+
+
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+_model_limits: Dict[str, threading.BoundedSemaphore] = {}
+_model_limits_lock = threading.Lock()
+
+
+def _build_client() -> Any:
+    """Build a GenAI client whose HTTP session keeps connections alive."""
+    # Imported lazily so modules that never call a model don't pay for the SDK import
+    import httpx
+    from google.genai import Client, types
+
+    limits = httpx.Limits(
+        max_connections=GENAI_HTTP_POOL_SIZE,
+        max_keepalive_connections=GENAI_HTTP_POOL_SIZE,
+        keepalive_expiry=GENAI_KEEPALIVE_EXPIRY,
+    )
+    return Client(http_options=types.HttpOptions(client_args={"limits": limits}))
+
+
+def get_client() -> Any:
+    """Return the shared GenAI client, creating it on first use.
+
+    Returns:
+        The process-wide client (or the fake installed with ``set_client``)
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def set_client(client: Optional[Any]) -> None:
+    """Install a client (e.g. a fake for tests); ``None`` resets to lazy creation.
+
+    Args:
+        client: Object exposing the ``client.models`` API, or None
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+
+@contextmanager
+def override_client(client: Any) -> Iterator[Any]:
+    """Temporarily replace the shared client, restoring the previous one on exit.
+
+    Args:
+        client: Client to use inside the ``with`` block
+    """
+    global _client
+    with _client_lock:
+        previous = _client
+        _client = client
+    try:
+        yield client
+    finally:
+        with _client_lock:
+            _client = previous
+
+
+def _limit_for(model: str) -> int:
+    """Concurrency limit configured for a model."""
+    if model == IMAGE_GENERATION_MODEL:
+        return IMAGE_MODEL_MAX_CONCURRENCY
+    return TEXT_MODEL_MAX_CONCURRENCY
+
+
+@contextmanager
+def model_slot(model: str = MODEL_NAME) -> Iterator[None]:
+    """Hold one of the concurrent request slots allotted to a model.
+
+    Text (``MODEL_NAME``) and image (``IMAGE_GENERATION_MODEL``) requests are
+    limited separately, so a burst of image requests cannot starve drafts.
+
+    Args:
+        model: Model name the request is about to be sent to
+    """
+    semaphore = _model_limits.get(model)
+    if semaphore is None:
+        with _model_limits_lock:
+            semaphore = _model_limits.setdefault(
+                model, threading.BoundedSemaphore(_limit_for(model))
+            )
+    with semaphore:
+        yield
+
+
+def close_client() -> None:
+    """Close the shared client's HTTP connections. Safe to call more than once."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            print(f"Warning: Could not close GenAI client: {e}")
+
+
+atexit.register(close_client)
@@ -0,0 +1,164 @@
+"""Web-ready image derivatives (responsive widths, WebP/AVIF, thumbnail) built in a process pool."""
+
+import atexit
+import importlib.util
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from ..config.settings import (
+    IMAGE_DERIVATIVES_ENABLED,
+    IMAGE_DERIVATIVE_WIDTHS,
+    IMAGE_DERIVATIVE_FORMATS,
+    IMAGE_DERIVATIVE_QUALITY,
+    IMAGE_THUMBNAIL_SIZE,
+    IMAGE_DERIVATIVE_WORKERS
+)
+
+# Pillow is optional and only imported by the worker processes that encode;
+# the parent just checks it is installed, so importing this module stays cheap
+_PILLOW_INSTALLED = importlib.util.find_spec("PIL") is not None
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def derivatives_available() -> bool:
+    """Whether derivatives are enabled and Pillow is installed."""
+    return IMAGE_DERIVATIVES_ENABLED and _PILLOW_INSTALLED
+
+
+def _supported(fmt: str) -> bool:
+    from PIL import features
+    return fmt == "jpeg" or (fmt in ("webp", "avif") and bool(features.check(fmt)))
+
+
+def _save(image: 'Image.Image', path: str, fmt: str, quality: int) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"quality": quality}
+    if fmt == "jpeg":
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        params.update(optimize=True, progressive=True)
+    elif fmt == "webp":
+        params["method"] = 4
+    # No exif/icc_profile is passed, so metadata from the source is never written
+    image.save(path, format=fmt.upper(), **params)
+    return {"format": fmt, "width": image.width, "height": image.height,
+            "path": path, "bytes": os.path.getsize(path)}
+
+
+def create_derivatives(source_path: str, output_dir: Optional[str] = None,
+                       widths: Sequence[int] = tuple(IMAGE_DERIVATIVE_WIDTHS),
+                       formats: Sequence[str] = tuple(IMAGE_DERIVATIVE_FORMATS),
+                       quality: int = IMAGE_DERIVATIVE_QUALITY,
+                       thumbnail_size: Tuple[int, int] = tuple(IMAGE_THUMBNAIL_SIZE)) -> Dict[str, Any]:
+    """Encode web derivatives of one image (runs in a worker process).
+
+    Produces a full-size copy and one copy per responsive width narrower than
+    the source in every format, plus a thumbnail in the first format. EXIF
+    orientation is applied and all metadata is stripped.
+
+    Args:
+        source_path: Image saved by the creative tool
+        output_dir: Where derivatives go (default: ``<source dir>/derivatives``)
+        widths: Responsive widths in pixels (never upscaled)
+        formats: Output formats, e.g. ["webp", "avif", "jpeg"]; unsupported ones are skipped
+        quality: Encoder quality (0-100)
+        thumbnail_size: Bounding box of the thumbnail
+
+    Returns:
+        Dictionary with the list of derivatives (path, format, size, bytes),
+        the source size and the encode time in seconds.
+    """
+    from PIL import Image, ImageOps
+    
+    start = time.perf_counter()
+    output_dir = output_dir or os.path.join(os.path.dirname(source_path), "derivatives")
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    formats = [fmt.lower() for fmt in formats if _supported(fmt.lower())]
+    
+    with Image.open(source_path) as opened:
+        image = ImageOps.exif_transpose(opened)
+    if image.mode not in ("RGB", "RGBA", "L"):
+        has_alpha = "A" in image.mode or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    image.info = {}
+    
+    derivatives: List[Dict[str, Any]] = []
+    for fmt in formats:
+        ext = "jpg" if fmt == "jpeg" else fmt
+        record = _save(image, os.path.join(output_dir, f"{stem}.{ext}"), fmt, quality)
+        derivatives.append({"kind": "full", **record})
+        for width in sorted(set(widths)):
+            if width >= image.width:
+                continue
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            record = _save(resized, os.path.join(output_dir, f"{stem}_w{width}.{ext}"), fmt, quality)
+            derivatives.append({"kind": "responsive", **record})
+    
+    if formats:
+        fmt = formats[0]
+        ext = "jpg" if fmt == "jpeg" else fmt
+        thumbnail = image.copy()
+        thumbnail.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
+        record = _save(thumbnail, os.path.join(output_dir, f"{stem}_thumb.{ext}"), fmt, quality)
+        derivatives.append({"kind": "thumbnail", **record})
+    
+    return {
+        "source_bytes": os.path.getsize(source_path),
+        "derivatives": derivatives,
+        "encode_seconds": round(time.perf_counter() - start, 4)
+    }
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared worker pool, started on first use.
+
+    Workers are spawned rather than forked, since the parent process runs
+    threads (HTTP pool, tool executors) that are unsafe to fork.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=IMAGE_DERIVATIVE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def build_derivatives(source_path: str, **options: Any) -> Optional[Dict[str, Any]]:
+    """Create derivatives of an image in the process pool and wait for them.
+
+    Safe to call from many threads at once; encodes run in parallel across
+    worker processes without holding the caller's GIL.
+
+    Args:
+        source_path: Image file to process
+        **options: Overrides passed to ``create_derivatives``
+
+    Returns:
+        Result of ``create_derivatives``, or None when derivatives are disabled
+        or Pillow is not installed.
+    """
+    if not derivatives_available():
+        return None
+    return _get_pool().submit(create_derivatives, source_path, **options).result()
+
+
+def shutdown_derivative_pool() -> None:
+    """Stop the worker processes (restarted on next use)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+atexit.register(shutdown_derivative_pool)
@@ -0,0 +1,329 @@
+"""Single-pass markdown analysis: structure, sentence and readability statistics."""
+
+import io
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_LIST_ITEM = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+')
+_FENCE = re.compile(r'^\s*(```|~~~)')
+_LINK = re.compile(r'(!?)\[([^\]]*)\]\([^)]*\)|https?://\S+')
+# Sentence ends: terminal punctuation not followed by a word character, so
+# "3.5" and "e.g" do not end a sentence
+_SENTENCE_END = re.compile(r'[.!?]+(?!\w)')
+_WORD = re.compile(r'[^\W_][\w\'’-]*(?:\.[\w\'’-]+)*')
+_VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+
+# Sentence-length buckets (in words) reported by ``sentence_length_distribution``
+SENTENCE_BUCKETS = ((1, 10), (11, 20), (21, 30), (31, None))
+LONG_SENTENCE_WORDS = 25
+WORDS_PER_MINUTE = 238
+
+_TOTALS = ('words', 'sentences', 'sentence_words', 'syllables', 'paragraphs',
+           'list_items', 'links', 'images', 'code_blocks')
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """Heuristic English syllable count (vowel groups, minus a silent final e)."""
+    word = word.lower().strip("'’-")
+    if not word:
+        return 0
+    count = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith('e') and not word.endswith(('le', 'ee', 'ye')) and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+class MarkdownStats:
+    """Raw totals from analyzing markdown text.
+
+    Totals are additive, so stats of consecutive pieces of a document (e.g.
+    heading-delimited sections) can be combined with ``merge`` or ``+`` into the
+    stats of the whole. Derived metrics (readability, averages, distribution)
+    are computed from the totals on demand.
+    """
+    
+    def __init__(self):
+        self.words = 0
+        self.sentences = 0
+        self.sentence_words = 0  # Words in prose sentences (headings excluded)
+        self.syllables = 0  # Syllables of sentence_words
+        self.paragraphs = 0
+        self.list_items = 0
+        self.links = 0
+        self.images = 0
+        self.code_blocks = 0
+        self.sentence_lengths: Counter = Counter()
+        self.headings: List[Tuple[int, str]] = []
+    
+    def merge(self, other: 'MarkdownStats') -> 'MarkdownStats':
+        """Add another document piece's totals into this one (in place)."""
+        for field in _TOTALS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.sentence_lengths.update(other.sentence_lengths)
+        self.headings.extend(other.headings)
+        return self
+    
+    def __add__(self, other: 'MarkdownStats') -> 'MarkdownStats':
+        return MarkdownStats().merge(self).merge(other)
+    
+    def totals(self) -> Dict[str, Any]:
+        """Raw totals as a JSON-serializable dictionary, restored by ``from_totals``."""
+        data: Dict[str, Any] = {field: getattr(self, field) for field in _TOTALS}
+        data["sentence_lengths"] = {str(length): n for length, n in self.sentence_lengths.items()}
+        data["headings"] = [[level, text] for level, text in self.headings]
+        return data
+    
+    @classmethod
+    def from_totals(cls, data: Dict[str, Any]) -> 'MarkdownStats':
+        """Stats from a ``totals`` dictionary (e.g. one cached in the workflow state)."""
+        stats = cls()
+        for field in _TOTALS:
+            setattr(stats, field, data[field])
+        stats.sentence_lengths = Counter({int(length): n for length, n in data["sentence_lengths"].items()})
+        stats.headings = [(level, text) for level, text in data["headings"]]
+        return stats
+    
+    @property
+    def title(self) -> Optional[str]:
+        """Text of the first H1, or of the first heading if there is no H1."""
+        for level, text in self.headings:
+            if level == 1:
+                return text
+        return self.headings[0][1] if self.headings else None
+    
+    @property
+    def heading_levels(self) -> Dict[int, int]:
+        """Number of headings per level."""
+        return dict(sorted(Counter(level for level, _ in self.headings).items()))
+    
+    @property
+    def skipped_heading_levels(self) -> List[Tuple[str, str]]:
+        """Headings that jump more than one level deeper than the previous one."""
+        skipped = []
+        previous = None
+        for level, text in self.headings:
+            if previous is not None and level > previous + 1:
+                skipped.append((f"H{previous}→H{level}", text))
+            previous = level
+        return skipped
+    
+    @property
+    def avg_sentence_length(self) -> float:
+        return self.sentence_words / self.sentences if self.sentences else 0.0
+    
+    @property
+    def avg_paragraph_length(self) -> float:
+        return self.sentence_words / self.paragraphs if self.paragraphs else 0.0
+    
+    @property
+    def long_sentences(self) -> int:
+        return sum(n for length, n in self.sentence_lengths.items() if length > LONG_SENTENCE_WORDS)
+    
+    @property
+    def sentence_length_distribution(self) -> Dict[str, int]:
+        """Sentence counts per length bucket, e.g. ``{"1-10": 12, "11-20": 30, ...}``."""
+        distribution = {}
+        for low, high in SENTENCE_BUCKETS:
+            label = f"{low}-{high}" if high else f"{low}+"
+            distribution[label] = sum(
+                n for length, n in self.sentence_lengths.items()
+                if length >= low and (high is None or length <= high)
+            )
+        return distribution
+    
+    @property
+    def flesch_reading_ease(self) -> float:
+        """Flesch reading ease (higher is easier; 60-70 is plain English)."""
+        if not self.sentences or not self.sentence_words:
+            return 0.0
+        return (206.835 - 1.015 * (self.sentence_words / self.sentences)
+                - 84.6 * (self.syllables / self.sentence_words))
+    
+    @property
+    def flesch_kincaid_grade(self) -> float:
+        """Flesch-Kincaid grade level (US school grade)."""
+        if not self.sentences or not self.sentence_words:
+            return 0.0
+        return (0.39 * (self.sentence_words / self.sentences)
+                + 11.8 * (self.syllables / self.sentence_words) - 15.59)
+    
+    @property
+    def reading_time_minutes(self) -> float:
+        return self.words / WORDS_PER_MINUTE
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Totals and derived metrics as a JSON-serializable dictionary."""
+        return {
+            "words": self.words,
+            "sentences": self.sentences,
+            "paragraphs": self.paragraphs,
+            "headings": len(self.headings),
+            "heading_levels": {f"H{level}": n for level, n in self.heading_levels.items()},
+            "heading_outline": [{"level": level, "text": text} for level, text in self.headings],
+            "list_items": self.list_items,
+            "links": self.links,
+            "images": self.images,
+            "code_blocks": self.code_blocks,
+            "avg_sentence_length": round(self.avg_sentence_length, 1),
+            "long_sentences": self.long_sentences,
+            "sentence_length_distribution": self.sentence_length_distribution,
+            "flesch_reading_ease": round(self.flesch_reading_ease, 1),
+            "flesch_kincaid_grade": round(self.flesch_kincaid_grade, 1),
+            "reading_time_minutes": round(self.reading_time_minutes, 1)
+        }
+
+
+class MarkdownAnalyzer:
+    """Streaming analyzer: feed lines one at a time, then call ``finish``.
+
+    Each line is classified (fence, heading, list item, blank or prose) and
+    tokenized exactly once, so analysis is a single linear scan and memory use
+    does not depend on document size.
+    """
+    
+    def __init__(self):
+        self.stats = MarkdownStats()
+        self._in_code = False
+        self._in_paragraph = False
+        self._sentence = 0  # Words in the sentence currently being read
+    
+    def feed(self, line: str) -> None:
+        """Analyze one line of markdown."""
+        stats = self.stats
+        if _FENCE.match(line):
+            self._end_block()
+            if not self._in_code:
+                stats.code_blocks += 1
+            self._in_code = not self._in_code
+            return
+        if self._in_code:
+            return
+        if not line.strip():
+            self._end_block()
+            return
+        
+        heading = _HEADING.match(line)
+        if heading:
+            self._end_block()
+            text = heading.group(2)
+            stats.headings.append((len(heading.group(1)), text))
+            stats.words += sum(1 for _ in _WORD.finditer(text))
+            return
+        
+        list_item = _LIST_ITEM.match(line)
+        if list_item:
+            # Each list item is its own block of sentences
+            self._end_sentence()
+            self._in_paragraph = False
+            stats.list_items += 1
+            self._scan(line[list_item.end():])
+            self._end_sentence()
+            return
+        
+        if not self._in_paragraph:
+            self._in_paragraph = True
+            stats.paragraphs += 1
+        self._scan(line)
+    
+    def finish(self) -> MarkdownStats:
+        """Close any open sentence or paragraph and return the totals."""
+        self._end_block()
+        return self.stats
+    
+    def _scan(self, text: str) -> None:
+        # Hot path: one regex split per line into sentence pieces, then one
+        # findall per piece; totals are kept in locals and written back once
+        stats = self.stats
+        if '[' in text or '://' in text:
+            text = _LINK.sub(self._link, text)
+        lengths = stats.sentence_lengths
+        words = syllables = sentences = 0
+        sentence = self._sentence
+        pieces = _SENTENCE_END.split(text)
+        last = len(pieces) - 1
+        for index, piece in enumerate(pieces):
+            found = _WORD.findall(piece)
+            if found:
+                words += len(found)
+                syllables += sum(map(count_syllables, found))
+                sentence += len(found)
+            if index < last and sentence:
+                sentences += 1
+                lengths[sentence] += 1
+                sentence = 0
+        stats.words += words
+        stats.sentence_words += words
+        stats.syllables += syllables
+        stats.sentences += sentences
+        self._sentence = sentence
+    
+    def _link(self, match: 're.Match') -> str:
+        """Count a link or image and keep only its visible text."""
+        if match.group(1):
+            self.stats.images += 1
+            return ' '
+        self.stats.links += 1
+        return f" {match.group(2) or ''} "
+    
+    def _end_sentence(self) -> None:
+        if self._sentence:
+            self.stats.sentences += 1
+            self.stats.sentence_lengths[self._sentence] += 1
+            self._sentence = 0
+    
+    def _end_block(self) -> None:
+        self._end_sentence()
+        self._in_paragraph = False
+
+
+def analyze_markdown(source: Union[str, Iterable[str]]) -> MarkdownStats:
+    """Analyze markdown text in one pass.
+
+    Args:
+        source: Markdown text, or an iterable of lines (e.g. an open file)
+
+    Returns:
+        MarkdownStats with counts, heading outline, sentence lengths and readability
+    """
+    analyzer = MarkdownAnalyzer()
+    lines = io.StringIO(source) if isinstance(source, str) else source
+    for line in lines:
+        analyzer.feed(line)
+    return analyzer.finish()
+
+
+def split_sections(text: str) -> List[str]:
+    """Split markdown into heading-delimited sections.
+
+    Each section starts at a heading line (the first may be a preamble without
+    one); headings inside code blocks do not split. The sections join back into
+    ``text``, and since a heading closes any open sentence or paragraph, their
+    stats merge into exactly the stats of the whole.
+    """
+    sections: List[str] = []
+    current: List[str] = []
+    in_code = False
+    for line in io.StringIO(text):
+        if _FENCE.match(line):
+            in_code = not in_code
+        elif not in_code and current and _HEADING.match(line):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def readability_label(reading_ease: float) -> str:
+    """Plain-language band for a Flesch reading ease score."""
+    for threshold, label in ((90, "very easy"), (70, "easy"), (60, "plain English"),
+                             (50, "fairly difficult"), (30, "difficult")):
+        if reading_ease >= threshold:
+            return label
+    return "very difficult"
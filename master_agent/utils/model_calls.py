@@ -0,0 +1,325 @@
+"""Shared retry, backoff, rate limiting and circuit breaking for model calls."""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, Optional
+from .genai_client import model_slot
+from . import telemetry
+from ..config.settings import (
+    MAX_RETRIES,
+    RETRY_DELAY,
+    RETRY_MAX_DELAY,
+    MODEL_RATE_LIMITS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT
+)
+
+
+# HTTP status codes worth retrying: timeouts, rate limits and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while a model's circuit breaker is open."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Classify an exception from a model call as retryable or fatal.
+
+    API errors are classified by status code; connection problems and timeouts
+    are retryable; anything else (bad requests, auth, programming errors) is fatal.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # httpx transport errors (connect/read timeouts, dropped connections)
+    return type(error).__module__.startswith('httpx') and 'Error' in type(error).__name__
+
+
+def backoff_delay(attempt: int, base: float = RETRY_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second."""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Take one token, blocking until available.
+
+        Returns:
+            Seconds spent waiting (0 when not throttled)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class CircuitBreaker:
+    """Fails fast after repeated failures until ``reset_timeout`` has passed.
+
+    After the timeout a single trial call is let through (half-open); success
+    closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+    
+    def allow(self) -> bool:
+        """Whether a call may go upstream now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+    
+    def release_trial(self) -> None:
+        """End a half-open trial without a verdict (e.g. it failed with a client error)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+_metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+_metrics_lock = threading.Lock()
+_rate_limits: Dict[str, float] = dict(MODEL_RATE_LIMITS)
+
+
+def _bucket(model: str) -> Optional[TokenBucket]:
+    per_minute = _rate_limits.get(model)
+    if not per_minute:
+        return None
+    with _registry_lock:
+        if model not in _buckets:
+            _buckets[model] = TokenBucket(per_minute / 60.0)
+        return _buckets[model]
+
+
+@contextmanager
+def override_rate_limits(limits: Dict[str, float]) -> Iterator[None]:
+    """Temporarily replace the per-model requests-per-minute limits.
+
+    Used by offline runs against the fake client, which has no provider quota.
+    """
+    global _rate_limits
+    previous = _rate_limits
+    with _registry_lock:
+        _rate_limits = dict(limits)
+        _buckets.clear()
+    try:
+        yield
+    finally:
+        with _registry_lock:
+            _rate_limits = previous
+            _buckets.clear()
+
+
+def _breaker(model: str) -> CircuitBreaker:
+    with _registry_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker()
+        return _breakers[model]
+
+
+def _count(model: str, name: str, amount: float = 1) -> None:
+    with _metrics_lock:
+        _metrics[model][name] += amount
+
+
+def get_model_call_metrics() -> Dict[str, Dict[str, float]]:
+    """Per-model counters: calls, retries, throttled, throttle_wait_seconds,
+    failures, fatal_errors and circuit_rejections."""
+    with _metrics_lock:
+        metrics = {model: dict(counters) for model, counters in _metrics.items()}
+    for model, breaker in list(_breakers.items()):
+        metrics.setdefault(model, {})["circuit_state"] = breaker.state
+    return metrics
+
+
+def reset_model_call_state() -> None:
+    """Forget rate limiters, circuit breakers and metrics (for tests and benchmarks)."""
+    with _registry_lock:
+        _buckets.clear()
+        _breakers.clear()
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _admit(model: str, breaker: CircuitBreaker) -> None:
+    """Apply the circuit breaker and rate limiter before one upstream attempt."""
+    if not breaker.allow():
+        _count(model, "circuit_rejections")
+        raise CircuitOpenError(f"Circuit open for {model}: upstream is failing, try again later")
+    bucket = _bucket(model)
+    if bucket is not None:
+        waited = bucket.acquire()
+        if waited:
+            _count(model, "throttled")
+            _count(model, "throttle_wait_seconds", waited)
+    _count(model, "calls")
+
+
+def _after_failure(model: str, breaker: CircuitBreaker, error: Exception, attempt: int,
+                   max_attempts: int) -> None:
+    """Record a failed attempt and sleep before the next one, or re-raise.
+    
+    Only retryable (upstream) errors count toward the circuit breaker: a bad
+    request or an auth error says nothing about the upstream's health.
+    """
+    _count(model, "failures")
+    if not is_retryable(error):
+        _count(model, "fatal_errors")
+        breaker.release_trial()
+        raise error
+    breaker.record_failure()
+    if attempt == max_attempts - 1:
+        raise error
+    _count(model, "retries")
+    telemetry.count("model_retries_total", model=model)
+    time.sleep(backoff_delay(attempt))
+
+
+def call_model(model: str, fn: Callable[..., Any], /, *args: Any,
+               max_attempts: int = MAX_RETRIES, **kwargs: Any) -> Any:
+    """Call ``fn(*args, **kwargs)`` against ``model`` with retries and throttling.
+
+    Args:
+        model: Model name (selects the rate limiter, breaker and concurrency slot)
+        fn: The SDK call, e.g. ``client.models.generate_content``
+        max_attempts: Total attempts including the first one
+
+    Returns:
+        Whatever ``fn`` returns.
+
+    Raises:
+        CircuitOpenError: If the model's circuit breaker is open
+        Exception: The last error once retries are exhausted, or the first fatal one
+    """
+    breaker = _breaker(model)
+    with telemetry.span("model.generate_content", {"gen_ai.request.model": model}) as call_span:
+        for attempt in range(max_attempts):
+            _admit(model, breaker)
+            start = time.perf_counter()
+            try:
+                with model_slot(model):
+                    result = fn(*args, **kwargs)
+            except Exception as e:
+                telemetry.record_model_attempt_error(model, time.perf_counter() - start, e)
+                _after_failure(model, breaker, e, attempt, max_attempts)
+                continue
+            breaker.record_success()
+            telemetry.record_model_response(call_span, model, kwargs.get('contents'), result,
+                                            time.perf_counter() - start, attempt + 1)
+            return result
+
+
+def stream_model(model: str, fn: Callable[..., Iterator[Any]], /, *args: Any,
+                 max_attempts: int = MAX_RETRIES, **kwargs: Any) -> Iterator[Any]:
+    """Streaming variant of ``call_model``.
+
+    Retries only while nothing has been yielded yet; an error mid-stream is
+    raised to the caller, since the chunks already delivered can't be taken back.
+    
+    The model's concurrency slot is held until the stream is exhausted or the
+    generator is closed, so callers that stop early must close it (e.g. with
+    ``contextlib.closing``); closing also closes the underlying SDK stream.
+    """
+    breaker = _breaker(model)
+    tracing = telemetry.is_enabled()
+    # Not made the current span: a generator's context is its consumer's between chunks
+    call_span = telemetry.span("model.generate_content_stream", {"gen_ai.request.model": model})
+    try:
+        for attempt in range(max_attempts):
+            _admit(model, breaker)
+            started = False
+            start = time.perf_counter()
+            received, chunk, stream = 0, None, None
+            try:
+                with model_slot(model):
+                    stream = fn(*args, **kwargs)
+                    for chunk in stream:
+                        started = True
+                        if tracing:
+                            received += telemetry.payload_bytes(chunk)
+                        yield chunk
+            except Exception as e:
+                telemetry.record_model_attempt_error(model, time.perf_counter() - start, e)
+                if started:
+                    _count(model, "failures")
+                    if is_retryable(e):
+                        breaker.record_failure()
+                    else:
+                        _count(model, "fatal_errors")
+                        breaker.release_trial()
+                    raise
+                _after_failure(model, breaker, e, attempt, max_attempts)
+                continue
+            finally:
+                close = getattr(stream, 'close', None)
+                if callable(close):
+                    close()
+            breaker.record_success()
+            # Usage metadata arrives on the last chunk
+            telemetry.record_model_response(call_span, model, kwargs.get('contents'), chunk,
+                                            time.perf_counter() - start, attempt + 1, response_bytes=received)
+            return
+    except Exception as e:
+        call_span.record_error(e)
+        raise
+    finally:
+        call_span.end()
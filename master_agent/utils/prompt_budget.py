@@ -0,0 +1,272 @@
+"""Token budgeting for model prompts.
+
+Research reports grow with every source that feeds them and often repeat the
+same finding several times. When a prompt is over its token budget,
+``fit_research`` first drops exact repeated lines and, if that is not enough,
+condenses the lowest-value research sections until it fits. Value is the density of topic/keyword terms and facts
+(numbers, percentages) per token, so generic boilerplate sections go first.
+
+Tokens are counted with a local estimator by default; set
+``PROMPT_TOKEN_COUNTER = "api"`` to count with the SDK's ``count_tokens``
+(one extra request per count, falling back to the estimator on errors).
+"""
+
+import math
+import re
+from typing import Callable, Dict, List, Tuple
+from ..config.settings import MODEL_NAME, PROMPT_TOKEN_BUDGET, PROMPT_TOKEN_COUNTER
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"[a-z0-9]+")
+_FACT = re.compile(r"\d")
+_HEADING = re.compile(
+    r"^\s*(?:#{1,6}\s+\S.*"                      # Markdown heading
+    r"|\d+[.)]\s+[^\n]{1,80}:"                   # "2. Key Points to Cover:"
+    r"|[^\w\s]*\s*[A-Z][A-Z0-9 &/'()-]{2,}:?)\s*$"  # "🔍 KEY FINDINGS:"
+)
+_LABEL = re.compile(r"^[A-Z][\w ]{0,30}: \S")  # "Keywords: ...", kept through condensing
+_STOPWORDS = frozenset("the and for with that this from into your about are was were has have how what why".split())
+_CONDENSED_LINE_CHARS = 160
+_MIN_DUPLICATE_WORDS = 3  # Shorter lines (separators, labels) are never deduplicated
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of ``text`` without a model round-trip.
+
+    Takes the larger of the word/punctuation piece count and one token per four
+    characters, which tracks SentencePiece-style tokenizers closely enough for
+    budgeting English prose and lists.
+    """
+    if not text:
+        return 0
+    return max(len(_PIECE.findall(text)), math.ceil(len(text) / 4))
+
+
+def count_tokens(text: str, counter: str = PROMPT_TOKEN_COUNTER, model: str = MODEL_NAME) -> int:
+    """Count prompt tokens with the configured counter ("local" or "api")."""
+    if counter == "api":
+        from .genai_client import get_client
+        from .model_calls import call_model
+        client = get_client()
+        try:
+            response = call_model(model, client.models.count_tokens, model=model, contents=text)
+            total = getattr(response, 'total_tokens', None)
+            if total is not None:
+                return int(total)
+        except Exception as e:
+            print(f"⚠️ count_tokens failed, using the local estimate: {e}")
+    return estimate_tokens(text)
+
+
+def dedupe_lines(text: str) -> Tuple[str, int]:
+    """Drop exact repeated content lines, keeping the first occurrence.
+
+    Only trailing whitespace is ignored; lines differing in case, punctuation
+    or indentation are distinct content and are all kept.
+
+    Returns:
+        Tuple of (deduplicated text, number of lines removed)
+    """
+    seen = set()
+    kept: List[str] = []
+    removed = 0
+    for line in text.splitlines():
+        key = line.rstrip()
+        if len(key.split()) >= _MIN_DUPLICATE_WORDS and not _HEADING.match(line):
+            if key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept), removed
+
+
+def _split_sections(text: str) -> Tuple[List[str], List[List[str]]]:
+    """Split text into a preamble and sections, each starting with its heading line."""
+    preamble: List[str] = []
+    sections: List[List[str]] = []
+    for line in text.splitlines():
+        if _HEADING.match(line):
+            sections.append([line])
+        elif sections:
+            sections[-1].append(line)
+        else:
+            preamble.append(line)
+    return preamble, sections
+
+
+def _terms(*texts: str) -> frozenset:
+    words = (w for text in texts for w in _WORD.findall(text.lower()))
+    return frozenset(w for w in words if len(w) > 2 and w not in _STOPWORDS)
+
+
+def _section_value(lines: List[str], terms: frozenset, position: float) -> float:
+    """Terms and facts per token; earlier sections get up to a 50% boost."""
+    text = "\n".join(lines)
+    tokens = estimate_tokens(text) or 1
+    hits = sum(1 for word in _WORD.findall(text.lower()) if word in terms)
+    facts = len(_FACT.findall(text))
+    return (hits + 2 * facts + 1) / tokens * (1.5 - 0.5 * position)
+
+
+def _first_sentence(line: str) -> str:
+    sentence = re.split(r"(?<=[.!?])\s", line.strip(), maxsplit=1)[0]
+    if len(sentence) > _CONDENSED_LINE_CHARS:
+        sentence = sentence[:_CONDENSED_LINE_CHARS].rsplit(" ", 1)[0] + "…"
+    indent = line[:len(line) - len(line.lstrip())]
+    return indent + sentence
+
+
+def _condense(lines: List[str], terms: frozenset) -> List[str]:
+    """Keep the heading plus lines carrying a term or fact, each cut to one sentence."""
+    body = [line for line in lines[1:] if line.strip()]
+    relevant = [line for line in body
+                if _FACT.search(line) or terms.intersection(_WORD.findall(line.lower()))]
+    return [lines[0]] + [line if _LABEL.match(line) else _first_sentence(line)
+                         for line in (relevant or body[:1])] + [""]
+
+
+def _headings_only(lines: List[str]) -> List[str]:
+    """Keep the heading and any label lines such as "Keywords: ..."."""
+    return [lines[0]] + [line for line in lines[1:] if _LABEL.match(line)] + [""]
+
+
+def fit_research(research: str, budget: int, topic: str = "", keywords: str = "",
+                 count: Callable[[str], int] = estimate_tokens) -> Tuple[str, Dict]:
+    """Condense ``research`` to fit ``budget`` tokens.
+
+    Research already within the budget is returned unchanged. Otherwise exact
+    repeated lines are dropped first; then sections are condensed lowest value first; if that is not enough, the
+    lowest-value sections are reduced to their headings, and as a last resort
+    the text is truncated. Label lines such as "Keywords: ..." are kept.
+
+    Args:
+        research: Research report text
+        budget: Tokens available for the research (0 or less: no limit)
+        topic: Topic of the brief, used to score sections
+        keywords: Comma-separated keywords, used to score sections
+        count: Token counter for the original and final text
+
+    Returns:
+        Tuple of (research text, report) where the report holds ``original`` and
+        ``final`` token counts, ``deduplicated_lines`` and ``condensed_sections``.
+    """
+    original = count(research)
+    report = {"original": original, "final": original, "deduplicated_lines": 0, "condensed_sections": []}
+    if budget <= 0 or original <= budget:
+        return research, report
+    text, removed = dedupe_lines(research)
+    if removed:
+        report.update(final=count(text), deduplicated_lines=removed)
+        if report["final"] <= budget:
+            return text, report
+    
+    # Sections are sized with the estimator, scaled to whatever counter measured the text
+    limit = budget * estimate_tokens(text) / (report["final"] or 1)
+    terms = _terms(topic, keywords)
+    preamble, sections = _split_sections(text)
+    sizes = [estimate_tokens("\n".join(lines)) for lines in sections]
+    total = estimate_tokens("\n".join(preamble)) + sum(sizes)
+    last = max(1, len(sections) - 1)
+    order = sorted(range(len(sections)),
+                   key=lambda i: _section_value(sections[i], terms, i / last))
+    
+    condensed = report["condensed_sections"]
+    for shrink in (lambda lines: _condense(lines, terms), _headings_only):
+        for i in order:
+            if total <= limit:
+                break
+            smaller = shrink(sections[i])
+            size = estimate_tokens("\n".join(smaller))
+            if size < sizes[i]:
+                total -= sizes[i] - size
+                sections[i], sizes[i] = smaller, size
+                heading = smaller[0].strip()
+                if heading not in condensed:
+                    condensed.append(heading)
+    
+    text = "\n".join(preamble + [line for lines in sections for line in lines]).strip()
+    if total > limit:
+        text = text[:int(limit * 4)].rsplit("\n", 1)[0]
+    report["final"] = count(text)
+    return text, report
+
+
+def fit_prompt(build: Callable[[str], str], research: str, topic: str = "", keywords: str = "",
+               budget: int = PROMPT_TOKEN_BUDGET, counter: str = PROMPT_TOKEN_COUNTER,
+               model: str = MODEL_NAME) -> Tuple[str, Dict]:
+    """Build a prompt around ``research`` that fits the token budget.
+
+    Args:
+        build: Renders the full prompt for a given research text
+        research: Research report text
+        topic: Topic of the brief
+        keywords: Comma-separated keywords
+        budget: Token budget for the whole prompt (0 disables condensing)
+        counter: "local" estimator or "api" (SDK ``count_tokens``)
+        model: Model whose tokenizer the "api" counter uses
+
+    Returns:
+        Tuple of (prompt, report) where the report holds ``original`` and
+        ``final`` prompt token counts, the ``budget``, the ``counter`` used,
+        ``deduplicated_lines`` and ``condensed_sections``.
+    """
+    original_prompt = build(research)
+    original = count_tokens(original_prompt, counter, model)
+    # Instructions around the research are fixed; whatever is left goes to the
+    # research, converted to estimator units when the API did the counting
+    research_budget = 0
+    if budget > 0:
+        estimated = estimate_tokens(original_prompt) or 1
+        local_budget = budget * estimated / (original or estimated)
+        fixed = estimated - estimate_tokens(research)
+        research_budget = int(max(local_budget - fixed, local_budget / 4))
+    
+    fitted, report = fit_research(research, research_budget, topic, keywords)
+    prompt = original_prompt if fitted == research else build(fitted)
+    final = original if prompt is original_prompt else count_tokens(prompt, counter, model)
+    report.update(original=original, final=final, budget=budget, counter=counter)
+    return prompt, report
+
+
+def slice_research(research: str, headings: List[str], topic: str = "") -> List[str]:
+    """Split ``research`` into one slice per outline heading.
+
+    Each research section goes to the heading it shares the most terms with
+    (topic terms, which most headings repeat, are ignored), ties going to the
+    heading at the nearest relative position, so overview material lands early
+    and outlook material late. A heading left without a section borrows the
+    best-scoring one. Sections holding only labels ("Keywords: ...") are left
+    out, since the brief itself goes into every section prompt.
+
+    Args:
+        research: Research report text
+        headings: Section headings of the outline, in order
+        topic: Topic of the brief
+
+    Returns:
+        One research text per heading
+    """
+    if not headings:
+        return []
+    _, sections = _split_sections(research)
+    sections = [lines for lines in sections
+                if any(_WORD.search(line) and not _LABEL.match(line) for line in lines[1:])]
+    if not sections:
+        return [""] * len(headings)
+    
+    topic_terms = _terms(topic)
+    heading_terms = [_terms(heading) - topic_terms for heading in headings]
+    last_heading, last_section = max(1, len(headings) - 1), max(1, len(sections) - 1)
+    
+    def score(section: int, heading: int) -> float:
+        closeness = 1 - abs(section / last_section - heading / last_heading)
+        return len(_terms(*sections[section]) & heading_terms[heading]) + 0.5 * closeness
+    
+    assigned: List[List[int]] = [[] for _ in headings]
+    for i in range(len(sections)):
+        assigned[max(range(len(headings)), key=lambda h: score(i, h))].append(i)
+    for h, indexes in enumerate(assigned):
+        if not indexes:
+            indexes.append(max(range(len(sections)), key=lambda i: score(i, h)))
+    return ["\n".join(line for i in indexes for line in sections[i]).strip() for indexes in assigned]
@@ -0,0 +1,279 @@
+"""Persistent research cache with full-text candidate search and fuzzy topic matching."""
+
+import itertools
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+from .file_utils import ensure_directory_exists
+from .sqlite_store import normalize_topic
+from .telemetry import count
+from ..config.settings import (
+    RESEARCH_CACHE_DB,
+    RESEARCH_CACHE_MAX_AGE,
+    RESEARCH_CACHE_MIN_SIMILARITY
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS research (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    match_key TEXT NOT NULL,
+    topic_terms TEXT NOT NULL,
+    keyword_terms TEXT NOT NULL,
+    audience TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    report TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_research_key ON research (match_key, created_at);
+CREATE INDEX IF NOT EXISTS idx_research_created ON research (created_at);
+"""
+
+# Standalone FTS5 table whose rowid is research.id; holds the normalized topic terms
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS research_terms USING fts5(terms)"
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Words that don't change what needs researching
+_STOPWORDS = frozenset(
+    "a an and the for of in on to with your our how what why best top tips guide guides ultimate "
+    "complete introduction intro overview basics essential essentials".split()
+)
+_FTS_CANDIDATES = 25  # Best-ranked full-text candidates scored per lookup
+_MAX_TERM_GROUPS = 20  # Beyond this many "k of n terms" combinations, any shared term qualifies
+_TOPIC_WEIGHT = 0.75  # Share of the similarity from the topic; the rest from keywords
+
+
+def fold_plural(word: str) -> str:
+    """Fold plurals so "businesses" and "business" are the same term."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_terms(text: str) -> FrozenSet[str]:
+    """Lowercased, plural-folded content words of a topic or keyword list."""
+    return frozenset(fold_plural(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS)
+
+
+def jaccard(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    """Token-set similarity: shared terms over all terms (1.0 when both are empty)."""
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def _joined(terms: Iterable[str]) -> str:
+    return " ".join(sorted(terms))
+
+
+class ResearchStore:
+    """SQLite store of research reports, looked up by topic similarity.
+
+    Topics and keywords are reduced to sets of normalized terms. A lookup first
+    tries the exact term sets (an indexed key), then asks the FTS5 index for the
+    entries sharing enough topic terms to qualify and scores them with token-set
+    (Jaccard) similarity, so "cybersecurity for small businesses" finds a report cached
+    for "small business cybersecurity tips". Only entries for the same audience
+    and younger than ``max_age`` are returned.
+    """
+    
+    def __init__(self, path: str = RESEARCH_CACHE_DB, max_age: float = RESEARCH_CACHE_MAX_AGE,
+                 min_similarity: float = RESEARCH_CACHE_MIN_SIMILARITY):
+        self.path = path
+        self.max_age = max_age
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.stale = 0
+        directory = os.path.dirname(path)
+        if directory:
+            ensure_directory_exists(directory)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.execute(_FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:  # SQLite built without FTS5
+            self.full_text = False
+    
+    @staticmethod
+    def _key(topic_terms: FrozenSet[str], keyword_terms: FrozenSet[str], audience: str) -> str:
+        return f"{_joined(topic_terms)}|{_joined(keyword_terms)}|{audience}"
+    
+    def get(self, topic: str, keywords: Optional[List[str]] = None,
+            target_audience: str = "general") -> Optional[Dict[str, Any]]:
+        """Return the freshest matching report, or None.
+
+        Args:
+            topic: Topic of the brief
+            keywords: Keywords of the brief
+            target_audience: Audience the report must have been written for
+
+        Returns:
+            Entry with ``id``, ``topic``, ``report``, ``created_at``, ``age_seconds``,
+            ``match`` ("exact" or "fuzzy") and ``similarity``, or None on a miss.
+        """
+        topic_terms = normalize_terms(topic)
+        keyword_terms = normalize_terms(" ".join(keywords or []))
+        audience = normalize_topic(target_audience) or "general"
+        now = time.time()
+        cutoff = now - self.max_age
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM research WHERE match_key = ? ORDER BY created_at DESC LIMIT 1",
+                (self._key(topic_terms, keyword_terms, audience),)
+            ).fetchone()
+            if row is not None and row["created_at"] >= cutoff:
+                return self._hit(row, "exact", 1.0, now)
+            stale = row is not None
+            
+            best, best_score = None, 0.0
+            for candidate in self._candidates(topic_terms, audience, cutoff):
+                score = (_TOPIC_WEIGHT * jaccard(topic_terms, frozenset(candidate["topic_terms"].split()))
+                         + (1 - _TOPIC_WEIGHT) * jaccard(keyword_terms, frozenset(candidate["keyword_terms"].split())))
+                if score > best_score:
+                    best, best_score = candidate, score
+            if best is not None and best_score >= self.min_similarity:
+                return self._hit(best, "fuzzy", best_score, now)
+            
+            if stale:
+                self.stale += 1
+            self.misses += 1
+        count("research_cache_lookups_total", result="stale" if stale else "miss")
+        return None
+    
+    def _match_query(self, topic_terms: FrozenSet[str]) -> str:
+        """FTS5 query for entries holding enough of the topic terms to reach ``min_similarity``.
+
+        Keywords contribute at most ``1 - _TOPIC_WEIGHT``, so the topic's own
+        similarity must make up the rest; an entry missing more topic terms than
+        that allows can never qualify and is not fetched.
+        """
+        terms = sorted(f'"{term}"' for term in topic_terms)
+        min_topic_similarity = (self.min_similarity - (1 - _TOPIC_WEIGHT)) / _TOPIC_WEIGHT
+        needed = math.ceil(len(terms) * min_topic_similarity - 1e-9)
+        if needed <= 1 or math.comb(len(terms), needed) > _MAX_TERM_GROUPS:
+            return " OR ".join(terms)
+        return " OR ".join(f"({' AND '.join(group)})" for group in itertools.combinations(terms, needed))
+    
+    def _candidates(self, topic_terms: FrozenSet[str], audience: str, cutoff: float) -> List[sqlite3.Row]:
+        """Fresh entries for the audience that share enough topic terms with the query, best first."""
+        if not topic_terms:
+            return []
+        if self.full_text:
+            query = self._match_query(topic_terms)
+            return self._conn.execute(
+                "SELECT r.* FROM research_terms f JOIN research r ON r.id = f.rowid "
+                "WHERE research_terms MATCH ? AND r.audience = ? AND r.created_at >= ? "
+                "ORDER BY f.rank LIMIT ?",
+                (query, audience, cutoff, _FTS_CANDIDATES)
+            ).fetchall()
+        # Without FTS5, score the most recent fresh entries instead
+        return self._conn.execute(
+            "SELECT * FROM research WHERE audience = ? AND created_at >= ? ORDER BY created_at DESC LIMIT ?",
+            (audience, cutoff, _FTS_CANDIDATES * 4)
+        ).fetchall()
+    
+    def _hit(self, row: sqlite3.Row, match: str, similarity: float, now: float) -> Dict[str, Any]:
+        self.hits += 1
+        if match == "fuzzy":
+            self.fuzzy_hits += 1
+        count("research_cache_lookups_total", result=match)
+        return {
+            "id": row["id"],
+            "topic": row["topic"],
+            "report": row["report"],
+            "created_at": row["created_at"],
+            "age_seconds": round(now - row["created_at"], 3),
+            "match": match,
+            "similarity": round(similarity, 3),
+            "metadata": json.loads(row["metadata"])
+        }
+    
+    def put(self, topic: str, report: str, keywords: Optional[List[str]] = None,
+            target_audience: str = "general", metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Store a report and index its terms; expired entries are pruned.
+
+        Returns:
+            Id of the new entry.
+        """
+        topic_terms = normalize_terms(topic)
+        keyword_terms = normalize_terms(" ".join(keywords or []))
+        audience = normalize_topic(target_audience) or "general"
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._prune(now - self.max_age)
+                entry_id = self._conn.execute(
+                    "INSERT INTO research (topic, match_key, topic_terms, keyword_terms, audience, created_at, "
+                    "report, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (topic, self._key(topic_terms, keyword_terms, audience), _joined(topic_terms),
+                     _joined(keyword_terms), audience, now, report, json.dumps(metadata or {}, default=str))
+                ).lastrowid
+                if self.full_text:
+                    self._conn.execute("INSERT INTO research_terms (rowid, terms) VALUES (?, ?)",
+                                       (entry_id, _joined(topic_terms)))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return entry_id
+    
+    def _prune(self, cutoff: float) -> None:
+        if self.full_text:
+            self._conn.execute(
+                "DELETE FROM research_terms WHERE rowid IN (SELECT id FROM research WHERE created_at < ?)",
+                (cutoff,)
+            )
+        self._conn.execute("DELETE FROM research WHERE created_at < ?", (cutoff,))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counters for this process plus the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM research").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "full_text_index": self.full_text
+        }
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_research_store: Optional[ResearchStore] = None
+_research_store_lock = threading.Lock()
+
+
+def get_research_store() -> ResearchStore:
+    """Return the process-wide research store configured from settings."""
+    global _research_store
+    if _research_store is None:
+        with _research_store_lock:
+            if _research_store is None:
+                _research_store = ResearchStore()
+    return _research_store
@@ -0,0 +1,216 @@
+"""Persistent prompt-keyed cache for model responses."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from .file_utils import ensure_directory_exists
+from .telemetry import record_bytes_written
+from ..config.settings import (
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_MAX_BYTES
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Other processes write to the same directory, so the size tracked here drifts;
+# it is recomputed from disk after this share of max_bytes has been written
+_RESCAN_FRACTION = 0.05
+_STALE_TMP_SECONDS = 3600  # Temp files older than this were left by a crashed writer
+
+
+class ResponseCache:
+    """On-disk cache of model responses keyed by a hash of model name plus prompt.
+
+    Entries are individual JSON files sharded by key prefix. Writes go through a
+    temp file and an atomic rename, so processes sharing one directory never see
+    partial entries. Reads touch the entry's mtime, which drives LRU eviction
+    once the directory grows past ``max_bytes``. The directory size is
+    re-measured every few writes, so several processes together stay close to
+    the budget, and temp files abandoned by crashed writers are removed then.
+    """
+
+    def __init__(self, directory: str = RESPONSE_CACHE_DIR, ttl: float = RESPONSE_CACHE_TTL,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.directory = ensure_directory_exists(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._approx_bytes: Optional[int] = None
+        self._unscanned_bytes = 0  # Written by this process since the last scan
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Hash a model name and prompt into a cache key."""
+        digest = hashlib.sha256()
+        digest.update(model.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss or expired entry."""
+        path = self._path(self.make_key(model, prompt))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._count(hit=False)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        self._count(hit=True)
+        return entry.get("text")
+
+    def put(self, model: str, prompt: str, text: str) -> None:
+        """Store a response, evicting least recently used entries if over budget."""
+        key = self.make_key(model, prompt)
+        path = self._path(key)
+        shard = ensure_directory_exists(os.path.dirname(path))
+        payload = json.dumps({"model": model, "created_at": time.time(), "text": text})
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=shard, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write response cache entry: {e}")
+            return
+        record_bytes_written("response_cache", len(payload))
+
+        with self._lock:
+            if self._approx_bytes is not None:
+                self._approx_bytes += len(payload)
+            self._unscanned_bytes += len(payload)
+            needs_scan = self._approx_bytes is None or self._approx_bytes > self.max_bytes \
+                or self._unscanned_bytes > self.max_bytes * _RESCAN_FRACTION
+        if needs_scan:
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        with self._dir_lock():
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        with self._lock:
+            self._approx_bytes = 0
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _entries(self, suffix: str = '.json') -> Iterator[tuple]:
+        """Yield (path, size, mtime) for every entry (or temp file, suffix '.tmp') on disk."""
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(suffix):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue  # Removed by another process
+                yield entry.path, st.st_size, st.st_mtime
+
+    @contextmanager
+    def _dir_lock(self) -> Iterator[None]:
+        """Serialize eviction across processes sharing the directory."""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is back under 90% of budget.
+
+        Sizes are read from disk, so entries other processes wrote count too.
+        Temp files older than ``_STALE_TMP_SECONDS`` are removed first.
+        """
+        with self._dir_lock():
+            stale_before = time.time() - _STALE_TMP_SECONDS
+            for path, _, mtime in self._entries('.tmp'):
+                if mtime < stale_before:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._approx_bytes = total
+            self._unscanned_bytes = 0
+            self.evictions += evicted
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache configured from settings."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
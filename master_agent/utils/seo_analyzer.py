@@ -0,0 +1,310 @@
+"""Keyword density and placement scoring with a cached Aho–Corasick automaton."""
+
+import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from ..config.settings import (
+    SEO_MIN_KEYWORD_DENSITY,
+    SEO_MAX_KEYWORD_DENSITY,
+    SEO_AUTOMATON_CACHE_SIZE
+)
+
+
+_METADATA_LINE = re.compile(r'^\*\*[^*\n]+\*\*:')
+_KEYWORDS_LINE = re.compile(r'^\*\*Keywords\*\*:\s*(.+)$', re.MULTILINE)
+_WORD = re.compile(r'\w+')
+
+
+def keyword_variants(keyword: str) -> Set[str]:
+    """Lowercased keyword plus regular inflections of its last word.
+
+    Only regular plural and verb endings are generated, so "content strategy"
+    also matches "content strategies" but irregular forms are not covered.
+    """
+    words = keyword.lower().split()
+    if not words:
+        return set()
+    head, last = words[:-1], words[-1]
+    forms = {last, last + 's', last + 'ing', last + 'ed'}
+    if last.endswith('y') and len(last) > 1 and last[-2] not in 'aeiou':
+        forms |= {last[:-1] + 'ies', last[:-1] + 'ied'}
+    elif last.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        forms |= {last + 'es'}
+    if last.endswith('e'):
+        forms |= {last + 'd', last[:-1] + 'ing'}
+    if last.endswith('ies'):
+        forms |= {last[:-3] + 'y'}
+    elif last.endswith('s') and not last.endswith('ss'):
+        forms |= {last[:-1]}
+    return {" ".join(head + [form]) for form in forms}
+
+
+class KeywordAutomaton:
+    """Aho–Corasick automaton over keyword variants.
+
+    Finds every occurrence of every pattern in one pass over the text,
+    regardless of how many keywords there are. Matches are whole-word only.
+    """
+    
+    def __init__(self, patterns: Dict[str, str]):
+        """
+        Args:
+            patterns: Lowercased pattern -> canonical keyword it counts towards
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for pattern, keyword in patterns.items():
+            node = 0
+            for char in pattern:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._out[node].append((len(pattern), keyword))
+        
+        # Breadth-first failure links; outputs of the failure target are inherited
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+    
+    def find(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, keyword)`` for every whole-word match in lowercased text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        node = 0
+        length = len(text)
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0) if node else root.get(char, 0)
+            if not out[node]:
+                continue
+            for size, keyword in out[node]:
+                start = index - size + 1
+                end = index + 1
+                if (start == 0 or not text[start - 1].isalnum()) and \
+                        (end == length or not text[end].isalnum()):
+                    yield start, end, keyword
+
+
+@lru_cache(maxsize=SEO_AUTOMATON_CACHE_SIZE)
+def get_automaton(keywords: Tuple[str, ...]) -> KeywordAutomaton:
+    """Automaton for a keyword set, cached so batches sharing keywords build it once."""
+    patterns = {}
+    for keyword in keywords:
+        for variant in keyword_variants(keyword):
+            patterns.setdefault(variant, keyword)
+    return KeywordAutomaton(patterns)
+
+
+def keywords_from_content(content: str) -> List[str]:
+    """Keywords listed in a draft's ``**Keywords**:`` metadata line."""
+    match = _KEYWORDS_LINE.search(content)
+    if not match:
+        return []
+    return [k.strip() for k in re.split(r'[,;]', match.group(1)) if k.strip()]
+
+
+def _regions(text: str) -> Tuple[Optional[Tuple[int, int]], List[Tuple[int, int]],
+                                 Optional[Tuple[int, int]], List[Tuple[int, int]]]:
+    """Spans of the title, H2 headings, first paragraph and metadata lines."""
+    title, first_paragraph = None, None
+    h2s, metadata = [], []
+    paragraph_start = None
+    in_code = False
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        start, end = offset, offset + len(line)
+        offset = end
+        stripped = line.strip()
+        if stripped.startswith(('```', '~~~')):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        if _METADATA_LINE.match(stripped):
+            metadata.append((start, end))
+        if first_paragraph is None and paragraph_start is not None and \
+                (not stripped or stripped.startswith('#')):
+            first_paragraph = (paragraph_start, start)
+        if stripped.startswith('# ') and title is None:
+            title = (start, end)
+        elif stripped.startswith('## '):
+            h2s.append((start, end))
+        elif stripped and paragraph_start is None and not stripped.startswith('#') \
+                and not _METADATA_LINE.match(stripped) and stripped != '---':
+            paragraph_start = start
+    if first_paragraph is None and paragraph_start is not None:
+        first_paragraph = (paragraph_start, offset)
+    return title, h2s, first_paragraph, metadata
+
+
+def _within(spans: Sequence[Tuple[int, int]], starts: Sequence[int], position: int) -> bool:
+    """Whether a position falls in one of the sorted, non-overlapping spans."""
+    index = bisect_right(starts, position) - 1
+    return index >= 0 and position < spans[index][1]
+
+
+def _normalize_keywords(keywords: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(k.strip().lower() for k in keywords if k and k.strip()))
+
+
+def keyword_placements(content: str, keywords: Sequence[str]) -> Dict[str, Any]:
+    """Count keyword uses and placements in markdown, before any scoring.
+
+    Placements of consecutive heading-delimited sections combine exactly into
+    those of the whole document with ``combine_placements``, so sections that
+    did not change can be reused between reviews.
+
+    Returns:
+        Dictionary with ``has_title``, ``has_first_paragraph`` and, per keyword,
+        ``count``, ``h2_count``, ``in_title`` and ``in_first_paragraph``
+    """
+    keywords = _normalize_keywords(keywords)
+    text = content.lower()
+    title, h2s, first_paragraph, metadata = _regions(text)
+    h2_starts = [start for start, _ in h2s]
+    metadata_starts = [start for start, _ in metadata]
+    found = {keyword: {"count": 0, "h2_count": 0, "in_title": False, "in_first_paragraph": False}
+             for keyword in keywords}
+    if keywords:
+        for start, _, keyword in get_automaton(keywords).find(text):
+            if _within(metadata, metadata_starts, start):
+                continue  # The metadata footer lists every keyword; it isn't content
+            result = found[keyword]
+            result["count"] += 1
+            if title and title[0] <= start < title[1]:
+                result["in_title"] = True
+            elif first_paragraph and first_paragraph[0] <= start < first_paragraph[1]:
+                result["in_first_paragraph"] = True
+            elif _within(h2s, h2_starts, start):
+                result["h2_count"] += 1
+    return {"has_title": title is not None, "has_first_paragraph": first_paragraph is not None,
+            "keywords": found}
+
+
+def combine_placements(pieces: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Placements of a document from those of its consecutive sections, in order.
+
+    Counts add up; title and first-paragraph placements come from the first
+    section that has a title or a paragraph, as they would for the whole text.
+    """
+    combined: Dict[str, Any] = {"has_title": False, "has_first_paragraph": False, "keywords": {}}
+    for piece in pieces:
+        for keyword, found in piece["keywords"].items():
+            total = combined["keywords"].setdefault(
+                keyword, {"count": 0, "h2_count": 0, "in_title": False, "in_first_paragraph": False}
+            )
+            total["count"] += found["count"]
+            total["h2_count"] += found["h2_count"]
+            if not combined["has_title"]:
+                total["in_title"] = found["in_title"]
+            if not combined["has_first_paragraph"]:
+                total["in_first_paragraph"] = found["in_first_paragraph"]
+        combined["has_title"] = combined["has_title"] or piece["has_title"]
+        combined["has_first_paragraph"] = combined["has_first_paragraph"] or piece["has_first_paragraph"]
+    return combined
+
+
+def analyze_seo(content: str, keywords: Sequence[str], total_words: Optional[int] = None,
+                meta_description: Optional[str] = None) -> Dict[str, Any]:
+    """Score keyword usage in a post.
+
+    Args:
+        content: Markdown content
+        keywords: Primary keyword first, then secondary keywords
+        total_words: Word count of the content (counted here if not given)
+        meta_description: Meta description text to check for the keywords
+
+    Returns:
+        Dictionary with per-keyword count, density and placement, an overall
+        0-100 score and a list of issues.
+    """
+    if total_words is None:
+        total_words = sum(1 for _ in _WORD.finditer(content.lower()))
+    return score_placements(keyword_placements(content, keywords), keywords, total_words, meta_description)
+
+
+def score_placements(placements: Dict[str, Any], keywords: Sequence[str], total_words: int,
+                     meta_description: Optional[str] = None) -> Dict[str, Any]:
+    """Score keyword placements (from ``keyword_placements`` or ``combine_placements``).
+
+    Args:
+        placements: Keyword counts and placements of the whole post
+        keywords: Primary keyword first, then secondary keywords
+        total_words: Word count of the content
+        meta_description: Meta description text to check for the keywords
+
+    Returns:
+        The ``analyze_seo`` result.
+    """
+    keywords = _normalize_keywords(keywords)
+    if not keywords:
+        return {"keywords": [], "score": None, "issues": ["No target keywords provided"]}
+    
+    empty = {"count": 0, "h2_count": 0, "in_title": False, "in_first_paragraph": False}
+    results = {}
+    for index, keyword in enumerate(keywords):
+        found = placements["keywords"].get(keyword, empty)
+        results[keyword] = {"keyword": keyword, "primary": index == 0, "count": found["count"],
+                            "in_title": found["in_title"], "h2_count": found["h2_count"],
+                            "in_first_paragraph": found["in_first_paragraph"], "in_meta_description": False}
+    if meta_description:
+        for _, _, keyword in get_automaton(keywords).find(meta_description.lower()):
+            results[keyword]["in_meta_description"] = True
+    
+    issues = []
+    for result in results.values():
+        phrase_words = len(result["keyword"].split())
+        density = result["count"] * phrase_words / total_words * 100 if total_words else 0.0
+        result["density"] = round(density, 2)
+        result["over_optimized"] = density > SEO_MAX_KEYWORD_DENSITY
+        if result["over_optimized"]:
+            issues.append(f"\"{result['keyword']}\" density {density:.1f}% exceeds "
+                          f"{SEO_MAX_KEYWORD_DENSITY}% (keyword stuffing)")
+        elif result["count"] == 0:
+            issues.append(f"\"{result['keyword']}\" does not appear in the content")
+    
+    primary = results[keywords[0]]
+    if not primary["in_title"]:
+        issues.append(f"Primary keyword \"{primary['keyword']}\" is missing from the title")
+    if not primary["in_first_paragraph"]:
+        issues.append(f"Primary keyword \"{primary['keyword']}\" is missing from the first paragraph")
+    if not primary["h2_count"]:
+        issues.append(f"Primary keyword \"{primary['keyword']}\" is not used in any H2")
+    if meta_description is not None and not primary["in_meta_description"]:
+        issues.append(f"Primary keyword \"{primary['keyword']}\" is missing from the meta description")
+    if 0 < primary["density"] < SEO_MIN_KEYWORD_DENSITY:
+        issues.append(f"Primary keyword density {primary['density']}% is below {SEO_MIN_KEYWORD_DENSITY}%")
+    
+    # Placement of the primary keyword is worth 60 points, density 20, secondary coverage 20
+    score = 20 * primary["in_title"] + 15 * primary["in_first_paragraph"] + \
+        15 * bool(primary["h2_count"]) + 10 * primary["in_meta_description"]
+    if SEO_MIN_KEYWORD_DENSITY <= primary["density"] <= SEO_MAX_KEYWORD_DENSITY:
+        score += 20
+    secondary = [results[k] for k in keywords[1:]]
+    if secondary:
+        used = sum(1 for r in secondary if r["count"] and not r["over_optimized"])
+        score += round(20 * used / len(secondary))
+    else:
+        score += 20 * (primary["count"] > 0)
+    
+    return {
+        "keywords": list(results.values()),
+        "total_words": total_words,
+        "score": score,
+        "issues": issues
+    }
@@ -0,0 +1,231 @@
+"""Single-flight coalescing of identical in-flight requests.
+
+When several sessions or batch workers make the same request at the same time,
+only the first caller (the leader) runs it; concurrent duplicates (followers)
+wait for the leader's result instead of issuing their own upstream call.
+Errors are shared the same way. The entry is removed as soon as the leader
+finishes, so this only merges requests that overlap in time; it is not a cache.
+
+Callers can be threads (``do``), asyncio tasks (``do_async``) or consumers of
+chunked text (``stream``), and all three share one table per flight. Waiting
+never deadlocks:
+
+- A call made again from the thread (or task) that is already leading the
+  same key runs on its own instead of waiting for itself.
+- If a leader is abandoned (cancelled task, closed generator, interrupt), its
+  followers retry and one of them becomes the new leader.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+from . import telemetry
+
+
+class _Abandoned(Exception):
+    """The leader stopped without a result; followers should retry."""
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:  # No running event loop in this thread
+        return None
+
+
+class _Call:
+    """One in-flight request: its leader and the future followers wait on."""
+    
+    def __init__(self):
+        self.future: Future = Future()
+        # A running future cannot be cancelled, so a follower that gives up
+        # (e.g. a cancelled asyncio task) never cancels it for the others
+        self.future.set_running_or_notify_cancel()
+        self.thread = threading.get_ident()
+        self.task = _current_task()
+        self.followers = 0
+
+
+def request_key(*parts: Any) -> str:
+    """Stable key for a request: a hash of its parts with whitespace runs collapsed.
+    
+    Parts may be strings, numbers, None, lists/tuples or dicts of those.
+    """
+    def normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, (list, tuple)):
+            return [normalize(item) for item in value]
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+        return value
+    encoded = json.dumps(normalize(list(parts)), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """Table of in-flight calls for one kind of request."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0  # Requests actually executed (by leaders)
+        self.coalesced = 0  # Requests served from another caller's execution
+        self.errors = 0  # Executions that failed (their error went to every waiter)
+        self.retries = 0  # Followers that retried after their leader was abandoned
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+    
+    def _join(self, key: Hashable, waits_blocking: bool) -> Tuple[_Call, bool]:
+        """Register as leader of ``key`` or follow the call already in flight.
+        
+        Returns:
+            Tuple of (call, is_leader). A caller that would wait for itself
+            gets an unregistered call of its own and leads it.
+        """
+        task = _current_task()
+        with self._lock:
+            call = self._inflight.get(key)
+            if call is not None:
+                # A blocking wait in the leader's own thread could never be woken
+                reentrant = call.thread == threading.get_ident() if waits_blocking or call.task is None \
+                    else call.task is task
+                if not reentrant:
+                    call.followers += 1
+                    self.coalesced += 1
+                    telemetry.count("singleflight_requests_total", flight=self.name, role="follower")
+                    return call, False
+                return _Call(), True
+            call = _Call()
+            self._inflight[key] = call
+        return call, True
+    
+    def _finish(self, key: Hashable, call: _Call, value: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._inflight.get(key) is call:
+                del self._inflight[key]
+            self.calls += 1
+            if isinstance(error, Exception):
+                self.errors += 1
+        telemetry.count("singleflight_requests_total", flight=self.name, role="leader")
+        if error is None:
+            call.future.set_result(value)
+        elif isinstance(error, Exception):
+            call.future.set_exception(error)
+        else:
+            # Cancellation, generator close or interrupt: not the request's own failure
+            call.future.set_exception(_Abandoned())
+    
+    def _retry(self) -> None:
+        with self._lock:
+            self.coalesced -= 1
+            self.retries += 1
+    
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` unless the same key is in flight, then share its result.
+        
+        Args:
+            key: Normalized request key (see ``request_key``)
+            fn: Function performing the request
+        
+        Returns:
+            The leader's return value; the leader's exception is raised in every caller.
+        """
+        while True:
+            call, leader = self._join(key, waits_blocking=True)
+            if not leader:
+                try:
+                    return call.future.result()
+                except _Abandoned:
+                    self._retry()
+                    continue
+            try:
+                value = fn(*args, **kwargs)
+            except BaseException as e:
+                self._finish(key, call, error=e)
+                raise
+            self._finish(key, call, value)
+            return value
+    
+    async def do_async(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Async ``do``: ``fn`` is a coroutine function, or a plain function run in a worker thread.
+        
+        Followers await the leader without blocking the event loop, and may be
+        threads or tasks on other loops. Cancelling a follower does not affect
+        the leader; cancelling the leader makes its followers retry.
+        """
+        while True:
+            call, leader = self._join(key, waits_blocking=False)
+            if not leader:
+                try:
+                    return await asyncio.wrap_future(call.future)
+                except _Abandoned:
+                    self._retry()
+                    continue
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    value = await fn(*args, **kwargs)
+                else:
+                    value = await asyncio.to_thread(fn, *args, **kwargs)
+            except BaseException as e:
+                self._finish(key, call, error=e)
+                raise
+            self._finish(key, call, value)
+            return value
+    
+    def stream(self, key: Hashable, produce: Callable[[], Iterable[str]]) -> Iterator[str]:
+        """Coalesce a chunked text response.
+        
+        The leader yields chunks as ``produce()`` makes them; followers get the
+        complete text as a single chunk once the leader is done. A leader whose
+        consumer stops early counts as abandoned.
+        """
+        while True:
+            call, leader = self._join(key, waits_blocking=True)
+            if not leader:
+                try:
+                    text = call.future.result()
+                except _Abandoned:
+                    self._retry()
+                    continue
+                yield text
+                return
+            parts = []
+            try:
+                for chunk in produce():
+                    parts.append(chunk)
+                    yield chunk
+            except BaseException as e:
+                self._finish(key, call, error=e)
+                raise
+            self._finish(key, call, "".join(parts))
+            return
+    
+    def stats(self) -> Dict[str, int]:
+        """Executed, coalesced, failed and retried request counts, plus calls in flight."""
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "errors": self.errors,
+                    "retries": self.retries, "in_flight": len(self._inflight)}
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """Return the process-wide flight table for ``name`` (e.g. "write_content")."""
+    flight = _flights.get(name)
+    if flight is None:
+        with _flights_lock:
+            flight = _flights.setdefault(name, SingleFlight(name))
+    return flight
+
+
+def get_singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """Counters of every flight table, keyed by name."""
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
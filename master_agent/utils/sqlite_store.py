@@ -0,0 +1,311 @@
+"""SQLite-backed workflow history with indexed topic and session lookups."""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from .file_utils import ensure_directory_exists
+from ..config.settings import WORKFLOW_DB_FILE, MAX_CREATIVE_SUGGESTIONS
+
+
+# State key -> table holding its history. Large text fields live in `bodies`.
+_POST_TABLES = {
+    "research_data": ("research", "report"),
+    "draft_content": ("drafts", "content"),
+    "final_content": ("finals", "content"),
+}
+# Tables whose rows a session reset hides; rows are never deleted, so ids only grow
+_HISTORY_TABLES = [table for table, _ in _POST_TABLES.values()] + ["creatives"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bodies (
+    id INTEGER PRIMARY KEY,
+    body TEXT NOT NULL
+);
+{post_tables}
+CREATE TABLE IF NOT EXISTS creatives (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    content_title TEXT,
+    title_norm TEXT,
+    creative_type TEXT,
+    created_at REAL NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_creatives_title ON creatives (title_norm, id);
+CREATE INDEX IF NOT EXISTS idx_creatives_session ON creatives (session_id, id);
+CREATE INDEX IF NOT EXISTS idx_creatives_created ON creatives (created_at);
+CREATE TABLE IF NOT EXISTS session_values (
+    session_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (session_id, key)
+);
+CREATE TABLE IF NOT EXISTS session_resets (
+    session_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    last_id INTEGER NOT NULL,
+    PRIMARY KEY (session_id, table_name)
+);
+"""
+
+_POST_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    topic TEXT,
+    topic_norm TEXT,
+    created_at REAL NOT NULL,
+    metadata TEXT NOT NULL,
+    body_id INTEGER REFERENCES bodies (id)
+);
+CREATE INDEX IF NOT EXISTS idx_{table}_topic ON {table} (topic_norm, id);
+CREATE INDEX IF NOT EXISTS idx_{table}_session ON {table} (session_id, id);
+CREATE INDEX IF NOT EXISTS idx_{table}_created ON {table} (created_at);
+"""
+
+
+def normalize_topic(topic: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive form of a topic used for lookups."""
+    if not topic:
+        return None
+    return " ".join(topic.lower().split())
+
+
+def _topic_of(record: Dict[str, Any], body: Optional[str]) -> Optional[str]:
+    """Topic of a research/draft/final record."""
+    if record.get("topic"):
+        return record["topic"]
+    if body:
+        match = re.search(r'^\*\*Topic\*\*: (.+)$', body, re.MULTILINE) or \
+            re.search(r'^#\s+(.+)$', body, re.MULTILINE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+class SQLiteStateStore:
+    """Workflow state backend that keeps the full history in SQLite.
+
+    Implements the same ``record``/``load``/``flush``/``close`` interface as
+    ``StateJournal``, so it can sit behind ``WorkflowState``. Every research,
+    draft, final and creative record is kept in its own normalized table with
+    indexes on topic, session and timestamp; large bodies are stored separately
+    from metadata so listings never read them.
+    """
+    
+    def __init__(self, path: str = WORKFLOW_DB_FILE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            ensure_directory_exists(directory)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        post_tables = "".join(
+            _POST_TABLE_SCHEMA.format(table=table) for table, _ in _POST_TABLES.values()
+        )
+        self._conn.executescript(_SCHEMA.format(post_tables=post_tables))
+    
+    def record(self, session_id: str, op: str, key: Optional[str] = None, value: Any = None) -> None:
+        """Persist one WorkflowState mutation."""
+        now = time.time()
+        with self._lock, self.transaction():
+            if op == "clear":
+                # Rows up to the session's current last id predate the reset;
+                # ids are ordered even when the wall clock is not
+                for table in _HISTORY_TABLES:
+                    self._conn.execute(
+                        f"INSERT OR REPLACE INTO session_resets (session_id, table_name, last_id) "
+                        f"SELECT ?, ?, COALESCE(MAX(id), 0) FROM {table} WHERE session_id = ?",
+                        (session_id, table, session_id)
+                    )
+                self._conn.execute("DELETE FROM session_values WHERE session_id = ?", (session_id,))
+            elif op == "add" and key == "creative_suggestions":
+                title = value.get("content_title")
+                self._conn.execute(
+                    "INSERT INTO creatives (session_id, content_title, title_norm, creative_type, created_at, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (session_id, title, normalize_topic(title), value.get("creative_type"), now,
+                     json.dumps(value, default=str))
+                )
+            elif op == "set" and key in _POST_TABLES:
+                self._insert_post(session_id, key, value or {}, now)
+            elif op == "set":
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO session_values (session_id, key, value) VALUES (?, ?, ?)",
+                    (session_id, key, json.dumps(value, default=str))
+                )
+    
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the latest state of a session, or None if it has no history."""
+        with self._lock:
+            reset_ids = self._reset_ids(session_id)
+            state: Dict[str, Any] = {}
+            found = False
+            for key, (table, body_field) in _POST_TABLES.items():
+                row = self._conn.execute(
+                    f"SELECT t.metadata, b.body FROM {table} t LEFT JOIN bodies b ON b.id = t.body_id "
+                    f"WHERE t.session_id = ? AND t.id > ? ORDER BY t.id DESC LIMIT 1",
+                    (session_id, reset_ids.get(table, 0))
+                ).fetchone()
+                state[key] = self._assemble(row["metadata"], body_field, row["body"]) if row else None
+                found = found or row is not None
+            
+            rows = self._conn.execute(
+                "SELECT metadata FROM creatives WHERE session_id = ? AND id > ? "
+                "ORDER BY id DESC LIMIT ?",
+                (session_id, reset_ids.get("creatives", 0), MAX_CREATIVE_SUGGESTIONS)
+            ).fetchall()
+            state["creative_suggestions"] = [json.loads(row["metadata"]) for row in reversed(rows)]
+            found = found or bool(rows)
+            
+            for row in self._conn.execute(
+                "SELECT key, value FROM session_values WHERE session_id = ?", (session_id,)
+            ):
+                state[row["key"]] = json.loads(row["value"])
+                found = True
+            return state if found else None
+    
+    def flush(self) -> None:
+        """Checkpoint the write-ahead log into the main database file."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several records into one commit (re-entrant)."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._conn.execute("COMMIT")
+    
+    def has_topic(self, topic: str, kind: str = "final_content") -> bool:
+        """Whether any post of the given kind has been stored for a topic."""
+        table = _POST_TABLES[kind][0]
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM {table} WHERE topic_norm = ? LIMIT 1", (normalize_topic(topic),)
+            ).fetchone()
+        return row is not None
+    
+    def find_by_topic(self, topic: str, kind: str = "final_content", limit: int = 20,
+                      before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Records stored for a topic, newest first, without their bodies.
+
+        Args:
+            topic: Topic to look up (matched case- and whitespace-insensitively)
+            kind: "research_data", "draft_content" or "final_content"
+            limit: Page size
+            before_id: Return records older than this id (keyset pagination)
+        """
+        return self._page(_POST_TABLES[kind][0], "topic_norm", normalize_topic(topic), limit, before_id)
+    
+    def list_posts(self, session_id: Optional[str] = None, kind: str = "final_content",
+                   limit: int = 20, before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Records of a kind, optionally for one session, newest first, without bodies."""
+        return self._page(_POST_TABLES[kind][0], "session_id", session_id, limit, before_id)
+    
+    def list_creatives(self, content_title: Optional[str] = None, session_id: Optional[str] = None,
+                       limit: int = 50, before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Creative records for a post title and/or session (campaign), newest first."""
+        clauses, params = [], []
+        if content_title is not None:
+            clauses.append("title_norm = ?")
+            params.append(normalize_topic(content_title))
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, session_id, created_at, metadata FROM creatives {where} ORDER BY id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [self._row_dict(row) for row in rows]
+    
+    def get_post(self, post_id: int, kind: str = "final_content") -> Optional[Dict[str, Any]]:
+        """Full record, including its body, by id."""
+        table, body_field = _POST_TABLES[kind]
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT t.metadata, b.body FROM {table} t LEFT JOIN bodies b ON b.id = t.body_id WHERE t.id = ?",
+                (post_id,)
+            ).fetchone()
+        return self._assemble(row["metadata"], body_field, row["body"]) if row else None
+    
+    def _insert_post(self, session_id: str, key: str, value: Dict[str, Any], now: float) -> None:
+        table, body_field = _POST_TABLES[key]
+        metadata = dict(value)
+        body = metadata.pop(body_field, None)
+        topic = _topic_of(value, body)
+        body_id = None
+        if body is not None:
+            body_id = self._conn.execute("INSERT INTO bodies (body) VALUES (?)", (body,)).lastrowid
+        self._conn.execute(
+            f"INSERT INTO {table} (session_id, topic, topic_norm, created_at, metadata, body_id) "
+            f"VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, topic, normalize_topic(topic), now, json.dumps(metadata, default=str), body_id)
+        )
+    
+    def _page(self, table: str, column: str, value: Optional[str], limit: int,
+              before_id: Optional[int]) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, session_id, created_at, metadata FROM {table} {where} ORDER BY id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [self._row_dict(row) for row in rows]
+    
+    def _reset_ids(self, session_id: str) -> Dict[str, int]:
+        """Table -> last row id of the session before its latest reset."""
+        rows = self._conn.execute(
+            "SELECT table_name, last_id FROM session_resets WHERE session_id = ?", (session_id,)
+        )
+        return {row["table_name"]: row["last_id"] for row in rows}
+    
+    @staticmethod
+    def _row_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        record = json.loads(row["metadata"])
+        record.update({"id": row["id"], "session_id": row["session_id"], "created_at": row["created_at"]})
+        return record
+    
+    @staticmethod
+    def _assemble(metadata: str, body_field: str, body: Optional[str]) -> Dict[str, Any]:
+        record = json.loads(metadata)
+        if body is not None:
+            record[body_field] = body
+        return record
@@ -0,0 +1,234 @@
+"""Append-only journal persistence for workflow state."""
+
+import contextlib
+import json
+import os
+import threading
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from .file_utils import ensure_directory_exists
+from .telemetry import record_bytes_written
+from ..config.settings import (
+    WORKFLOW_JOURNAL_FILE,
+    WORKFLOW_SNAPSHOT_FILE,
+    JOURNAL_FSYNC_BATCH,
+    JOURNAL_COMPACT_EVERY,
+    MAX_CREATIVE_SUGGESTIONS
+)
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        "research_data": None,
+        "draft_content": None,
+        "final_content": None,
+        "creative_suggestions": []
+    }
+
+
+def _apply(state: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one journal record to a session's state; returns the new state."""
+    op = entry["op"]
+    if op == "set":
+        state[entry["k"]] = entry["v"]
+    elif op == "add":
+        suggestions = state.setdefault(entry["k"], [])
+        suggestions.append(entry["v"])
+        del suggestions[:-MAX_CREATIVE_SUGGESTIONS]
+    elif op == "clear":
+        state = _empty_state()
+    return state
+
+
+@contextlib.contextmanager
+def _no_file() -> Iterator[None]:
+    yield None
+
+
+class StateJournal:
+    """Persists workflow state mutations as compact JSONL records.
+
+    Every ``set_*``/``add_creative_suggestion`` call appends one record instead of
+    rewriting the whole state. Records are fsynced in batches of ``fsync_batch``.
+    After ``compact_every`` records every session's state is written to a
+    snapshot (temp file + atomic rename) and the journal is truncated.
+
+    Session state is not held in memory: the journal keeps the snapshot offset
+    of each session's line and the journal offsets of its records since the
+    last compaction, and ``load`` rebuilds one session from those on demand.
+    Memory therefore stays bounded by the number of sessions, and the session
+    store's limits decide which states stay resident.
+
+    Records carry a sequence number and the snapshot stores the last one it
+    covers, so a crash between the snapshot rename and the journal truncation
+    never replays an append twice. A torn final line from a crash mid-write is
+    dropped on replay.
+    """
+    
+    def __init__(self, journal_path: str = WORKFLOW_JOURNAL_FILE,
+                 snapshot_path: str = WORKFLOW_SNAPSHOT_FILE,
+                 fsync_batch: int = JOURNAL_FSYNC_BATCH,
+                 compact_every: int = JOURNAL_COMPACT_EVERY):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.fsync_batch = fsync_batch
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._snapshot_offsets: Dict[str, int] = {}  # Session -> offset of its snapshot line
+        self._journal_offsets: Dict[str, List[int]] = {}  # Session -> offsets of its records since the snapshot
+        self._journal_size = 0
+        self._seq = 0
+        self._pending = 0
+        self._since_compact = 0
+        
+        for path in (journal_path, snapshot_path):
+            directory = os.path.dirname(path)
+            if directory:
+                ensure_directory_exists(directory)
+        self._replay()
+        self._file = open(self.journal_path, 'ab')
+    
+    def record(self, session_id: str, op: str, key: Optional[str] = None, value: Any = None) -> None:
+        """Append one mutation.
+
+        Args:
+            session_id: Session the mutation belongs to
+            op: "set" (replace key), "add" (append creative suggestion) or "clear"
+            key: State key being mutated
+            value: New value (or appended item)
+        """
+        with self._lock:
+            self._seq += 1
+            entry = {"q": self._seq, "s": session_id, "op": op}
+            if key is not None:
+                entry["k"] = key
+                entry["v"] = value
+            line = (json.dumps(entry, separators=(',', ':'), default=str) + "\n").encode('utf-8')
+            self._file.write(line)
+            record_bytes_written("state_journal", len(line))
+            self._journal_offsets.setdefault(session_id, []).append(self._journal_size)
+            self._journal_size += len(line)
+            
+            self._pending += 1
+            self._since_compact += 1
+            if self._pending >= self.fsync_batch:
+                self._sync()
+            if self._since_compact >= self.compact_every:
+                self._compact()
+    
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the persisted state of a session from disk, or None if unknown."""
+        with self._lock:
+            if session_id not in self._snapshot_offsets and session_id not in self._journal_offsets:
+                return None
+            self._file.flush()
+            with open(self.snapshot_path, 'rb') if session_id in self._snapshot_offsets else _no_file() as snapshot, \
+                    open(self.journal_path, 'rb') as journal:
+                return self._materialize(session_id, snapshot, journal)
+    
+    def flush(self) -> None:
+        """Force pending records to disk."""
+        with self._lock:
+            self._sync()
+    
+    def compact(self) -> None:
+        """Write a snapshot of all sessions and truncate the journal."""
+        with self._lock:
+            self._compact()
+    
+    def close(self) -> None:
+        """Flush and close the journal file."""
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+    
+    def _materialize(self, session_id: str, snapshot: Optional[BinaryIO], journal: BinaryIO) -> Dict[str, Any]:
+        """One session's state: its snapshot line plus its journal records since then."""
+        state = _empty_state()
+        offset = self._snapshot_offsets.get(session_id)
+        if offset is not None and snapshot is not None:
+            snapshot.seek(offset)
+            state = json.loads(snapshot.readline())["state"]
+        for offset in self._journal_offsets.get(session_id, ()):
+            journal.seek(offset)
+            state = _apply(state, json.loads(journal.readline()))
+        return state
+    
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+    
+    def _write_snapshot(self, seq: int, sessions: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Write a snapshot (a header line, then one line per session) and index it."""
+        offsets = {}
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps({"seq": seq}).encode('utf-8') + b"\n")
+            for session_id, state in sessions:
+                offsets[session_id] = f.tell()
+                line = json.dumps({"s": session_id, "state": state}, separators=(',', ':'), default=str)
+                f.write(line.encode('utf-8') + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            record_bytes_written("state_snapshot", f.tell())
+        os.replace(tmp_path, self.snapshot_path)
+        self._snapshot_offsets = offsets
+    
+    def _compact(self) -> None:
+        self._sync()
+        # Sessions are materialized one at a time while the new snapshot streams out
+        session_ids = list(self._snapshot_offsets)
+        session_ids += [sid for sid in self._journal_offsets if sid not in self._snapshot_offsets]
+        with open(self.snapshot_path, 'rb') if self._snapshot_offsets else _no_file() as snapshot, \
+                open(self.journal_path, 'rb') as journal:
+            self._write_snapshot(self._seq, ((sid, self._materialize(sid, snapshot, journal)) for sid in session_ids))
+        
+        # Snapshot is durable; the journal can start over
+        self._file.close()
+        self._file = open(self.journal_path, 'wb')
+        self._journal_offsets = {}
+        self._journal_size = 0
+        self._since_compact = 0
+    
+    def _replay(self) -> None:
+        """Index the snapshot and the journal records it does not cover."""
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'rb') as f:
+                    header = json.loads(f.readline())
+                    snapshot_seq = header.get("seq", 0)
+                    offset = f.tell()
+                    for line in f:
+                        self._snapshot_offsets[json.loads(line)["s"]] = offset
+                        offset += len(line)
+            except Exception as e:
+                self._snapshot_offsets = {}
+                print(f"Warning: Could not load state snapshot: {e}")
+        self._seq = snapshot_seq
+        
+        if not os.path.exists(self.journal_path):
+            return
+        valid_bytes = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn write from a crash
+                offset = valid_bytes
+                valid_bytes += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("q", 0) <= snapshot_seq:
+                    continue  # Already covered by the snapshot
+                self._journal_offsets.setdefault(entry["s"], []).append(offset)
+                self._seq = entry["q"]
+                self._since_compact += 1
+        self._journal_size = valid_bytes
+        
+        # Drop a torn tail so the next append starts on a fresh line
+        if os.path.getsize(self.journal_path) != valid_bytes:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_bytes)
@@ -1,25 +1,102 @@
 """Workflow state management utilities."""
 
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Any, Iterator, List, Optional
+import atexit
 import json
 import os
-from ..config.settings import WORKFLOW_STATE_FILE
+import threading
+import time
+from ..config.settings import (
+    WORKFLOW_STATE_FILE,
+    WORKFLOW_STATE_BACKEND,
+    DUPLICATE_INDEX_ENABLED,
+    MAX_CREATIVE_SUGGESTIONS,
+    SESSION_STORE_MAX_SESSIONS,
+    SESSION_STORE_MAX_BYTES,
+    SESSION_IDLE_TTL
+)
+
+
+# Key under which the workflow session id is kept in ADK session state. AgentTool
+# copies parent state into sub-agent sessions and forwards deltas back, so the id
+# stays stable across the master agent and all of its sub-agents.
+SESSION_STATE_KEY = "workflow_session_id"
+
+# Session id of the global workflow state
+DEFAULT_SESSION_ID = "default"
+
+_state_backend: Optional[Any] = None
+_state_backend_lock = threading.Lock()
+
+
+def get_state_backend() -> Optional[Any]:
+    """Return the persistence backend selected by WORKFLOW_STATE_BACKEND.
+
+    Returns:
+        None for "json" (whole-state ``save_to_file``), otherwise a shared backend
+        exposing ``record``/``load``/``flush``/``close``
+    """
+    global _state_backend
+    if WORKFLOW_STATE_BACKEND == "json":
+        return None
+    if _state_backend is None:
+        with _state_backend_lock:
+            if _state_backend is None:
+                if WORKFLOW_STATE_BACKEND == "journal":
+                    from .state_journal import StateJournal
+                    _state_backend = StateJournal()
+                elif WORKFLOW_STATE_BACKEND == "sqlite":
+                    from .sqlite_store import SQLiteStateStore
+                    _state_backend = SQLiteStateStore()
+                else:
+                    raise ValueError(f"Unknown WORKFLOW_STATE_BACKEND: {WORKFLOW_STATE_BACKEND}")
+                atexit.register(_state_backend.close)
+    return _state_backend
+
+
+def _approx_size(value: Any) -> int:
+    """Rough serialized size of a state value in bytes."""
+    if value is None:
+        return 0
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
 
 
 class WorkflowState:
-    """Manages workflow state across agents."""
+    """Manages workflow state across agents.
     
-    def __init__(self):
+    When a persistence backend is attached, every mutation is recorded to it as
+    it happens; ``save_to_file`` then only flushes the backend.
+    """
+    
+    def __init__(self, session_id: str = DEFAULT_SESSION_ID, backend: Optional[Any] = None):
+        self.session_id = session_id
+        self.backend = backend
+        self.lock = threading.RLock()
+        self.last_access = time.monotonic()
         self.state = {
             "research_data": None,
             "draft_content": None,
             "final_content": None,
             "creative_suggestions": []
         }
+        self._sizes: Dict[str, int] = {}
+    
+    def _set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self.state[key] = value
+            self._sizes[key] = _approx_size(value)
+            if self.backend is not None:
+                self.backend.record(self.session_id, "set", key, value)
     
     def set_research_data(self, data: Dict[str, Any]) -> None:
         """Store research data."""
-        self.state["research_data"] = data
+        self._set("research_data", data)
     
     def get_research_data(self) -> Optional[Dict[str, Any]]:
         """Retrieve research data."""
@@ -27,57 +104,251 @@ class WorkflowState:
     
     def set_draft_content(self, content: Dict[str, Any]) -> None:
         """Store draft content."""
-        self.state["draft_content"] = content
+        self._set("draft_content", content)
     
     def get_draft_content(self) -> Optional[Dict[str, Any]]:
         """Retrieve draft content."""
         return self.state.get("draft_content")
     
     def set_final_content(self, content: Dict[str, Any]) -> None:
-        """Store final content."""
-        self.state["final_content"] = content
+        """Store final content and, when enabled, add it to the near-duplicate index."""
+        self._set("final_content", content)
+        if DUPLICATE_INDEX_ENABLED:
+            from .duplicate_index import record_final_content
+            try:
+                record_final_content(self.session_id, content, self.state.get("research_data"))
+            except Exception as e:
+                print(f"⚠️ Could not index final content for duplicate detection: {e}")
     
     def get_final_content(self) -> Optional[Dict[str, Any]]:
         """Retrieve final content."""
         return self.state.get("final_content")
     
+    def set_review_cache(self, cache: Dict[str, Any]) -> None:
+        """Store per-section review analysis and the last review's metrics."""
+        self._set("review_cache", cache)
+    
+    def get_review_cache(self) -> Optional[Dict[str, Any]]:
+        """Retrieve the review cache."""
+        return self.state.get("review_cache")
+    
     def add_creative_suggestion(self, suggestion: Dict[str, Any]) -> None:
-        """Add creative suggestion."""
-        if "creative_suggestions" not in self.state:
-            self.state["creative_suggestions"] = []
-        self.state["creative_suggestions"].append(suggestion)
+        """Add creative suggestion, keeping only the most recent MAX_CREATIVE_SUGGESTIONS."""
+        with self.lock:
+            if "creative_suggestions" not in self.state:
+                self.state["creative_suggestions"] = []
+            suggestions = self.state["creative_suggestions"]
+            suggestions.append(suggestion)
+            size = self._sizes.get("creative_suggestions", 0) + _approx_size(suggestion)
+            while len(suggestions) > MAX_CREATIVE_SUGGESTIONS:
+                size -= _approx_size(suggestions.pop(0))
+            self._sizes["creative_suggestions"] = size
+            if self.backend is not None:
+                self.backend.record(self.session_id, "add", "creative_suggestions", suggestion)
     
     def get_creative_suggestions(self) -> list:
         """Retrieve all creative suggestions."""
         return self.state.get("creative_suggestions", [])
     
+    def approx_bytes(self) -> int:
+        """Approximate memory held by this state, in serialized bytes."""
+        return sum(self._sizes.values())
+    
+    def touch(self) -> None:
+        """Mark the state as used now (drives idle eviction)."""
+        self.last_access = time.monotonic()
+    
     def save_to_file(self) -> None:
-        """Save state to file."""
+        """Save state to file (or flush the persistence backend)."""
+        if self.backend is not None:
+            self.backend.flush()
+            return
         try:
-            with open(WORKFLOW_STATE_FILE, 'w') as f:
+            with self.lock, open(WORKFLOW_STATE_FILE, 'w') as f:
                 json.dump(self.state, f, indent=2)
         except Exception as e:
             print(f"Warning: Could not save state to file: {e}")
     
     def load_from_file(self) -> None:
-        """Load state from file."""
+        """Load state from file (or replay it from the persistence backend)."""
+        if self.backend is not None:
+            state = self.backend.load(self.session_id)
+            if state is not None:
+                self._replace(state)
+            return
         if os.path.exists(WORKFLOW_STATE_FILE):
             try:
                 with open(WORKFLOW_STATE_FILE, 'r') as f:
-                    self.state = json.load(f)
+                    self._replace(json.load(f))
             except Exception as e:
                 print(f"Warning: Could not load state from file: {e}")
     
+    def _replace(self, state: Dict[str, Any]) -> None:
+        with self.lock:
+            self.state = state
+            self._sizes = {key: _approx_size(value) for key, value in state.items()}
+    
     def clear(self) -> None:
         """Clear all state."""
-        self.state = {
-            "research_data": None,
-            "draft_content": None,
-            "final_content": None,
-            "creative_suggestions": []
-        }
+        with self.lock:
+            self.state = {
+                "research_data": None,
+                "draft_content": None,
+                "final_content": None,
+                "creative_suggestions": []
+            }
+            self._sizes = {}
+            if self.backend is not None:
+                self.backend.record(self.session_id, "clear")
+
+
+class SessionStateStore:
+    """Session-keyed collection of WorkflowState objects with bounded memory.
+
+    Sessions are kept in least-recently-used order. A session is evicted once it
+    has been idle longer than ``idle_ttl`` seconds, or (oldest first) while the
+    store holds more than ``max_sessions`` sessions or more than ``max_bytes``
+    of approximate state. Eviction listeners are called with the id of every
+    evicted or discarded session, so per-session work kept elsewhere can be
+    released with it.
+    """
+    
+    def __init__(self, max_sessions: int = SESSION_STORE_MAX_SESSIONS,
+                 max_bytes: int = SESSION_STORE_MAX_BYTES,
+                 idle_ttl: float = SESSION_IDLE_TTL):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.evictions = 0
+        self._sessions: "OrderedDict[str, WorkflowState]" = OrderedDict()
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+    
+    def get(self, session_id: str) -> WorkflowState:
+        """Return the state for a session, creating it on first use.
+        
+        A persisted session is loaded outside the store lock, so one session's
+        replay from disk does not stall every other session.
+        """
+        with self._lock:
+            state = self._sessions.get(session_id)
+        if state is None:
+            state = WorkflowState(session_id, backend=get_state_backend())
+            if state.backend is not None:
+                state.load_from_file()  # Resume a persisted session
+        with self._lock:
+            # Keep the instance another thread stored while this one was loading
+            state = self._sessions.setdefault(session_id, state)
+            self._sessions.move_to_end(session_id)
+            state.touch()
+            evicted = self._evict(keep=session_id)
+        self._notify(evicted)
+        return state
+    
+    def discard(self, session_id: str) -> None:
+        """Drop a session's state."""
+        with self._lock:
+            found = self._sessions.pop(session_id, None) is not None
+        self._notify([session_id] if found else [])
+    
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """Call ``listener(session_id)`` whenever a session is evicted or discarded."""
+        with self._lock:
+            self._listeners.append(listener)
+    
+    def session_ids(self) -> List[str]:
+        """Live session ids, least recently used first."""
+        with self._lock:
+            return list(self._sessions)
+    
+    def total_bytes(self) -> int:
+        """Approximate memory held by all sessions."""
+        with self._lock:
+            return sum(state.approx_bytes() for state in self._sessions.values())
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+    
+    def _notify(self, session_ids: List[str]) -> None:
+        for session_id in session_ids:
+            for listener in list(self._listeners):
+                try:
+                    listener(session_id)
+                except Exception as e:
+                    print(f"⚠️ Session eviction listener failed for {session_id}: {e}")
+    
+    def _evict(self, keep: str) -> List[str]:
+        """Evict idle and least recently used sessions; returns their ids. Caller holds the lock."""
+        evicted = []
+        now = time.monotonic()
+        total = sum(state.approx_bytes() for state in self._sessions.values())
+        while len(self._sessions) > 1:
+            session_id, state = next(iter(self._sessions.items()))
+            if session_id == keep:
+                break
+            over_budget = len(self._sessions) > self.max_sessions or total > self.max_bytes
+            if not over_budget and now - state.last_access <= self.idle_ttl:
+                break
+            self._sessions.popitem(last=False)
+            total -= state.approx_bytes()
+            self.evictions += 1
+            evicted.append(session_id)
+        return evicted
+
+
+# Global workflow state instance (used when no session can be resolved)
+workflow_state = WorkflowState(backend=get_state_backend())
+
+# Session-scoped workflow states for concurrent ADK sessions and batch workers
+session_states = SessionStateStore()
+
+_current_session: ContextVar[Optional[str]] = ContextVar("workflow_session", default=None)
+
+
+@contextmanager
+def session_scope(session_id: str) -> Iterator[WorkflowState]:
+    """Route tool calls without a tool context to ``session_id``'s state.
+
+    Args:
+        session_id: Session whose state the enclosed calls should use
+    """
+    token = _current_session.set(session_id)
+    try:
+        yield session_states.get(session_id)
+    finally:
+        _current_session.reset(token)
+
+
+def _session_id_from_context(tool_context: Any) -> Optional[str]:
+    """Resolve the workflow session id from an ADK tool context."""
+    state = getattr(tool_context, "state", None)
+    if state is not None:
+        session_id = state.get(SESSION_STATE_KEY)
+        if session_id:
+            return session_id
+    
+    session = getattr(tool_context, "session", None)
+    session_id = getattr(session, "id", None)
+    if session_id and state is not None:
+        # Pin the id so sub-agent sessions created by AgentTool resolve to the same state
+        state[SESSION_STATE_KEY] = session_id
+    return session_id
+
 
+def get_workflow_state(tool_context: Any = None) -> WorkflowState:
+    """Return the workflow state for the current session.
 
-# Global workflow state instance
-workflow_state = WorkflowState()
+    Resolution order: the ADK tool context, then an enclosing ``session_scope``,
+    then the global ``workflow_state``.
 
+    Args:
+        tool_context: ADK ToolContext injected into the calling tool, if any
+    """
+    session_id = _session_id_from_context(tool_context) if tool_context is not None else None
+    session_id = session_id or _current_session.get()
+    if session_id is None:
+        return workflow_state
+    return session_states.get(session_id)
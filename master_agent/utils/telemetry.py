@@ -0,0 +1,625 @@
+"""Tracing and metrics for agent turns, tool invocations and model calls.
+
+Spans follow the OpenTelemetry data model (128-bit trace id, 64-bit span id,
+parent span, start/end in Unix nanoseconds, attributes, status). They are
+written to a JSON-lines file and/or forwarded to the OpenTelemetry API, where
+whatever SDK exporter the process configured picks them up. Counters and
+histograms are kept in process and exported in Prometheus text format or as
+JSON lines.
+
+Telemetry is off unless ``TELEMETRY_ENABLED`` is set or ``enable()`` is
+called. While off, ``span()`` returns a shared no-op span, the recording
+functions return at their first check and ``adk_callbacks()`` registers
+nothing on the agents.
+"""
+
+import atexit
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from .file_utils import ensure_directory_exists
+from ..config.settings import (
+    TELEMETRY_ENABLED,
+    TELEMETRY_EXPORTERS,
+    TELEMETRY_JSONL_PATH,
+    TELEMETRY_PROMETHEUS_PATH,
+    TELEMETRY_LATENCY_BUCKETS
+)
+
+
+SIZE_BUCKETS = [256 * 4 ** i for i in range(10)]  # 256 B .. 64 MiB
+EXPORTERS = ("jsonl", "prometheus", "otel")
+
+# Metric name -> (type, help text, histogram buckets; None means latency buckets)
+METRICS = {
+    "agent_turn_duration_seconds": ("histogram", "Duration of one agent turn", None),
+    "tool_duration_seconds": ("histogram", "Duration of one tool invocation", None),
+    "model_call_duration_seconds": ("histogram", "Duration of one model request attempt", None),
+    "model_prompt_bytes": ("histogram", "Size of the prompt sent to the model", SIZE_BUCKETS),
+    "model_response_bytes": ("histogram", "Size of the text and inline data returned by the model", SIZE_BUCKETS),
+    "model_tokens_total": ("counter", "Tokens reported in the response usage metadata", None),
+    "model_retries_total": ("counter", "Model request attempts that were retried", None),
+    "model_errors_total": ("counter", "Failed model request attempts", None),
+    "disk_bytes_written_total": ("counter", "Bytes written to disk", None),
+    "research_cache_lookups_total": ("counter", "Research cache lookups by result", None),
+    "speculative_creatives_total": ("counter", "Speculative creative generations by outcome", None),
+    "singleflight_requests_total": ("counter", "Coalesced requests by flight and role (leader or follower)", None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_enabled = False
+_exporters: Tuple[str, ...] = ()
+_jsonl_path = TELEMETRY_JSONL_PATH
+_prometheus_path = TELEMETRY_PROMETHEUS_PATH
+_jsonl_file = None
+_jsonl_lock = threading.Lock()
+_current: ContextVar[Optional['Span']] = ContextVar('telemetry_span', default=None)
+
+
+class _NoopSpan:
+    """Stand-in returned by ``span()`` while telemetry is off."""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> '_NoopSpan':
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+    
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+    
+    def record_error(self, error: BaseException) -> None:
+        pass
+    
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """One timed operation; use as a context manager to make it the current span."""
+    
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                 parent: Optional['Span'] = None):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.status = "UNSET"
+        self.status_message: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._start = time.perf_counter()
+        self.duration = 0.0
+        self._otel = _otel_start(self) if "otel" in _exporters else None
+        self._token = None
+    
+    def __enter__(self) -> 'Span':
+        self._token = _current.set(self)
+        return self
+    
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> bool:
+        if exc is not None:
+            self.record_error(exc)
+        _current.reset(self._token)
+        self.end()
+        return False
+    
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+    
+    def record_error(self, error: BaseException) -> None:
+        self.status = "ERROR"
+        self.status_message = str(error)[:500]
+        self.attributes["exception.type"] = type(error).__name__
+    
+    def end(self) -> None:
+        """Finish the span and export it (only the first call counts)."""
+        if self.end_ns is not None:
+            return
+        self.duration = time.perf_counter() - self._start
+        self.end_ns = self.start_ns + int(self.duration * 1e9)
+        if self.status == "UNSET":
+            self.status = "OK"
+        if self._otel is not None:
+            _otel_end(self)
+        if "jsonl" in _exporters:
+            _write_jsonl({"type": "span", **self.to_dict()})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent.span_id if self.parent else None,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": {"code": self.status, "message": self.status_message},
+            "attributes": self.attributes
+        }
+
+
+def _otel_start(span: Span) -> Any:
+    from opentelemetry import trace
+    parent = span.parent._otel if span.parent is not None else None
+    otel_span = trace.get_tracer(__name__).start_span(
+        span.name,
+        context=trace.set_span_in_context(parent) if parent is not None else None,
+        attributes=_otel_attributes(span.attributes),
+        start_time=span.start_ns
+    )
+    context = otel_span.get_span_context()
+    if context.is_valid:
+        # Use the SDK's ids so JSON-lines records line up with the OTel backend
+        span.trace_id = format(context.trace_id, "032x")
+        span.span_id = format(context.span_id, "016x")
+    return otel_span
+
+
+def _otel_end(span: Span) -> None:
+    from opentelemetry.trace import Status, StatusCode
+    span._otel.set_attributes(_otel_attributes(span.attributes))
+    if span.status == "ERROR":
+        span._otel.set_status(Status(StatusCode.ERROR, span.status_message))
+    span._otel.end(end_time=span.end_ns)
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in attributes.items() if isinstance(v, (str, bool, int, float))}
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """Span that is a child of the current one; use with ``with``.
+
+    Returns the shared no-op span when telemetry is off.
+    """
+    if not _enabled:
+        return NOOP_SPAN
+    return Span(name, attributes, _current.get())
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+# Metrics
+
+class Counter:
+    kind = "counter"
+    
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.values: Dict[Labels, float] = {}
+    
+    def add(self, amount: float, labels: Labels) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+    
+    def samples(self) -> Iterator[Tuple[str, Labels, float]]:
+        for labels, value in sorted(self.values.items()):
+            yield self.name, labels, value
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{"labels": dict(labels), "value": value} for labels, value in sorted(self.values.items())]
+
+
+class Histogram:
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help_text
+        self.buckets = sorted(buckets)
+        # labels -> [count per bucket (non-cumulative, last is +Inf), sum]
+        self.values: Dict[Labels, List[Any]] = {}
+    
+    def add(self, value: float, labels: Labels) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+    
+    def samples(self) -> Iterator[Tuple[str, Labels, float]]:
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (("le", _number(bound)),), cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{"labels": dict(labels), "buckets": dict(zip(map(_number, [*self.buckets, "+Inf"]), counts)),
+                 "sum": total, "count": sum(counts)}
+                for labels, (counts, total) in sorted(self.values.items())]
+
+
+_registry: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def _metric(name: str) -> Any:
+    metric = _registry.get(name)
+    if metric is None:
+        kind, help_text, buckets = METRICS.get(name, ("counter" if name.endswith("_total") else "histogram",
+                                                       name.replace("_", " "), None))
+        if kind == "counter":
+            metric = Counter(name, help_text)
+        else:
+            metric = Histogram(name, help_text, buckets or TELEMETRY_LATENCY_BUCKETS)
+        _registry[name] = metric
+    return metric
+
+
+def count(name: str, amount: float = 1, **labels: Any) -> None:
+    """Add to a counter (no-op while telemetry is off)."""
+    if not _enabled:
+        return
+    key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+    with _registry_lock:
+        _metric(name).add(amount, key)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Record a histogram observation (no-op while telemetry is off)."""
+    if not _enabled:
+        return
+    key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+    with _registry_lock:
+        _metric(name).add(value, key)
+
+
+def record_bytes_written(kind: str, size: int) -> None:
+    """Count bytes persisted to disk, labelled by what was written."""
+    if _enabled and size:
+        count("disk_bytes_written_total", size, kind=kind)
+
+
+def payload_bytes(value: Any) -> int:
+    """Size of the text and inline data in a prompt, response or chunk."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(payload_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return payload_bytes(json.dumps(value, default=str))
+    candidates = getattr(value, 'candidates', None)
+    if candidates:
+        return sum(payload_bytes(getattr(c, 'content', None)) for c in candidates)
+    parts = getattr(value, 'parts', None)
+    if parts is not None:
+        return sum(payload_bytes(p) for p in parts)
+    inline = getattr(value, 'inline_data', None)
+    if inline is not None:
+        return payload_bytes(getattr(inline, 'data', None))
+    text = getattr(value, 'text', None)
+    if isinstance(text, str):
+        return payload_bytes(text)
+    # Function-calling parts of an ADK request/response
+    call = getattr(value, 'function_call', None)
+    if call is not None:
+        return payload_bytes(getattr(call, 'args', None))
+    reply = getattr(value, 'function_response', None)
+    if reply is not None:
+        return payload_bytes(getattr(reply, 'response', None))
+    return payload_bytes(getattr(value, 'content', None)) if hasattr(value, 'content') else 0
+
+
+def _record_usage(model: str, usage: Any, attributes: Dict[str, Any]) -> None:
+    for kind, field, attribute in (("input", "prompt_token_count", "gen_ai.usage.input_tokens"),
+                                   ("output", "candidates_token_count", "gen_ai.usage.output_tokens")):
+        tokens = getattr(usage, field, None)
+        if tokens:
+            count("model_tokens_total", tokens, model=model, type=kind)
+            attributes[attribute] = tokens
+
+
+def record_model_attempt_error(model: str, seconds: float, error: BaseException) -> None:
+    """Record one failed request attempt."""
+    if not _enabled:
+        return
+    observe("model_call_duration_seconds", seconds, model=model, outcome="error")
+    count("model_errors_total", model=model, error=getattr(error, 'code', None) or type(error).__name__)
+
+
+def record_model_response(call_span: Any, model: str, prompt: Any, response: Any, seconds: float,
+                          attempts: int, response_bytes: Optional[int] = None) -> None:
+    """Record latency, payload sizes and token usage of a successful model call.
+
+    Args:
+        call_span: Span of the call (attributes are added to it)
+        model: Model name
+        prompt: ``contents`` sent to the model
+        response: Response (or the last streamed chunk, which carries usage)
+        seconds: Duration of the successful attempt
+        attempts: Attempts made, including the successful one
+        response_bytes: Total size when streamed (measured from ``response`` otherwise)
+    """
+    if not _enabled:
+        return
+    prompt_size = payload_bytes(prompt)
+    response_size = payload_bytes(response) if response_bytes is None else response_bytes
+    observe("model_call_duration_seconds", seconds, model=model, outcome="ok")
+    observe("model_prompt_bytes", prompt_size, model=model)
+    observe("model_response_bytes", response_size, model=model)
+    attributes = {"model.prompt_bytes": prompt_size, "model.response_bytes": response_size,
+                  "model.attempts": attempts}
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is not None:
+        _record_usage(model, usage, attributes)
+    call_span.set_attributes(attributes)
+
+
+# ADK callbacks: spans per agent turn, LLM request and tool invocation
+
+_open_spans: Dict[Any, Span] = {}
+_open_spans_lock = threading.Lock()
+
+
+def _open(key: Any, name: str, attributes: Dict[str, Any], parent: Optional[Span]) -> Span:
+    opened = Span(name, attributes, parent)
+    with _open_spans_lock:
+        _open_spans[key] = opened
+    return opened
+
+
+def _close(key: Any) -> Optional[Span]:
+    with _open_spans_lock:
+        return _open_spans.pop(key, None)
+
+
+def _agent_span(context: Any) -> Optional[Span]:
+    return _open_spans.get(("agent", context.invocation_id, context.agent_name))
+
+
+def _before_agent(callback_context: Any) -> None:
+    name = callback_context.agent_name
+    opened = _open(("agent", callback_context.invocation_id, name), f"agent {name}",
+                   {"agent.name": name, "invocation.id": callback_context.invocation_id}, _current.get())
+    _current.set(opened)
+    return None
+
+
+def _after_agent(callback_context: Any) -> None:
+    closed = _close(("agent", callback_context.invocation_id, callback_context.agent_name))
+    if closed is not None:
+        _current.set(closed.parent)
+        closed.end()
+        observe("agent_turn_duration_seconds", closed.duration, agent=callback_context.agent_name)
+    return None
+
+
+def _before_model(callback_context: Any, llm_request: Any) -> None:
+    model = getattr(llm_request, 'model', None) or "unknown"
+    _open(("model", callback_context.invocation_id, callback_context.agent_name), f"llm {model}",
+          {"gen_ai.request.model": model, "agent.name": callback_context.agent_name,
+           "model.prompt_bytes": payload_bytes(getattr(llm_request, 'contents', None))},
+          _agent_span(callback_context) or _current.get())
+    return None
+
+
+def _after_model(callback_context: Any, llm_response: Any) -> None:
+    if getattr(llm_response, 'partial', False):
+        return None  # Streaming chunk; the span ends with the final response
+    closed = _close(("model", callback_context.invocation_id, callback_context.agent_name))
+    if closed is None:
+        return None
+    model = closed.attributes["gen_ai.request.model"]
+    attributes = {"model.response_bytes": payload_bytes(getattr(llm_response, 'content', None))}
+    usage = getattr(llm_response, 'usage_metadata', None)
+    if usage is not None:
+        _record_usage(model, usage, attributes)
+    closed.set_attributes(attributes)
+    if getattr(llm_response, 'error_code', None):
+        closed.record_error(RuntimeError(f"{llm_response.error_code}: {llm_response.error_message}"))
+    closed.end()
+    observe("model_call_duration_seconds", closed.duration, model=model,
+            outcome="error" if closed.status == "ERROR" else "ok")
+    observe("model_response_bytes", attributes["model.response_bytes"], model=model)
+    return None
+
+
+def _on_model_error(callback_context: Any, llm_request: Any, error: Exception) -> None:
+    closed = _close(("model", callback_context.invocation_id, callback_context.agent_name))
+    if closed is not None:
+        closed.record_error(error)
+        closed.end()
+        record_model_attempt_error(closed.attributes["gen_ai.request.model"], closed.duration, error)
+    return None
+
+
+def _tool_key(tool_context: Any) -> Any:
+    return ("tool", getattr(tool_context, 'function_call_id', None) or id(tool_context))
+
+
+def _before_tool(tool: Any, args: Dict[str, Any], tool_context: Any) -> None:
+    opened = _open(_tool_key(tool_context), f"tool {tool.name}",
+                   {"tool.name": tool.name, "agent.name": tool_context.agent_name,
+                    "tool.args_bytes": payload_bytes(args)},
+                   _agent_span(tool_context) or _current.get())
+    # Model calls made by the tool (and agents behind an AgentTool) nest under it
+    _current.set(opened)
+    return None
+
+
+def _finish_tool(tool: Any, tool_context: Any, error: Optional[BaseException], response: Any = None) -> None:
+    closed = _close(_tool_key(tool_context))
+    if closed is None:
+        return
+    _current.set(closed.parent)
+    if error is not None:
+        closed.record_error(error)
+    else:
+        closed.set_attributes({"tool.response_bytes": payload_bytes(response)})
+    closed.end()
+    observe("tool_duration_seconds", closed.duration, tool=tool.name,
+            outcome="error" if error is not None else "ok")
+
+
+def _after_tool(tool: Any, args: Dict[str, Any], tool_context: Any, tool_response: Any) -> None:
+    _finish_tool(tool, tool_context, None, tool_response)
+    return None
+
+
+def _on_tool_error(tool: Any, args: Dict[str, Any], tool_context: Any, error: Exception) -> None:
+    _finish_tool(tool, tool_context, error)
+    return None
+
+
+def adk_callbacks(llm: bool = True) -> Dict[str, Any]:
+    """Callback arguments that trace an ADK agent, e.g. ``Agent(..., **adk_callbacks())``.
+
+    Args:
+        llm: Also trace model requests and tool calls (LLM agents only; pass
+            False for workflow and custom ``BaseAgent`` agents)
+
+    Returns:
+        Callback keyword arguments, or an empty dict when telemetry is off, so
+        disabled agents carry no callbacks at all.
+    """
+    if not _enabled:
+        return {}
+    callbacks = {"before_agent_callback": _before_agent, "after_agent_callback": _after_agent}
+    if llm:
+        callbacks.update(before_model_callback=_before_model, after_model_callback=_after_model,
+                         on_model_error_callback=_on_model_error, before_tool_callback=_before_tool,
+                         after_tool_callback=_after_tool, on_tool_error_callback=_on_tool_error)
+    return callbacks
+
+
+# Exporters
+
+def _number(value: Any) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _registry_lock:
+        for metric in _registry.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {_number(value)}" if label_text else f"{name} {_number(value)}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def get_metrics() -> Dict[str, Any]:
+    """Snapshot of every metric as a JSON-serializable dictionary."""
+    with _registry_lock:
+        return {name: {"type": metric.kind, "help": metric.help, "series": metric.snapshot()}
+                for name, metric in _registry.items()}
+
+
+def _write_jsonl(record: Dict[str, Any]) -> None:
+    global _jsonl_file
+    line = json.dumps(record, default=str) + "\n"
+    with _jsonl_lock:
+        if _jsonl_file is None:
+            ensure_directory_exists(os.path.dirname(_jsonl_path) or ".")
+            _jsonl_file = open(_jsonl_path, 'a', encoding='utf-8')
+        _jsonl_file.write(line)
+        _jsonl_file.flush()
+
+
+def flush() -> None:
+    """Export metrics (Prometheus file and/or a JSON-lines snapshot)."""
+    if not _registry:
+        return
+    if "prometheus" in _exporters:
+        directory = ensure_directory_exists(os.path.dirname(_prometheus_path) or ".")
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(render_prometheus())
+        os.replace(tmp_path, _prometheus_path)  # Scrapers never see a partial file
+    if "jsonl" in _exporters:
+        _write_jsonl({"type": "metrics", "time_unix_nano": time.time_ns(), "metrics": get_metrics()})
+
+
+def enable(exporters: Sequence[str] = tuple(TELEMETRY_EXPORTERS), jsonl_path: str = TELEMETRY_JSONL_PATH,
+           prometheus_path: str = TELEMETRY_PROMETHEUS_PATH) -> None:
+    """Turn telemetry on.
+
+    Agents are instrumented when they are built, so enable telemetry (or set
+    ``TELEMETRY_ENABLED``) before first accessing them.
+
+    Args:
+        exporters: Any of "jsonl", "prometheus" and "otel"
+        jsonl_path: File spans and metric snapshots are appended to
+        prometheus_path: File rewritten with the text exposition on ``flush``
+    """
+    global _enabled, _exporters, _jsonl_path, _prometheus_path
+    unknown = set(exporters) - set(EXPORTERS)
+    if unknown:
+        raise ValueError(f"Unknown telemetry exporters: {sorted(unknown)}")
+    exporters = tuple(exporters)
+    if "otel" in exporters:
+        try:
+            import opentelemetry.trace  # noqa: F401
+        except ImportError:
+            print("Warning: opentelemetry-api is not installed; the otel exporter is disabled")
+            exporters = tuple(e for e in exporters if e != "otel")
+    _close_jsonl()
+    _exporters, _jsonl_path, _prometheus_path = exporters, jsonl_path, prometheus_path
+    _enabled = True
+
+
+def disable() -> None:
+    """Flush and turn telemetry off."""
+    global _enabled, _exporters
+    flush()
+    _enabled = False
+    _exporters = ()
+    _close_jsonl()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset_telemetry() -> None:
+    """Drop all recorded metrics and open spans (for tests and benchmarks)."""
+    with _registry_lock:
+        _registry.clear()
+    with _open_spans_lock:
+        _open_spans.clear()
+
+
+def _close_jsonl() -> None:
+    global _jsonl_file
+    with _jsonl_lock:
+        if _jsonl_file is not None:
+            _jsonl_file.close()
+            _jsonl_file = None
+
+
+if TELEMETRY_ENABLED:
+    enable()
+
+atexit.register(flush)
@@ -0,0 +1,37 @@
+"""Batch pipeline: loading briefs and command-line errors."""
+
+import json
+
+import pytest
+
+from master_agent import batch
+
+
+def test_bad_json_row_names_file_and_line(tmp_path):
+    path = tmp_path / "briefs.jsonl"
+    path.write_text('{"topic": "One"}\n\n{"topic": "Two",\n', encoding='utf-8')
+    with pytest.raises(ValueError, match=r"briefs\.jsonl:3: "):
+        batch.load_briefs(str(path))
+
+
+def test_non_object_row_names_file_and_line(tmp_path):
+    path = tmp_path / "briefs.jsonl"
+    path.write_text('{"topic": "One"}\n["Two"]\n', encoding='utf-8')
+    with pytest.raises(ValueError, match=r"briefs\.jsonl:2: a brief must be a JSON object"):
+        batch.load_briefs(str(path))
+
+
+def test_duplicate_ids_are_a_usage_error(tmp_path, capsys):
+    path = tmp_path / "briefs.jsonl"
+    path.write_text("".join(json.dumps({"id": "a", "topic": t}) + "\n" for t in ("One", "Two")), encoding='utf-8')
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main([str(path), "-o", str(tmp_path / "out.jsonl")])
+    assert exit_info.value.code == 2
+    assert "Duplicate brief ids: a" in capsys.readouterr().err
+
+
+def test_bad_rows_are_not_reported_as_usage_errors(tmp_path):
+    path = tmp_path / "briefs.jsonl"
+    path.write_text('{"topic": \n', encoding='utf-8')
+    with pytest.raises(ValueError, match=r"briefs\.jsonl:1: "):
+        batch.main([str(path), "-o", str(tmp_path / "out.jsonl")])
@@ -0,0 +1,43 @@
+"""Coalesced creative generation: each session owns its records."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from master_agent.tools import creative_tools
+from master_agent.utils import image_derivatives
+from master_agent.utils.creative_store import CreativeStore
+from master_agent.utils.fake_genai import FakeClient
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.singleflight import get_singleflight
+from master_agent.utils.state_manager import session_scope
+
+POST = "# Shared Creative\n\n## Why it matters\n\nBody.\n"
+SESSIONS = ["test-creative-a", "test-creative-b", "test-creative-c"]
+
+
+def test_coalesced_callers_own_their_records(tmp_path, monkeypatch):
+    store = CreativeStore(str(tmp_path / "store"))
+    monkeypatch.setattr(creative_tools, "get_creative_store", lambda: store)
+    monkeypatch.setattr(creative_tools, "CREATIVE_STORE_ENABLED", True)
+    monkeypatch.setattr(creative_tools, "REQUEST_COALESCING_ENABLED", True)
+    monkeypatch.setattr(creative_tools, "GENERATED_CREATIVES_DIR", str(tmp_path / "creatives"))
+    monkeypatch.setattr(image_derivatives, "IMAGE_DERIVATIVES_ENABLED", False)
+    coalesced = get_singleflight("generate_ai_creative").coalesced
+    
+    def generate(session_id):
+        with session_scope(session_id) as state:
+            creative_tools.generate_ai_creative(POST, count=2)
+            return state.get_creative_suggestions()[-1]["generated_images"]
+    
+    with override_client(FakeClient(latency=0.3)), override_rate_limits({}), \
+            ThreadPoolExecutor(max_workers=len(SESSIONS)) as pool:
+        results = list(pool.map(generate, SESSIONS))
+    
+    assert get_singleflight("generate_ai_creative").coalesced - coalesced == len(SESSIONS) - 1
+    first, *others = results
+    for images in others:
+        assert images == first
+        assert all(a is not b for a, b in zip(images, first))
+    records = store.find_by_post("Shared Creative")
+    assert sorted(record["session_id"] for record in records) == sorted(SESSIONS * 2)
+    store.close()
@@ -0,0 +1,35 @@
+"""Long-form drafts: outlined, sections written in parallel."""
+
+import re
+
+from master_agent.tools import writing_tools
+from master_agent.utils.fake_genai import FakeClient
+from master_agent.utils.genai_client import override_client
+from master_agent.utils.model_calls import override_rate_limits
+from master_agent.utils.state_manager import get_workflow_state, session_scope
+
+LATENCY = 0.1
+
+
+def respond(prompt: str) -> str:
+    outline = re.search(r"exactly (\d+) H2 section headings", prompt)
+    if outline:
+        return "# Outlined\n\n" + "\n".join(f"## Part {i}" for i in range(1, int(outline.group(1)) + 1))
+    return "Section body."
+
+
+def test_time_to_first_chunk_skips_the_outline_title(monkeypatch):
+    for name, value in (("LONG_FORM_MIN_WORDS", 1), ("RESPONSE_CACHE_ENABLED", False),
+                        ("REQUEST_COALESCING_ENABLED", False), ("DUPLICATE_INDEX_ENABLED", False),
+                        ("SPECULATIVE_CREATIVE_ENABLED", False)):
+        monkeypatch.setattr(writing_tools, name, value)
+    chunks = []
+    with override_client(FakeClient(latency=LATENCY, text_for=respond)), override_rate_limits({}), \
+            session_scope("test-long-form"):
+        chunks.extend(writing_tools.stream_content("Long-form timing", "Keywords: timing", word_count=2000))
+        metrics = get_workflow_state().get_draft_content()["metrics"]
+    assert chunks[0] == "# Outlined\n\n"
+    long_form = metrics["long_form"]
+    assert "title_pending" not in long_form
+    # The clock stops at the first section, one model call after the outline
+    assert metrics["time_to_first_chunk"] >= long_form["outline_latency"] + LATENCY * 0.9
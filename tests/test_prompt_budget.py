@@ -0,0 +1,29 @@
+"""Prompt budgeting: deduplication and condensing only when over budget."""
+
+from master_agent.utils.prompt_budget import dedupe_lines, fit_research
+
+RESEARCH = """Target Audience: general
+🔍 KEY FINDINGS:
+   - Target audience: general
+- Remote teams ship 30% faster with async reviews.
+- Remote teams ship 30% faster with async reviews.
+"""
+
+
+def test_under_budget_research_is_unchanged():
+    text, report = fit_research(RESEARCH, budget=10 ** 6)
+    assert text == RESEARCH
+    assert report["deduplicated_lines"] == 0
+
+
+def test_only_exact_repeats_are_dropped():
+    text, removed = dedupe_lines(RESEARCH)
+    assert removed == 1
+    assert "   - Target audience: general" in text.splitlines()
+    assert text.count("Remote teams ship") == 1
+
+
+def test_over_budget_research_is_deduplicated():
+    text, report = fit_research(RESEARCH, budget=40)
+    assert report["deduplicated_lines"] == 1
+    assert "   - Target audience: general" in text
@@ -0,0 +1,37 @@
+"""Response cache: size budget shared by several processes."""
+
+import os
+import time
+
+from master_agent.utils import response_cache
+from master_agent.utils.response_cache import ResponseCache
+
+
+def directory_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(directory) for name in names if name.endswith('.json'))
+
+
+def test_caches_sharing_a_directory_stay_near_the_budget(tmp_path):
+    # Each instance stands for a worker process with its own size estimate
+    workers = [ResponseCache(str(tmp_path), ttl=3600, max_bytes=20_000) for _ in range(4)]
+    for i in range(200):
+        workers[i % len(workers)].put("model", f"prompt {i}", "x" * 200)
+    overshoot = 20_000 * response_cache._RESCAN_FRACTION * len(workers)
+    assert directory_bytes(tmp_path) <= 20_000 + overshoot
+
+
+def test_eviction_removes_stale_temp_files(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=3600, max_bytes=10 ** 6)
+    cache.put("model", "prompt", "text")
+    shard = next(entry.path for entry in os.scandir(tmp_path) if entry.is_dir())
+    stale, fresh = os.path.join(shard, "stale.tmp"), os.path.join(shard, "fresh.tmp")
+    for path in (stale, fresh):
+        with open(path, 'w') as f:
+            f.write("partial")
+    old = time.time() - response_cache._STALE_TMP_SECONDS - 60
+    os.utime(stale, (old, old))
+    cache._evict()
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+    assert cache.get("model", "prompt") == "text"
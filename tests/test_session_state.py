@@ -0,0 +1,87 @@
+"""Session scoping of workflow state: tool contexts, session_scope and eviction."""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from master_agent.tools.research_tools import conduct_research
+from master_agent.tools.review_tools import review_and_polish
+from master_agent.utils.state_manager import (
+    SESSION_STATE_KEY,
+    SessionStateStore,
+    get_workflow_state,
+    session_scope,
+    session_states,
+    workflow_state
+)
+
+
+def tool_context(session_id, state=None):
+    return SimpleNamespace(state={} if state is None else state, session=SimpleNamespace(id=session_id))
+
+
+def test_tool_context_resolves_its_own_session():
+    context = tool_context("test-context-a")
+    state = get_workflow_state(context)
+    assert state is not workflow_state
+    assert state.session_id == "test-context-a"
+    assert state is session_states.get("test-context-a")
+    # The id is pinned so AgentTool sub-agent sessions resolve to the same state
+    assert context.state[SESSION_STATE_KEY] == "test-context-a"
+    sub_agent = tool_context("sub-agent-session", state=dict(context.state))
+    assert get_workflow_state(sub_agent) is state
+
+
+def test_tool_context_takes_precedence_over_session_scope():
+    with session_scope("test-scope-outer"):
+        assert get_workflow_state(tool_context("test-context-b")).session_id == "test-context-b"
+        assert get_workflow_state().session_id == "test-scope-outer"
+    assert get_workflow_state() is workflow_state
+
+
+def run_session(index):
+    """Interleave tool calls for one session; tool-context sessions run outside any scope."""
+    session_id = f"test-isolation-{index}"
+    errors = []
+    for round_number in range(3):
+        topic = f"{session_id} round {round_number}"
+        if index % 2:
+            context = tool_context(session_id)
+            conduct_research(topic, [session_id], tool_context=context)
+            review_and_polish(f"# {topic}\n\nBody.", tool_context=context)
+            state = get_workflow_state(context)
+        else:
+            with session_scope(session_id):
+                conduct_research(topic, [session_id])
+                review_and_polish(f"# {topic}\n\nBody.")
+                state = get_workflow_state()
+        if state.get_research_data()["topic"] != topic:
+            errors.append(f"{session_id}: research from another session")
+        if not state.get_final_content()["content"].startswith(f"# {topic}"):
+            errors.append(f"{session_id}: final content from another session")
+    return errors
+
+
+def test_concurrent_sessions_do_not_share_state():
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        errors = [error for result in executor.map(run_session, range(64)) for error in result]
+    assert errors == []
+
+
+def test_store_evicts_least_recently_used_sessions():
+    store = SessionStateStore(max_sessions=2, max_bytes=10 ** 9, idle_ttl=3600)
+    evicted = []
+    store.add_eviction_listener(evicted.append)
+    first = store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+    assert store.session_ids() == ["a", "c"]
+    assert evicted == ["b"]
+    assert store.get("a") is first
+
+
+def test_store_evicts_idle_sessions():
+    store = SessionStateStore(max_sessions=10, max_bytes=10 ** 9, idle_ttl=0)
+    store.get("idle")
+    store.get("active")
+    assert store.session_ids() == ["active"]
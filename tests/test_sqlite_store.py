@@ -0,0 +1,33 @@
+"""SQLite workflow history: session resets."""
+
+from master_agent.utils import sqlite_store
+from master_agent.utils.sqlite_store import SQLiteStateStore
+
+
+def test_reset_does_not_depend_on_the_wall_clock(tmp_path, monkeypatch):
+    # A clock that stalls or steps back must not hide records made after a reset
+    monkeypatch.setattr(sqlite_store.time, "time", lambda: 1000.0)
+    store = SQLiteStateStore(str(tmp_path / "history.db"))
+    store.record("s", "set", "final_content", {"content": "# Before"})
+    store.record("s", "add", "creative_suggestions", {"content_title": "Before"})
+    store.record("s", "clear")
+    assert store.load("s") is None
+    
+    monkeypatch.setattr(sqlite_store.time, "time", lambda: 500.0)
+    store.record("s", "set", "final_content", {"content": "# After"})
+    store.record("s", "add", "creative_suggestions", {"content_title": "After"})
+    state = store.load("s")
+    assert state["final_content"]["content"] == "# After"
+    assert [c["content_title"] for c in state["creative_suggestions"]] == ["After"]
+    assert state["draft_content"] is None
+    store.close()
+
+
+def test_reset_only_hides_its_own_session(tmp_path):
+    store = SQLiteStateStore(str(tmp_path / "history.db"))
+    store.record("a", "set", "final_content", {"content": "# A"})
+    store.record("b", "set", "final_content", {"content": "# B"})
+    store.record("b", "clear")
+    assert store.load("a")["final_content"]["content"] == "# A"
+    assert store.load("b") is None
+    store.close()